@@ -1,10 +1,48 @@
+import functools
+import os
+import threading
+import time
+import uuid
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+
+from titik_panas.downsample import CHART_WIDTH_PX
+from titik_panas.ensemble import EnsembleSpec, open_pool, run_ensemble
+from titik_panas.ingest import IncrementalDataset
+from titik_panas.profiling import DEFAULT_LOG, Profiler, cache_loads, open_log, profiling_enabled
+from titik_panas.regions import LEVEL_LABELS, RegionRegistry, RegionRollup
+from titik_panas.rollup import COMPARISONS
+from titik_panas.shared import DEFAULT_BUDGET, SharedDataset
+from titik_panas.sources import MockSource, source_from_env
+from titik_panas.spatial import DETECTION_SOURCE_COLUMNS, HotspotIndex
+from titik_panas.store import ParquetStore
+from titik_panas.views import (
+    WEATHER_VARIABLES,
+    ReplayFigures,
+    cluster_data,
+    cluster_figure,
+    ffmc_ispu_data,
+    ffmc_ispu_figures,
+    ffmc_label,
+    header_data,
+    ispu_label,
+    map_data,
+    map_figures,
+    metric_delta,
+    replay_data,
+    risk_data,
+    risk_figures,
+    trend_data,
+    trend_figures,
+    trend_label,
+    weather_data,
+    weather_figures,
+)
+
+# st.fragment tersedia sejak Streamlit 1.37 (experimental_fragment sejak 1.33)
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -14,141 +52,134 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Fungsi untuk generate data mock khusus Pontianak
-@st.cache_data
-def generate_pontianak_data(days=30):
-    """Generate data mock untuk monitoring Pontianak"""
-    dates = pd.date_range(
-        start=datetime.now() - timedelta(days=days),
-        end=datetime.now() + timedelta(days=7),
-        freq='D'
-    )
-    
-    # Wilayah/Kecamatan di Kota Pontianak
-    pontianak_areas = [
-        'Pontianak Kota',
-        'Pontianak Selatan', 
-        'Pontianak Utara',
-        'Pontianak Timur',
-        'Pontianak Barat',
-        'Pontianak Tenggara'
-    ]
-    
-    # Koordinat approximate untuk setiap area
-    area_coords = {
-        'Pontianak Kota': {'lat': -0.0263, 'lon': 109.3425},
-        'Pontianak Selatan': {'lat': -0.0500, 'lon': 109.3200},
-        'Pontianak Utara': {'lat': 0.0100, 'lon': 109.3300},
-        'Pontianak Timur': {'lat': -0.0200, 'lon': 109.3600},
-        'Pontianak Barat': {'lat': -0.0300, 'lon': 109.3000},
-        'Pontianak Tenggara': {'lat': -0.0600, 'lon': 109.3500}
-    }
-    
-    data = []
-    for date in dates:
-        for area in pontianak_areas:
-            # Faktor musim (Pontianak di khatulistiwa - pola hujan)
-            # Musim hujan: Nov-Mar, Musim kemarau: Apr-Okt
-            month = date.month
-            is_dry_season = month in [4, 5, 6, 7, 8, 9, 10]
-            
-            # Faktor El Nino/La Nina (simulasi)
-            climate_oscillation = np.sin(2 * np.pi * date.dayofyear / 1095)  # 3-year cycle
-            
-            # Titik panas - lebih tinggi di musim kemarau
-            if is_dry_season:
-                hotspot_base = 25 + climate_oscillation * 15
-                # Area urban lebih rendah, area pinggiran lebih tinggi
-                if area in ['Pontianak Kota']:
-                    hotspot_base *= 0.6
-                elif area in ['Pontianak Utara', 'Pontianak Timur']:
-                    hotspot_base *= 1.3
-            else:
-                hotspot_base = 8 + climate_oscillation * 5
-                
-            hotspot_count = max(0, int(hotspot_base + np.random.normal(0, 8)))
-            
-            # Curah hujan - karakteristik iklim tropis basah Pontianak
-            if is_dry_season:
-                rainfall_base = 120 - climate_oscillation * 60
-            else:
-                rainfall_base = 280 + climate_oscillation * 80
-            
-            rainfall = max(0, rainfall_base + np.random.normal(0, 40))
-            
-            # Sinaran matahari - relatif konstan di khatulistiwa
-            solar_base = 450 if is_dry_season else 350
-            solar_radiation = solar_base + np.random.normal(0, 50)
-            
-            # Angin - pola angin khatulistiwa
-            # Angin timur-tenggara di musim kemarau, barat daya di musim hujan
-            if is_dry_season:
-                wind_direction_base = 120  # SE
-                wind_speed_base = 3.5
-            else:
-                wind_direction_base = 240  # SW
-                wind_speed_base = 2.8
-                
-            wind_speed = max(0, wind_speed_base + np.random.normal(0, 1.2))
-            wind_direction = (wind_direction_base + np.random.normal(0, 30)) % 360
-            
-            # Suhu - relatif stabil sepanjang tahun (iklim khatulistiwa)
-            temp_base = 27.5 if is_dry_season else 26.8
-            temperature = temp_base + np.random.normal(0, 1.5)
-            
-            # Kelembaban - tinggi sepanjang tahun
-            humidity_base = 75 if is_dry_season else 85
-            humidity = max(40, min(95, humidity_base + np.random.normal(0, 8)))
-            
-            # FFMC (Fine Fuel Moisture Code) - indikator kelembaban bahan bakar
-            ffmc = max(20, min(95, 60 + (hotspot_count * 0.8) - (rainfall * 0.1)))
-            
-            # Risk level berdasarkan kondisi spesifik Pontianak
-            risk_score = (
-                hotspot_count * 0.35 + 
-                max(0, (100 - rainfall/3)) * 0.25 +
-                max(0, (temperature - 26)) * 0.15 +
-                max(0, (ffmc - 40)) * 0.15 +
-                max(0, (wind_speed - 2)) * 0.10
-            )
-            
-            if risk_score > 70:
-                risk_level = "Sangat Tinggi"
-            elif risk_score > 50:
-                risk_level = "Tinggi"
-            elif risk_score > 30:
-                risk_level = "Sedang"
-            else:
-                risk_level = "Rendah"
-            
-            # ISPU (Indeks Standar Pencemaran Udara) - simulasi
-            # Lebih tinggi saat banyak titik panas
-            ispu_base = 45 + (hotspot_count * 1.2)
-            ispu = max(0, int(ispu_base + np.random.normal(0, 10)))
-            
-            data.append({
-                'tanggal': date,
-                'area': area,
-                'latitude': area_coords[area]['lat'],
-                'longitude': area_coords[area]['lon'],
-                'titik_panas': hotspot_count,
-                'curah_hujan': rainfall,
-                'sinaran_matahari': solar_radiation,
-                'kecepatan_angin': wind_speed,
-                'arah_angin': wind_direction,
-                'suhu': temperature,
-                'kelembaban': humidity,
-                'ffmc': ffmc,
-                'ispu': ispu,
-                'tingkat_risiko': risk_level,
-                'skor_risiko': risk_score,
-                'musim': 'Kemarau' if is_dry_season else 'Hujan'
-            })
-    
-    return pd.DataFrame(data)
+# Sumber data: mock generator atau file (lihat titik_panas.sources)
+data_source = source_from_env()
+
+# Store Parquet terpartisi (opsional): filter sidebar dibaca langsung dari disk
+store_path = os.environ.get('TITIK_PANAS_STORE')
+
+# Di atas jumlah unit ini multiselect wilayah dimulai kosong (= semua unit)
+MAX_DEFAULT_UNITS = 50
+
+# Lebar konten halaman (px) untuk jumlah titik grafik; lebar kolom diturunkan
+# dari layout tiap tab di titik_panas.views
+page_width = int(os.environ.get('TITIK_PANAS_PAGE_WIDTH', CHART_WIDTH_PX))
+
+# Budget memori dataset bersama (MB); di atasnya tabel dibaca lewat memory map
+memory_budget = int(os.environ.get('TITIK_PANAS_MEMORY_BUDGET_MB', DEFAULT_BUDGET // 2 ** 20)) * 2 ** 20
+
+# Profiling per bagian (opt-in): TITIK_PANAS_PROFILE=1 atau ?profile=1
+@st.cache_resource
+def profile_log(path):
+    return open_log(path)
+
+profile_enabled = profiling_enabled(st.query_params)
+profile_session = st.session_state.setdefault('profile_session', uuid.uuid4().hex[:12])
+cache_loads.run_started(profile_session)
+profiler = Profiler(
+    enabled=profile_enabled,
+    logger=profile_log(os.environ.get('TITIK_PANAS_PROFILE_LOG', DEFAULT_LOG)) if profile_enabled else None,
+    session=profile_session
+)
+
+def profiled(name):
+    """Catat durasi fungsi render sebagai bagian ``name`` (juga saat rerun fragment)"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def show_chart(name, fig):
+    """st.plotly_chart dengan pencatatan waktu serialisasi dan pengiriman"""
+    with profiler.section(f'chart:{name}'):
+        st.plotly_chart(fig, use_container_width=True)
 
-# Generate data
-df = generate_pontianak_data()
+@st.cache_resource
+def open_dataset(source_key, path=None, budget=DEFAULT_BUDGET):
+    """Dataset append-only bersama semua sesi (indeks, rollup, FWI, prakiraan)
+
+    Frame dan potongan hasil filter disimpan di ``SharedDataset`` (buffer
+    Arrow zero-copy), bukan ``st.cache_data`` yang menyalin per sesi.
+    """
+    cache_loads.loaded('dataset')
+    shared = SharedDataset(budget, spill_dir=os.environ.get('TITIK_PANAS_SPILL_DIR'))
+    return IncrementalDataset(data_source, ParquetStore(path) if path else None, shared=shared)
+
+@st.cache_resource
+def load_hotspot_index(data_key, _filter_index=None):
+    """Indeks grid deteksi titik panas individual, sekali per versi dataset
+
+    Sumber yang mensimulasikan deteksi memakai data harian yang sudah
+    di-ingest (indeks filter atau store), sama dengan data di dashboard.
+    """
+    daily = None
+    if data_source.detections_from_daily:
+        if _filter_index is not None:
+            daily = _filter_index.select()[DETECTION_SOURCE_COLUMNS]
+        else:
+            daily = dataset.store.read(columns=DETECTION_SOURCE_COLUMNS)
+    detections = data_source.load_detections(daily)
+    if detections is None or len(detections) == 0:
+        return None
+    return HotspotIndex.from_frame(detections)
+
+@st.cache_resource
+def load_regions(path=None, areas=()):
+    """Registri wilayah dari TITIK_PANAS_REGIONS, atau bawaan dari area data"""
+    if path:
+        return RegionRegistry.from_file(path)
+    return RegionRegistry.default_for(areas)
+
+# Rollup terbaru per registri: versi berikutnya cukup memperpanjang cube tingkat atasnya
+@st.cache_resource
+def latest_region_rollup(regions_key):
+    return {'lock': threading.Lock(), 'rollup': None}
+
+# Cube per tingkat wilayah dari partial tingkat anaknya; versi lama dibuang
+@st.cache_resource(max_entries=2)
+def load_region_rollup(data_key, regions_key, _cube, _registry):
+    cache_loads.loaded('wilayah')
+    latest = latest_region_rollup(regions_key)
+    with latest['lock']:
+        rollup = RegionRollup(_cube, _registry, previous=latest['rollup'])
+        latest['rollup'] = rollup
+    # Cube tingkat atas ikut dihitung dalam budget memori dataset bersama
+    dataset.shared.track('wilayah', rollup.nbytes)
+    return rollup
+
+# Process pool ensemble dibuat sekali per proses server
+@st.cache_resource
+def ensemble_pool(workers):
+    return open_pool(workers)
+
+@st.cache_resource(max_entries=8)
+def load_ensemble(data_key, areas, start, end, n, _registry):
+    """Ensemble skenario iklim untuk area terpilih (sekali per versi data)"""
+    spec = EnsembleSpec(areas, _registry.coords(), start, end)
+    workers = int(os.environ.get('TITIK_PANAS_ENSEMBLE_WORKERS', os.cpu_count() or 1))
+    return run_ensemble(spec, n, pool=ensemble_pool(workers) if workers > 1 else None, workers=workers)
+
+# Load data: hanya baris setelah watermark sumber yang di-ingest pada rerun ini
+with profiler.section('muat'):
+    dataset = open_dataset(data_source.cache_key(), store_path, memory_budget)
+    dataset.refresh()
+    data_version, filter_index, rollup_cube, forecast_engine = dataset.snapshot()
+
+# Kunci cache turunan mengikuti versi data, bukan jam dinding
+data_key = (data_source.cache_key(), store_path, data_version)
+
+if store_path:
+    store = dataset.store
+    area_options = store.manifest['areas']
+    min_date = pd.Timestamp(store.manifest['min_date']).date()
+    max_date = pd.Timestamp(store.manifest['max_date']).date()
+else:
+    area_options = filter_index.areas
+    min_date = filter_index.min_date.date()
+    max_date = filter_index.max_date.date()
 
 # Sidebar
 st.sidebar.title("🔥 Dashboard Pontianak")
@@ -156,19 +187,52 @@ st.sidebar.markdown("**Monitoring Titik Panas Kota Pontianak**")
 st.sidebar.markdown("*Kalimantan Barat*")
 st.sidebar.markdown("---")
 
-# Filter area
-selected_areas = st.sidebar.multiselect(
-    "Pilih Area/Kecamatan:",
-    options=df['area'].unique(),
-    default=df['area'].unique()
+# Filter wilayah: pilih tingkat lalu telusuri dari tingkat teratas
+regions_path = os.environ.get('TITIK_PANAS_REGIONS')
+registry = load_regions(regions_path, tuple(area_options))
+region_rollup = load_region_rollup(data_key, regions_path, rollup_cube, registry)
+
+region_level = st.sidebar.selectbox(
+    "Tingkat Wilayah:",
+    options=registry.levels,
+    index=len(registry.levels) - 1,
+    format_func=LEVEL_LABELS.get
 )
 
+def select_units(level, parents=None, parent_level=None):
+    """Multiselect unit di ``level``; daftar panjang kosong berarti semua"""
+    options = registry.units(level, parents, parent_level)
+    if len(options) <= MAX_DEFAULT_UNITS:
+        return st.sidebar.multiselect(f"Pilih {LEVEL_LABELS[level]}:", options=options, default=options)
+    chosen = st.sidebar.multiselect(
+        f"Pilih {LEVEL_LABELS[level]}:", options=options,
+        help=f"{len(options):,} unit; kosongkan untuk memilih semua"
+    )
+    return chosen or options
+
+parents, parent_level = None, None
+for level in registry.levels[:registry.levels.index(region_level)]:
+    # Tingkat dengan satu unit (mis. satu provinsi) tidak perlu dipilih
+    if len(registry.units(level, parents, parent_level)) > 1:
+        parents, parent_level = select_units(level, parents, parent_level), level
+selected_units = select_units(region_level, parents, parent_level)
+
+# Area data (tingkat terbawah) untuk filter baris dan prakiraan
+selected_areas = registry.leaves_under(region_level, selected_units)
+
+missing_areas = registry.missing(area_options)
+if missing_areas:
+    st.sidebar.warning(
+        f"{len(missing_areas)} area data tidak ada di registri wilayah dan tidak ditampilkan: "
+        + ", ".join(missing_areas[:5]) + (" ..." if len(missing_areas) > 5 else "")
+    )
+
 # Filter tanggal
 date_range = st.sidebar.date_input(
     "Rentang Tanggal:",
-    value=[df['tanggal'].min().date(), df['tanggal'].max().date()],
-    min_value=df['tanggal'].min().date(),
-    max_value=df['tanggal'].max().date()
+    value=[min_date, max_date],
+    min_value=min_date,
+    max_value=max_date
 )
 
 # Filter musim
@@ -177,17 +241,74 @@ season_filter = st.sidebar.selectbox(
     options=['Semua', 'Kemarau', 'Hujan']
 )
 
+# Periode pembanding delta metrik header. Bawaan 7 hari terakhir: dengan
+# rentang bawaan (seluruh data) periode sebelumnya selalu jatuh sebelum data
+comparison_mode = st.sidebar.selectbox(
+    "Bandingkan Dengan:",
+    options=COMPARISONS,
+    index=COMPARISONS.index('7 hari terakhir'),
+    help="7/30 hari: jendela yang berakhir di tanggal akhir rentang"
+)
+
+# Ensemble skenario iklim: pita ketidakpastian di tab trend dan risiko.
+# Skenario dibangkitkan generator mock, sehingga hanya sebanding dengan data mock
+if isinstance(data_source, MockSource):
+    ensemble_size = st.sidebar.select_slider(
+        "Ensemble Skenario Iklim:",
+        options=[0, 50, 100, 200, 500],
+        value=0,
+        format_func=lambda n: "Nonaktif" if n == 0 else f"{n} realisasi",
+        help="Realisasi El Niño/La Niña terganggu, dijalankan paralel di semua core"
+    )
+else:
+    ensemble_size = 0
+    st.sidebar.caption("Ensemble skenario iklim hanya tersedia untuk data simulasi")
+
+# Mode render: hanya tab aktif yang dihitung
+lazy_tabs = st.sidebar.checkbox(
+    "Mode ringan (hanya tab aktif)",
+    value=True,
+    help="Hitung dan kirim grafik hanya untuk tampilan yang sedang dibuka"
+)
+
 # Filter data berdasarkan sidebar
-filtered_df = df[df['area'].isin(selected_areas)]
+start, end = (date_range[0], date_range[1]) if len(date_range) == 2 else (None, None)
 
-if len(date_range) == 2:
-    filtered_df = filtered_df[
-        (filtered_df['tanggal'].dt.date >= date_range[0]) &
-        (filtered_df['tanggal'].dt.date <= date_range[1])
-    ]
+# Agregat tab dijawab dari cube rollup (diperbarui inkremental saat ingest)
+# Potongan hasil filter dibagi antar sesi lewat dataset bersama (per versi data)
+with profiler.section('filter'):
+    filter_key = (region_level, tuple(selected_units), start, end, season_filter)
+    if store_path:
+        # Filter didorong ke partisi bulan/area dan row-group Parquet
+        filtered_df = dataset.shared.get(
+            data_version, ('store',) + filter_key,
+            lambda: store.read(areas=selected_areas, start=start, end=end, season=season_filter)
+        )
+    else:
+        # Rentang tanggal via searchsorted pada indeks terurut (area, tanggal)
+        filtered_df = dataset.shared.get(
+            data_version, ('index',) + filter_key,
+            lambda: filter_index.select(selected_areas, start, end, season_filter)
+        )
+    # Agregat di tingkat terpilih digabung dari cube tingkat tersebut
+    rollup = region_rollup.select(
+        region_level, selected_units, start, end, None if season_filter == 'Semua' else season_filter
+    )
 
-if season_filter != 'Semua':
-    filtered_df = filtered_df[filtered_df['musim'] == season_filter]
+profiler.update_state(
+    data_version=data_version,
+    store=bool(store_path),
+    region_level=region_level,
+    units=len(selected_units),
+    areas=len(selected_areas),
+    start=start,
+    end=end,
+    season=season_filter,
+    comparison=comparison_mode,
+    ensemble=ensemble_size,
+    lazy_tabs=lazy_tabs,
+    rows=len(filtered_df)
+)
 
 # Header
 st.title("🔥 Dashboard Monitoring Titik Panas Pontianak")
@@ -211,388 +332,336 @@ with st.expander("ℹ️ Informasi Geografis Pontianak"):
         st.write("• **Risiko tinggi**: Juli - September")
         st.write("• **Angin dominan**: Tenggara & Barat Daya")
 
-# Metrics utama
-col1, col2, col3, col4, col5 = st.columns(5)
-
-with col1:
-    total_hotspots = filtered_df['titik_panas'].sum()
-    yesterday_hotspots = df[df['tanggal'] == df['tanggal'].max() - timedelta(days=1)]['titik_panas'].sum()
-    delta_hotspots = total_hotspots - yesterday_hotspots
-    st.metric(
-        label="Total Titik Panas",
-        value=f"{total_hotspots:,.0f}",
-        delta=f"{delta_hotspots:+.0f}"
-    )
+# Metrics utama: periode kini dan pembanding dari indeks prefix cube rollup
+with profiler.section('metrik'):
+    col1, col2, col3, col4, col5 = st.columns(5)
 
-with col2:
-    avg_rainfall = filtered_df['curah_hujan'].mean()
-    st.metric(
-        label="Rata-rata Curah Hujan",
-        value=f"{avg_rainfall:.1f} mm",
-        delta=f"{np.random.uniform(-5, 5):.1f}"
+    header = header_data(
+        region_rollup, region_level, selected_units, comparison_mode,
+        start or min_date, end or max_date, None if season_filter == 'Semua' else season_filter
     )
+    metrics = header['metrik']
 
-with col3:
-    avg_temp = filtered_df['suhu'].mean()
-    st.metric(
-        label="Suhu Rata-rata",
-        value=f"{avg_temp:.1f}°C",
-        delta=f"{np.random.uniform(-1, 1):.1f}"
-    )
+    with col1:
+        total_hotspots, previous = metrics['titik_panas']
+        st.metric(
+            label="Total Titik Panas",
+            value=f"{total_hotspots:,.0f}",
+            delta=metric_delta(total_hotspots, previous, '+,.0f'),
+            delta_color="inverse"
+        )
 
-with col4:
-    avg_ispu = filtered_df['ispu'].mean()
-    ispu_status = "Baik" if avg_ispu < 50 else "Sedang" if avg_ispu < 100 else "Tidak Sehat"
-    st.metric(
-        label="ISPU Rata-rata",
-        value=f"{avg_ispu:.0f}",
-        delta=ispu_status
-    )
+    with col2:
+        avg_rainfall, previous = metrics['curah_hujan']
+        st.metric(
+            label="Rata-rata Curah Hujan",
+            value=f"{avg_rainfall:.1f} mm",
+            delta=metric_delta(avg_rainfall, previous, '+.1f')
+        )
 
-with col5:
-    high_risk_count = len(filtered_df[filtered_df['tingkat_risiko'].isin(['Tinggi', 'Sangat Tinggi'])])
-    st.metric(
-        label="Area Berisiko Tinggi",
-        value=high_risk_count,
-        delta=f"{np.random.randint(-2, 3):+d}"
+    with col3:
+        avg_temp, previous = metrics['suhu']
+        st.metric(
+            label="Suhu Rata-rata",
+            value=f"{avg_temp:.1f}°C",
+            delta=metric_delta(avg_temp, previous, '+.1f'),
+            delta_color="inverse"
+        )
+
+    with col4:
+        avg_ispu, previous = metrics['ispu']
+        ispu_status = "Baik" if avg_ispu < 50 else "Sedang" if avg_ispu < 100 else "Tidak Sehat"
+        delta_ispu = metric_delta(avg_ispu, previous, '+.0f')
+        st.metric(
+            label="ISPU Rata-rata",
+            value=f"{avg_ispu:.0f}",
+            delta=f"{delta_ispu} ({ispu_status})" if delta_ispu else ispu_status,
+            delta_color="inverse" if delta_ispu else "off"
+        )
+
+    with col5:
+        high_risk_count, previous = metrics['risiko_tinggi']
+        st.metric(
+            label="Area Berisiko Tinggi",
+            value=high_risk_count,
+            delta=metric_delta(high_risk_count, previous, '+d'),
+            delta_color="inverse"
+        )
+
+    (cur_start, cur_end), (prev_start, prev_end) = header['periode'], header['pembanding']
+    st.caption(
+        f"Periode {cur_start:%d %b %Y} – {cur_end:%d %b %Y} dibandingkan dengan "
+        f"{prev_start:%d %b %Y} – {prev_end:%d %b %Y} ({comparison_mode.lower()})"
+        + ("" if metrics['titik_panas'][1] is not None else " — data pembanding tidak lengkap, delta tidak ditampilkan")
     )
 
 st.markdown("---")
 
-# Tab untuk berbagai visualisasi
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📈 Trend & Prakiraan", 
-    "🗺️ Peta Pontianak", 
-    "🌤️ Cuaca & Iklim", 
-    "📊 Analisis Risiko",
-    "🔬 FFMC & ISPU"
-])
+def current_ensemble():
+    """Ensemble untuk area terpilih, atau None bila nonaktif"""
+    if not ensemble_size or not selected_areas:
+        return None
+    # Skenario dari awal data sampai hari ini (+ 7 hari prakiraan)
+    end = min(max_date, datetime.now().date())
+    with profiler.section('ensemble'), st.spinner(f"Menjalankan {ensemble_size} realisasi skenario..."):
+        return load_ensemble(data_key, tuple(selected_areas), min_date, end, ensemble_size, registry)
 
-with tab1:
+# Setiap tab adalah fragment: interaksi widget di dalam tab (mis. pilihan
+# variabel cuaca) hanya menjalankan ulang tab tersebut. Agregasi dan figure
+# dibangun di titik_panas.views agar dapat diuji dan di-benchmark tanpa Streamlit.
+@fragment
+@profiled('tab:trend')
+def render_trend(filtered_df, rollup):
+    """Tab trend titik panas, analisis musiman dan prakiraan 7 hari"""
     st.subheader("Trend Titik Panas dan Cuaca Pontianak")
     
-    # Aggregate data harian
-    daily_data = filtered_df.groupby('tanggal').agg({
-        'titik_panas': 'sum',
-        'curah_hujan': 'mean',
-        'suhu': 'mean',
-        'kelembaban': 'mean',
-        'skor_risiko': 'mean'
-    }).reset_index()
-    
-    # Grafik trend utama
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=daily_data['tanggal'],
-        y=daily_data['titik_panas'],
-        mode='lines+markers',
-        name='Titik Panas',
-        line=dict(color='red', width=3),
-        yaxis='y'
-    ))
+    with profiler.section('agregasi'):
+        data = trend_data(rollup, forecast_engine, selected_areas, current_ensemble(), page_width)
+    with profiler.section('figure'):
+        figures = trend_figures(data)
     
-    fig.add_trace(go.Scatter(
-        x=daily_data['tanggal'],
-        y=daily_data['curah_hujan'],
-        mode='lines+markers',
-        name='Curah Hujan (mm)',
-        line=dict(color='blue', width=3),
-        yaxis='y2'
-    ))
-    
-    fig.update_layout(
-        title="Trend Titik Panas vs Curah Hujan di Pontianak",
-        xaxis_title="Tanggal",
-        yaxis=dict(title="Jumlah Titik Panas", side="left", color="red"),
-        yaxis2=dict(title="Curah Hujan (mm)", side="right", overlaying="y", color="blue"),
-        height=500,
-        hovermode='x unified'
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart('trend', figures['trend'])
     
     # Analisis musiman
     col1, col2 = st.columns(2)
     
     with col1:
-        seasonal_data = filtered_df.groupby('musim').agg({
-            'titik_panas': 'mean',
-            'curah_hujan': 'mean',
-            'suhu': 'mean'
-        }).reset_index()
-        
-        fig_season = px.bar(
-            seasonal_data,
-            x='musim',
-            y='titik_panas',
-            title="Rata-rata Titik Panas per Musim",
-            color='musim',
-            color_discrete_map={'Kemarau': 'orange', 'Hujan': 'lightblue'}
-        )
-        st.plotly_chart(fig_season, use_container_width=True)
+        show_chart('season', figures['season'])
     
     with col2:
-        # Prediksi sederhana 7 hari
         st.subheader("Prakiraan 7 Hari")
         
-        # Simulasi prediksi berdasarkan pola musiman
-        recent_trend = daily_data.tail(14)
-        current_month = datetime.now().month
-        is_dry_prediction = current_month in [4, 5, 6, 7, 8, 9, 10]
-        
-        if is_dry_prediction:
-            pred_hotspot_trend = "📈 Meningkat (Musim Kemarau)"
-            pred_rainfall_trend = "📉 Menurun"
-        else:
-            pred_hotspot_trend = "📉 Menurun (Musim Hujan)"
-            pred_rainfall_trend = "📈 Meningkat"
-        
-        st.info(f"**Prediksi Titik Panas:** {pred_hotspot_trend}")
-        st.info(f"**Prediksi Curah Hujan:** {pred_rainfall_trend}")
-        
-        avg_recent_hotspot = recent_trend['titik_panas'].mean()
-        avg_recent_rain = recent_trend['curah_hujan'].mean()
+        # Prakiraan dari model per area yang sudah di-fit (hanya membaca state)
+        st.info(f"**Prediksi Titik Panas:** {trend_label(data['pred_hotspot'], data['recent_hotspot'])}")
+        st.info(f"**Prediksi Curah Hujan:** {trend_label(data['pred_rain'], data['recent_rain'])}")
         
-        st.metric("Titik Panas 7 Hari Terakhir", f"{avg_recent_hotspot:.1f}")
-        st.metric("Curah Hujan 7 Hari Terakhir", f"{avg_recent_rain:.1f} mm")
+        st.metric(
+            "Titik Panas 7 Hari ke Depan",
+            f"{data['pred_hotspot']:.1f}",
+            f"{data['pred_hotspot'] - data['recent_hotspot']:+.1f} vs 7 hari terakhir",
+            delta_color="inverse"
+        )
+        st.metric(
+            "Curah Hujan 7 Hari ke Depan",
+            f"{data['pred_rain']:.1f} mm",
+            f"{data['pred_rain'] - data['recent_rain']:+.1f} mm vs 7 hari terakhir"
+        )
+        show_chart('forecast', figures['forecast'])
 
-with tab2:
+@fragment
+@profiled('tab:peta')
+def render_map(filtered_df, rollup):
+    """Tab peta distribusi risiko area"""
     st.subheader("Peta Distribusi Risiko Area Pontianak")
     
-    # Heatmap per area
-    area_summary = filtered_df.groupby(['area', 'tingkat_risiko']).size().unstack(fill_value=0)
+    with profiler.section('agregasi'):
+        data = map_data(filtered_df, rollup)
+    with profiler.section('figure'):
+        figures = map_figures(data)
     
-    if not area_summary.empty:
-        fig_heatmap = px.imshow(
-            area_summary.T,
-            title="Distribusi Tingkat Risiko per Area di Pontianak",
-            color_continuous_scale="Reds",
-            aspect="auto"
-        )
-        fig_heatmap.update_layout(
-            xaxis_title="Area/Kecamatan",
-            yaxis_title="Tingkat Risiko"
-        )
-        st.plotly_chart(fig_heatmap, use_container_width=True)
+    # Heatmap per area
+    if 'heatmap' in figures:
+        show_chart('heatmap', figures['heatmap'])
     
     # Scatter map dengan koordinat
-    latest_data = filtered_df[filtered_df['tanggal'] == filtered_df['tanggal'].max()]
-    
-    fig_map = px.scatter_mapbox(
-        latest_data,
-        lat='latitude',
-        lon='longitude',
-        size='titik_panas',
-        color='tingkat_risiko',
-        hover_name='area',
-        hover_data=['titik_panas', 'curah_hujan', 'suhu'],
-        color_discrete_map={
-            'Rendah': 'green',
-            'Sedang': 'yellow', 
-            'Tinggi': 'orange',
-            'Sangat Tinggi': 'red'
-        },
-        title="Peta Sebaran Titik Panas Pontianak (Data Terkini)",
-        mapbox_style="open-street-map",
-        zoom=11,
-        center={"lat": -0.026, "lon": 109.34}
-    )
-    
-    fig_map.update_layout(height=600)
-    st.plotly_chart(fig_map, use_container_width=True)
+    show_chart('map', figures['map'])
 
-with tab3:
+    # Deteksi titik individual: query viewport + klaster di server
+    hotspot_index = load_hotspot_index(data_key, _filter_index=None if store_path else filter_index)
+    if hotspot_index is not None and not filtered_df.empty:
+        zoom = st.select_slider("Zoom Peta Deteksi:", options=list(range(8, 16)), value=11)
+        with profiler.section('agregasi:klaster'):
+            clusters = cluster_data(filtered_df, hotspot_index, zoom)
+        with profiler.section('figure:klaster'):
+            fig_points = cluster_figure(clusters)
+        show_chart('clusters', fig_points)
+
+@fragment
+@profiled('tab:cuaca')
+def render_weather(filtered_df, rollup):
+    """Tab analisis cuaca dan iklim"""
     st.subheader("Analisis Cuaca dan Iklim Pontianak")
     
     col1, col2 = st.columns(2)
     
+    with col2:
+        selected_var = st.selectbox("Pilih Variabel Cuaca:", WEATHER_VARIABLES)
+    
+    with profiler.section('agregasi'):
+        data = weather_data(filtered_df, rollup, selected_var, page_width)
+    with profiler.section('figure'):
+        figures = weather_figures(data)
+    
     with col1:
-        # Wind rose Pontianak
-        fig_wind = px.histogram(
-            filtered_df,
-            x='arah_angin',
-            nbins=16,
-            title="Mawar Angin Pontianak",
-            labels={'arah_angin': 'Arah Angin (°)', 'count': 'Frekuensi'}
-        )
-        fig_wind.update_layout(
-            xaxis=dict(
-                tickmode='array',
-                tickvals=[0, 45, 90, 135, 180, 225, 270, 315],
-                ticktext=['U', 'TL', 'T', 'TG', 'S', 'BD', 'B', 'BL']
-            )
-        )
-        st.plotly_chart(fig_wind, use_container_width=True)
+        # Wind rose Pontianak (arah x kecepatan, dihitung di server)
+        show_chart('wind_rose', figures['wind_rose'])
         
         # Temperature vs Humidity
-        fig_temp_hum = px.scatter(
-            filtered_df,
-            x='suhu',
-            y='kelembaban',
-            color='musim',
-            size='titik_panas',
-            title="Hubungan Suhu vs Kelembaban",
-            color_discrete_map={'Kemarau': 'orange', 'Hujan': 'lightblue'}
-        )
-        st.plotly_chart(fig_temp_hum, use_container_width=True)
+        show_chart('temp_humidity', figures['temp_humidity'])
     
     with col2:
-        # Variabel cuaca time series
-        variables = ['curah_hujan', 'sinaran_matahari', 'kecepatan_angin', 'kelembaban']
-        selected_var = st.selectbox("Pilih Variabel Cuaca:", variables)
-        
-        daily_var = filtered_df.groupby('tanggal')[selected_var].mean().reset_index()
-        fig_var = px.line(
-            daily_var,
-            x='tanggal',
-            y=selected_var,
-            title=f"Trend {selected_var.replace('_', ' ').title()} di Pontianak"
-        )
-        st.plotly_chart(fig_var, use_container_width=True)
-        
-        # Box plot per musim
-        fig_box = px.box(
-            filtered_df,
-            x='musim',
-            y=selected_var,
-            title=f"Distribusi {selected_var.replace('_', ' ').title()} per Musim",
-            color='musim',
-            color_discrete_map={'Kemarau': 'orange', 'Hujan': 'lightblue'}
-        )
-        st.plotly_chart(fig_box, use_container_width=True)
+        # Variabel cuaca time series dan box plot per musim
+        show_chart('variable', figures['variable'])
+        show_chart('box', figures['box'])
 
-with tab4:
+@fragment
+@profiled('tab:risiko')
+def render_risk(filtered_df, rollup):
+    """Tab analisis tingkat risiko kebakaran"""
     st.subheader("Analisis Tingkat Risiko Kebakaran")
     
-    # Distribusi risiko
-    risk_counts = filtered_df['tingkat_risiko'].value_counts()
-    colors = {
-        'Rendah': 'green',
-        'Sedang': 'yellow',
-        'Tinggi': 'orange', 
-        'Sangat Tinggi': 'red'
-    }
-    
+    with profiler.section('agregasi'):
+        data = risk_data(filtered_df, rollup, current_ensemble(), page_width)
+    with profiler.section('figure'):
+        figures = risk_figures(data)
     col1, col2 = st.columns(2)
     
     with col1:
-        fig_risk_pie = px.pie(
-            values=risk_counts.values,
-            names=risk_counts.index,
-            title="Distribusi Tingkat Risiko (%)",
-            color=risk_counts.index,
-            color_discrete_map=colors
-        )
-        st.plotly_chart(fig_risk_pie, use_container_width=True)
+        show_chart('pie', figures['pie'])
     
     with col2:
-        # Risk score time series
-        daily_risk = filtered_df.groupby('tanggal')['skor_risiko'].mean().reset_index()
-        fig_risk_trend = px.line(
-            daily_risk,
-            x='tanggal',
-            y='skor_risiko',
-            title="Trend Skor Risiko Harian",
-            color_discrete_sequence=['red']
-        )
-        fig_risk_trend.add_hline(y=70, line_dash="dash", line_color="red", 
-                                annotation_text="Batas Sangat Tinggi")
-        fig_risk_trend.add_hline(y=50, line_dash="dash", line_color="orange",
-                                annotation_text="Batas Tinggi")
-        st.plotly_chart(fig_risk_trend, use_container_width=True)
+        show_chart('trend', figures['trend'])
     
     # Correlation dengan faktor cuaca
     st.subheader("Korelasi Faktor Risiko")
-    risk_factors = ['titik_panas', 'curah_hujan', 'suhu', 'kelembaban', 'kecepatan_angin', 'skor_risiko']
-    corr_matrix = filtered_df[risk_factors].corr()
-    
-    fig_corr = px.imshow(
-        corr_matrix,
-        title="Matriks Korelasi Faktor Risiko",
-        color_continuous_scale="RdBu",
-        zmin=-1, zmax=1
-    )
-    st.plotly_chart(fig_corr, use_container_width=True)
+    show_chart('corr', figures['corr'])
+
+    if 'exceedance' in figures:
+        show_chart('exceedance', figures['exceedance'])
 
-with tab5:
+@fragment
+@profiled('tab:ffmc_ispu')
+def render_ffmc_ispu(filtered_df, rollup):
+    """Tab FFMC dan ISPU"""
     st.subheader("Fine Fuel Moisture Code (FFMC) & Indeks Kualitas Udara")
     
+    with profiler.section('agregasi'):
+        data = ffmc_ispu_data(filtered_df, rollup, page_width)
+    with profiler.section('figure'):
+        figures = ffmc_ispu_figures(data)
     col1, col2 = st.columns(2)
     
     with col1:
         # FFMC analysis
         st.write("**FFMC (Fine Fuel Moisture Code)**")
         st.write("Indikator kelembaban bahan bakar halus (daun, rumput kering)")
-        
-        avg_ffmc = filtered_df['ffmc'].mean()
-        if avg_ffmc > 85:
-            ffmc_status = "🔴 Sangat Kering"
-        elif avg_ffmc > 70:
-            ffmc_status = "🟠 Kering"
-        elif avg_ffmc > 50:
-            ffmc_status = "🟡 Sedang"
-        else:
-            ffmc_status = "🟢 Lembab"
-            
-        st.metric("FFMC Rata-rata", f"{avg_ffmc:.1f}", ffmc_status)
-        
-        # FFMC trend
-        daily_ffmc = filtered_df.groupby('tanggal')['ffmc'].mean().reset_index()
-        fig_ffmc = px.line(
-            daily_ffmc,
-            x='tanggal',
-            y='ffmc',
-            title="Trend FFMC Pontianak",
-            color_discrete_sequence=['brown']
-        )
-        fig_ffmc.add_hline(y=85, line_dash="dash", line_color="red")
-        fig_ffmc.add_hline(y=70, line_dash="dash", line_color="orange")
-        st.plotly_chart(fig_ffmc, use_container_width=True)
+        st.metric("FFMC Rata-rata", f"{data['avg_ffmc']:.1f}", ffmc_label(data['avg_ffmc']))
+        st.metric("FWI Rata-rata", f"{data['avg_fwi']:.1f}")
+        show_chart('ffmc', figures['ffmc'])
     
     with col2:
         # ISPU analysis
         st.write("**ISPU (Indeks Standar Pencemaran Udara)**")
         st.write("Indikator kualitas udara akibat asap kebakaran")
-        
-        avg_ispu = filtered_df['ispu'].mean()
-        if avg_ispu > 300:
-            ispu_status = "🔴 Berbahaya"
-        elif avg_ispu > 200:
-            ispu_status = "🟠 Sangat Tidak Sehat"
-        elif avg_ispu > 100:
-            ispu_status = "🟡 Tidak Sehat"
-        elif avg_ispu > 50:
-            ispu_status = "🟢 Sedang"
-        else:
-            ispu_status = "🟢 Baik"
-            
-        st.metric("ISPU Rata-rata", f"{avg_ispu:.0f}", ispu_status)
-        
-        # ISPU trend
-        daily_ispu = filtered_df.groupby('tanggal')['ispu'].mean().reset_index()
-        fig_ispu = px.line(
-            daily_ispu,
-            x='tanggal',
-            y='ispu',
-            title="Trend ISPU Pontianak",
-            color_discrete_sequence=['purple']
-        )
-        fig_ispu.add_hline(y=100, line_dash="dash", line_color="orange")
-        fig_ispu.add_hline(y=200, line_dash="dash", line_color="red")
-        st.plotly_chart(fig_ispu, use_container_width=True)
+        st.metric("ISPU Rata-rata", f"{data['avg_ispu']:.0f}", ispu_label(data['avg_ispu']))
+        show_chart('ispu', figures['ispu'])
     
     # Hubungan FFMC, ISPU dengan titik panas
-    fig_relationship = px.scatter(
-        filtered_df,
-        x='ffmc',
-        y='ispu',
-        size='titik_panas',
-        color='tingkat_risiko',
-        title="Hubungan FFMC vs ISPU (ukuran = jumlah titik panas)",
-        color_discrete_map=colors
+    show_chart('relationship', figures['relationship'])
+
+# Kecepatan replay (hari per detik)
+REPLAY_SPEEDS = [1, 2, 5, 10, 30]
+
+def set_replay(playing, position=None):
+    st.session_state['replay_playing'] = playing
+    if position is not None:
+        st.session_state['replay_pos'] = position
+
+@fragment
+@profiled('tab:replay')
+def render_replay(filtered_df, rollup):
+    """Tab replay historis periode terpilih hari demi hari"""
+    st.subheader("Replay Historis Musim Kebakaran")
+
+    # Posisi replay kembali ke awal bila data atau filter berubah
+    replay_key = (data_key, filter_key)
+    if st.session_state.get('replay_key') != replay_key:
+        st.session_state['replay_key'] = replay_key
+        set_replay(False, 0)
+
+    with profiler.section('agregasi'):
+        data = replay_data(rollup, registry.coords(region_level))
+    if data['daily'].empty:
+        st.info("Tidak ada data pada periode terpilih")
+        return
+    # Figure dibangun sekali; setiap frame hanya mengganti potongan data trace
+    with profiler.section('figure'):
+        figures = ReplayFigures(data)
+
+    col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+    with col1:
+        speed = st.select_slider(
+            "Kecepatan (hari/detik):", options=REPLAY_SPEEDS, value=5, key='replay_speed'
+        )
+    playing = st.session_state.get('replay_playing', False)
+    with col2:
+        st.button("⏸️ Jeda" if playing else "▶️ Putar", on_click=set_replay, args=(not playing,),
+                  use_container_width=True)
+    with col3:
+        st.button("⏮️ Ulang", on_click=set_replay, args=(False, 0), use_container_width=True)
+    with col4:
+        st.button("⏭️ Akhir", on_click=set_replay, args=(False, len(figures) - 1), use_container_width=True)
+
+    progress = st.progress(0.0)
+    status = st.empty()
+    trend_slot = st.empty()
+    map_slot = st.empty()
+
+    def show(i):
+        trend, fig_map = figures.frame(i)
+        day = data['daily'].iloc[i]
+        progress.progress((i + 1) / len(figures), text=f"Hari {i + 1:,} dari {len(figures):,}")
+        status.markdown(
+            f"**{day['tanggal']:%d %B %Y}** · titik panas {day['titik_panas']:,.0f} · "
+            f"skor risiko {day['skor_risiko']:.1f}"
+        )
+        trend_slot.plotly_chart(trend, use_container_width=True)
+        map_slot.plotly_chart(fig_map, use_container_width=True)
+
+    position = min(st.session_state.get('replay_pos', 0), len(figures) - 1)
+    show(position)
+    if not playing:
+        return
+    # Interaksi widget selama pemutaran menghentikan loop (rerun fragment);
+    # posisi disimpan tiap frame sehingga replay dapat dilanjutkan
+    interval = 1 / speed
+    while position < len(figures) - 1:
+        started = time.perf_counter()
+        position += 1
+        show(position)
+        st.session_state['replay_pos'] = position
+        time.sleep(max(0.0, interval - (time.perf_counter() - started)))
+    # Selesai: tampilkan kembali tombol "Putar"
+    set_replay(False)
+    st.rerun()
+
+# Tab untuk berbagai visualisasi
+TAB_LABELS = [
+    "📈 Trend & Prakiraan", 
+    "🗺️ Peta Pontianak", 
+    "🌤️ Cuaca & Iklim", 
+    "📊 Analisis Risiko",
+    "🔬 FFMC & ISPU",
+    "🎞️ Replay Historis"
+]
+TAB_RENDERERS = [render_trend, render_map, render_weather, render_risk, render_ffmc_ispu, render_replay]
+
+if lazy_tabs:
+    # Hanya tampilan aktif yang dihitung dan dikirim ke browser
+    active_tab = st.radio(
+        "Tampilan:",
+        TAB_LABELS,
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed"
     )
-    st.plotly_chart(fig_relationship, use_container_width=True)
+    profiler.update_state(active_tab=active_tab)
+    TAB_RENDERERS[TAB_LABELS.index(active_tab)](filtered_df, rollup)
+else:
+    for tab, render in zip(st.tabs(TAB_LABELS), TAB_RENDERERS):
+        with tab:
+            render(filtered_df, rollup)
+
 
 # Footer
 st.markdown("---")
@@ -600,12 +669,17 @@ st.markdown("**🌍 Dashboard Monitoring Titik Panas Kota Pontianak**")
 st.markdown("*Tugas Akhir Informatika - Sistem Prediksi dan Monitoring Kebakaran Hutan dan Lahan*")
 st.markdown("📍 *Kota Pontianak, Kalimantan Barat - Indonesia*")
 
-# Sidebar info detail
+# Sidebar info detail: cakupan wilayah dari registri, bukan angka tetap
+leaf_units = registry.units(registry.leaf_level)
+parent_units = registry.units(registry.levels[-2]) if len(registry.levels) > 1 else []
+coverage = f"{len(leaf_units)} {LEVEL_LABELS.get(registry.leaf_level, registry.leaf_level).lower()}"
+if len(parent_units) == 1:
+    coverage += f" di {parent_units[0]}"
 st.sidebar.markdown("---")
 st.sidebar.info(
     "**📊 Tentang Dashboard**\n\n"
     "Dashboard khusus untuk monitoring:\n"
-    "• 6 area/kecamatan di Pontianak\n"
+    f"• {coverage}\n"
     "• Pola iklim khatulistiwa\n"
     "• Analisis musiman\n"
     "• FFMC & ISPU monitoring\n"
@@ -621,3 +695,31 @@ if current_season == "Kemarau":
     st.sidebar.warning("⚠️ **Peningkatan Kewaspadaan**\nRisiko kebakaran lebih tinggi")
 else:
     st.sidebar.info("🌧️ **Musim Hujan**\nRisiko kebakaran relatif rendah")
+
+# Rincian waktu rerun ini (rerun fragment hanya dicatat ke log)
+if profiler.enabled:
+    breakdown = profiler.breakdown()
+    total_ms = profiler.total_ms()
+    profiler.flush()
+    with st.sidebar.expander("⏱️ Profiling", expanded=True):
+        st.metric("Total Rerun", f"{total_ms:.0f} ms")
+        breakdown['bagian'] = ['\u2003' * level + name.rsplit('/', 1)[-1]
+                               for level, name in zip(breakdown['level'], breakdown['section'])]
+        st.dataframe(
+            breakdown[['bagian', 'ms']].round(1),
+            hide_index=True,
+            use_container_width=True
+        )
+        memory = dataset.shared.memory_report()
+        st.caption(
+            f"Dataset bersama v{memory['version']}: "
+            f"{memory['resident_bytes'] / 2 ** 20:.1f} / {memory['budget'] / 2 ** 20:.0f} MB di heap, "
+            f"tabel {memory['table_bytes'] / 2 ** 20:.1f} MB dalam {memory['segments']} segmen "
+            f"({memory['mapped']} di memory map), "
+            f"cube {memory['derived_bytes'] / 2 ** 20:.1f} MB, "
+            f"{memory['slices']} potongan filter"
+        )
+        st.caption(f"Sesi {profile_session} · log: {profiler.logger.handlers[0].baseFilename}")
+
+# Rerun pertama sesi baru setelah pra-panas mode produksi: laporkan cache yang dimuat ulang
+cache_loads.run_finished(profile_session)
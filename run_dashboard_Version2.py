@@ -1,22 +1,44 @@
 # Script untuk menjalankan dashboard
+import argparse
 import subprocess
 import sys
 
-def main():
+SCRIPT = "dashboard_titik_panas.py"
+
+def main(argv=None):
     """Menjalankan dashboard Streamlit"""
+    parser = argparse.ArgumentParser(description="Menjalankan dashboard titik panas")
+    parser.add_argument("--prod", action="store_true",
+                        help="Mode produksi: data dan cache dimuat sebelum menerima koneksi")
+    parser.add_argument("--workers", type=int, default=1, help="Jumlah worker (mode produksi)")
+    parser.add_argument("--port", type=int, default=8501, help="Port worker pertama")
+    parser.add_argument("--address", default="0.0.0.0")
+    parser.add_argument("--proxy-port", type=int,
+                        help="Port proxy lokal di depan semua worker (mode produksi)")
+    args = parser.parse_args(argv)
+
     try:
         print("🚀 Memulai Dashboard Monitoring Titik Panas...")
-        print("📊 Dashboard akan terbuka di browser pada http://localhost:8501")
+        if args.prod:
+            from titik_panas.serve import launch
+
+            print(f"🏭 Mode produksi: {args.workers} worker mulai port {args.port}, "
+                  "menunggu data dan render pertama siap...")
+            print("⏹️  Tekan Ctrl+C untuk menghentikan dashboard")
+            launch(SCRIPT, args.workers, args.port, args.address, args.proxy_port)
+            return
+
+        print(f"📊 Dashboard akan terbuka di browser pada http://localhost:{args.port}")
         print("⏹️  Tekan Ctrl+C untuk menghentikan dashboard")
-        
+
         # Menjalankan streamlit
         subprocess.run([
-            sys.executable, "-m", "streamlit", "run", 
-            "dashboard_titik_panas.py",
-            # "--server.port=8578",
+            sys.executable, "-m", "streamlit", "run",
+            SCRIPT,
+            f"--server.port={args.port}",
             # "--server.address=localhost"
         ])
-        
+
     except KeyboardInterrupt:
         print("\n✅ Dashboard dihentikan oleh user")
     except Exception as e:
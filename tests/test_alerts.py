@@ -0,0 +1,128 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from titik_panas.alerts import ALERT_RULES, AlertEvaluator, FileOutbox, SqliteOutbox, alert_levels, open_outbox
+from titik_panas.generator import generate_pontianak_data, synthetic_areas
+from titik_panas.rollup import RollupCube
+from titik_panas.schema import apply_schema
+
+END = pd.Timestamp('2025-03-01')
+DAYS = pd.date_range(END - pd.Timedelta(days=5), END, freq='D')
+HOUR = pd.Timedelta(hours=1)
+
+
+def cube_with(skor_risiko=None, ispu=None, ffmc=None, n_areas=2):
+    """Cube dari data mock (satu baris per area per hari) dengan nilai indikator terkendali
+
+    Setiap indikator berupa daftar nilai per hari untuk semua area, atau
+    array (area, hari); indikator yang tidak diberikan tidak memicu peringatan.
+    """
+    areas, coords = synthetic_areas(n_areas, rng=0)
+    df = generate_pontianak_data(len(DAYS) - 1, rng=0, areas=areas, area_coords=coords, end=END)
+    df = apply_schema(df[df['tanggal'] <= END].reset_index(drop=True))
+    area_pos = df['area'].astype(str).map(areas.index).to_numpy()
+    day_pos = DAYS.get_indexer(df['tanggal'].dt.normalize())
+    for name, values in {'skor_risiko': skor_risiko, 'ispu': ispu, 'ffmc': ffmc}.items():
+        values = np.zeros(len(DAYS)) if values is None else np.asarray(values, dtype=float)
+        values = np.broadcast_to(values, (n_areas, len(DAYS)))
+        df[name] = values[area_pos, day_pos]
+    return RollupCube.from_frame(df, dates=DAYS), areas
+
+
+@pytest.fixture(params=['alerts.db', 'alerts.jsonl'])
+def outbox_path(request, tmp_path):
+    return str(tmp_path / request.param)
+
+
+def outbox_ids(path):
+    if path.endswith('.db'):
+        return list(SqliteOutbox(path).pending(limit=1_000)['id'])
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)['id'] for line in f]
+
+
+def test_alert_levels_exclusive_thresholds_and_nan():
+    values = np.array([[50, 100, 70], [50.01, 100.5, 85.5], [np.nan, 301, np.nan]])
+    levels = alert_levels(values, ALERT_RULES)
+    np.testing.assert_array_equal(levels, [[0, 0, 0], [1, 1, 2], [0, 3, 0]])
+
+
+def test_reevaluation_and_restart_do_not_duplicate(outbox_path):
+    cube, areas = cube_with(skor_risiko=[80] * len(DAYS))
+    now = END + 12 * HOUR
+    evaluator = AlertEvaluator(open_outbox(outbox_path), backfill_days=len(DAYS))
+    first = evaluator.evaluate(cube, now)
+    # Kondisi bertahan dalam satu siklus: satu peringatan per area, bukan per hari
+    assert sorted(first['area']) == areas
+    assert set(first['tanggal']) == {DAYS[0].date().isoformat()}
+    assert evaluator.watermark == END
+
+    # Hari yang sama tidak dievaluasi ulang
+    assert len(evaluator.evaluate(cube, now + 24 * HOUR)) == 0
+
+    # Proses baru memulihkan watermark dan state dari outbox
+    restarted = AlertEvaluator(open_outbox(outbox_path), backfill_days=len(DAYS))
+    assert restarted.watermark == END
+    np.testing.assert_array_equal(restarted.last_level, evaluator.last_level)
+    assert len(restarted.evaluate(cube, now + 24 * HOUR)) == 0
+
+    # Outbox menolak id yang sudah ada walau state evaluator hilang
+    assert open_outbox(outbox_path).append(first) == 0
+    ids = outbox_ids(outbox_path)
+    assert sorted(ids) == sorted(first['id']) and len(set(ids)) == len(ids)
+
+
+def test_persisting_level_is_rate_limited_per_area(tmp_path):
+    cube, areas = cube_with(ispu=[150] * len(DAYS), ffmc=[75] * len(DAYS))
+    evaluator = AlertEvaluator(FileOutbox(str(tmp_path / 'alerts.jsonl')), min_interval=36 * HOUR)
+    evaluator.watermark = DAYS[0]
+
+    # Hari pertama: kedua indikator terkirim bersamaan
+    sent = evaluator.evaluate(cube, DAYS[1] + HOUR)
+    assert len(sent) == 2 * len(areas)
+
+    # Tingkat yang sama dalam min_interval tidak dikirim ulang
+    assert len(evaluator.evaluate(cube, DAYS[2] + HOUR)) == 0
+    # Sesudah min_interval: pengingat untuk semua indikator yang bertahan
+    reminder = evaluator.evaluate(cube, DAYS[3] + HOUR)
+    assert len(reminder) == 2 * len(areas)
+    assert set(reminder['tanggal']) == {DAYS[3].date().isoformat()}
+
+
+def test_rising_level_is_sent_inside_min_interval(tmp_path):
+    # Area 0 naik Tinggi -> Sangat Tinggi, turun, lalu naik lagi; area 1 tetap Tinggi
+    risk = np.array([[60, 60, 80, 20, 60, 60], [60] * len(DAYS)])
+    cube, areas = cube_with(skor_risiko=risk)
+    evaluator = AlertEvaluator(SqliteOutbox(str(tmp_path / 'alerts.db')), backfill_days=len(DAYS))
+    alerts = evaluator.evaluate(cube, END + HOUR)
+
+    got = list(zip(alerts['area'], alerts['tanggal'], alerts['tingkat']))
+    day = [d.date().isoformat() for d in DAYS]
+    assert got == [
+        (areas[0], day[0], 'Tinggi'), (areas[1], day[0], 'Tinggi'),
+        (areas[0], day[2], 'Sangat Tinggi'),
+        # Sesudah turun di bawah ambang, kenaikan berikutnya dikirim lagi
+        (areas[0], day[4], 'Tinggi'),
+    ]
+    np.testing.assert_array_equal(evaluator.last_level[:, 0], [1, 1])
+
+
+def test_missing_values_never_alert(tmp_path):
+    cube, _ = cube_with(ispu=[np.nan] * len(DAYS), ffmc=[90] * len(DAYS))
+    evaluator = AlertEvaluator(FileOutbox(str(tmp_path / 'alerts.jsonl')), backfill_days=len(DAYS))
+    alerts = evaluator.evaluate(cube, END + HOUR)
+    assert set(alerts['indikator']) == {'ffmc'}
+
+
+def test_future_days_wait_until_they_arrive(tmp_path):
+    cube, areas = cube_with(skor_risiko=[10, 10, 10, 10, 10, 90])
+    evaluator = AlertEvaluator(FileOutbox(str(tmp_path / 'alerts.jsonl')), backfill_days=2)
+
+    # Hari terakhir cube masih di masa depan: belum dievaluasi
+    assert len(evaluator.evaluate(cube, DAYS[-2] + HOUR)) == 0
+    assert evaluator.watermark == DAYS[-2]
+    alerts = evaluator.evaluate(cube, END + HOUR)
+    assert sorted(alerts['area']) == areas and set(alerts['tingkat']) == {'Sangat Tinggi'}
@@ -0,0 +1,126 @@
+import http.client
+import io
+import json
+import threading
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from titik_panas.api import ExportApi, make_server
+from titik_panas.ingest import IncrementalDataset
+from titik_panas.sources import MockSource
+
+
+@pytest.fixture(scope='module')
+def server():
+    source = MockSource(days=60, seed=0, end=pd.Timestamp('2025-03-01'))
+    api = ExportApi(IncrementalDataset(source), refresh_interval=3600)
+    server = make_server(api, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def connect(server):
+    return http.client.HTTPConnection(*server.server_address, timeout=10)
+
+
+def get(conn, path, headers=None):
+    conn.request('GET', path, headers=headers or {})
+    response = conn.getresponse()
+    return response, response.read()
+
+
+def test_ok_then_not_modified(server):
+    conn = connect(server)
+    response, body = get(conn, '/api/harian?mulai=2025-02-01')
+    assert response.status == 200
+    rows = json.loads(body)
+    assert rows and {'tanggal', 'wilayah', 'titik_panas', 'status_ispu'} <= rows[0].keys()
+    etag = response.getheader('ETag')
+
+    response, body = get(conn, '/api/harian?mulai=2025-02-01', {'If-None-Match': etag})
+    assert response.status == 304 and body == b''
+    # Query lain, ETag lain
+    response, _ = get(conn, '/api/harian?mulai=2025-02-02', {'If-None-Match': etag})
+    assert response.status == 200 and response.getheader('ETag') != etag
+
+
+@pytest.mark.parametrize('path', [
+    '/api/harian?tingkat=benua',
+    '/api/harian?wilayah=Atlantis',
+    '/api/harian?mulai=bukan-tanggal',
+    '/api/harian?format=xml',
+    '/api/prakiraan?horizon=99',
+    '/api/versi?format=csv',
+    '/api/ekspor?kolom=tidak_ada',
+])
+def test_bad_request(server, path):
+    response, body = get(connect(server), path)
+    assert response.status == 400
+    assert response.getheader('Content-Type') == 'application/json'
+    assert json.loads(body)['error']
+
+
+def test_unknown_endpoint(server):
+    response, body = get(connect(server), '/api/tidak-ada')
+    assert response.status == 404 and 'error' in json.loads(body)
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'json', 'parquet'])
+def test_chunked_export_matches_rows(server, fmt):
+    snap = server.api.snapshot()
+    expected = snap.index.select(None, pd.Timestamp('2025-01-01'), pd.Timestamp('2025-01-31'), None)
+    response, body = get(connect(server), f'/api/ekspor?mulai=2025-01-01&akhir=2025-01-31&kolom=tanggal,area,titik_panas&format={fmt}')
+    assert response.status == 200
+    assert response.getheader('Transfer-Encoding') == 'chunked'
+    if fmt == 'csv':
+        rows = pd.read_csv(io.BytesIO(body))
+    elif fmt == 'json':
+        rows = pd.DataFrame(json.loads(body))
+    else:
+        rows = pq.read_table(io.BytesIO(body)).to_pandas()
+    assert len(rows) == len(expected)
+    assert rows['titik_panas'].sum() == expected['titik_panas'].sum()
+
+
+def test_unexpected_error_returns_500_and_keeps_connection(server, monkeypatch):
+    def broken(snap, params):
+        raise RuntimeError("pandas meledak")
+
+    monkeypatch.setitem(server.api.endpoints, '/api/ringkasan', broken)
+    conn = connect(server)
+    response, body = get(conn, '/api/ringkasan')
+    assert response.status == 500
+    assert json.loads(body) == {'error': 'Galat internal server'}
+    # Koneksi keep-alive yang sama tetap dapat dipakai
+    response, _ = get(conn, '/api/versi')
+    assert response.status == 200
+
+
+def test_error_before_first_chunk_returns_500(server, monkeypatch):
+    def broken(snap, params):
+        raise OSError("partisi Parquet rusak")
+        yield
+
+    monkeypatch.setitem(server.api.endpoints, '/api/ekspor', broken)
+    response, body = get(connect(server), '/api/ekspor?format=csv')
+    assert response.status == 500 and 'error' in json.loads(body)
+
+
+def test_error_mid_stream_aborts_connection(server, monkeypatch):
+    def broken(snap, params):
+        yield pd.DataFrame({'titik_panas': [1, 2]})
+        raise OSError("partisi Parquet rusak")
+
+    monkeypatch.setitem(server.api.endpoints, '/api/ekspor', broken)
+    conn = connect(server)
+    conn.request('GET', '/api/ekspor?format=csv')
+    response = conn.getresponse()
+    assert response.status == 200
+    # Tanpa chunk penutup: klien melihat body terpotong, bukan ekspor lengkap
+    with pytest.raises(http.client.IncompleteRead):
+        response.read()
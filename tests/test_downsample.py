@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from titik_panas.downsample import _as_float, column_width, downsample_frame, lttb, max_points_for_width, minmax
+
+
+def sequential_lttb(x, y, n_out):
+    """LTTB berurutan per bucket (rujukan untuk versi vektor)"""
+    n = len(y)
+    x, y = _as_float(x), np.asarray(y, dtype=float)
+    every = (n - 2) / (n_out - 2)
+    idx = [0]
+    for i in range(n_out - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        a = idx[-1]
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        idx.append(start + int(area.argmax()))
+    return np.array(idx + [n - 1])
+
+
+def series(seed, n):
+    rng = np.random.default_rng(seed)
+    x = pd.date_range('2015-01-01', periods=n, freq='D').to_numpy()
+    return x, rng.normal(size=n).cumsum() + 5 * np.sin(np.arange(n) / 30)
+
+
+@pytest.mark.parametrize('n, n_out', [(3650, 1200), (20_000, 2400), (1001, 1000), (50, 3)])
+def test_lttb_matches_sequential_and_keeps_endpoints(n, n_out):
+    x, y = series(n, n)
+    idx = lttb(x, y, n_out)
+    assert len(idx) == n_out
+    assert idx[0] == 0 and idx[-1] == n - 1
+    assert (np.diff(idx) > 0).all()
+    np.testing.assert_array_equal(idx, sequential_lttb(x, y, n_out))
+
+
+@pytest.mark.parametrize('n, n_out', [(3650, 1200), (20_000, 2401), (7, 4)])
+def test_minmax_keeps_endpoints_and_extremes(n, n_out):
+    x, y = series(n, n)
+    idx = minmax(x, y, n_out)
+    assert len(idx) <= n_out
+    assert idx[0] == 0 and idx[-1] == n - 1
+    assert (np.diff(idx) > 0).all()
+    assert y.argmax() in idx and y.argmin() in idx
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_downsample_frame_respects_column_width(method):
+    x, y = series(0, 10_000)
+    df = pd.DataFrame({'tanggal': x, 'nilai': y})
+    max_points = max_points_for_width(column_width(2))
+    out = downsample_frame(df, 'tanggal', 'nilai', max_points, method)
+    assert len(out) <= max_points < max_points_for_width()
+    assert out['tanggal'].iloc[0] == df['tanggal'].iloc[0]
+    assert out['tanggal'].iloc[-1] == df['tanggal'].iloc[-1]
+    # Seri pendek tidak disentuh
+    assert len(downsample_frame(df.head(100), 'tanggal', 'nilai', max_points, method)) == 100
@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from titik_panas.filtering import FilterIndex, FilterSegment
+from titik_panas.generator import generate_pontianak_data, synthetic_areas
+from titik_panas.schema import apply_schema
+
+from .test_rollup import random_selection, select_rows
+
+SEEDS = [0, 1, 2]
+
+
+def daily_batches(seed, days=200, n_areas=5):
+    """Data mock per hari, seperti ingest harian"""
+    areas, coords = synthetic_areas(n_areas, rng=seed)
+    df = generate_pontianak_data(days, rng=seed, areas=areas, area_coords=coords, end=pd.Timestamp('2025-03-01'))
+    df = apply_schema(df.sample(frac=1, random_state=seed).reset_index(drop=True))
+    days = df['tanggal'].dt.normalize()
+    return df, [batch for _, batch in df.groupby(days, sort=True)]
+
+
+def expected_rows(df, index, areas, start, end, season):
+    rows = select_rows(df, areas, start, end, season)
+    order = np.lexsort((rows['tanggal'].to_numpy(), rows['area'].map(index.areas.index).to_numpy()))
+    return rows.iloc[order]
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_appended_segments_stay_logarithmic(seed, monkeypatch):
+    df, batches = daily_batches(seed)
+    sorted_rows = []
+    init = FilterSegment.__init__
+
+    def counting(self, frame, areas):
+        sorted_rows.append(len(frame))
+        init(self, frame, areas)
+
+    monkeypatch.setattr(FilterSegment, '__init__', counting)
+    index = FilterIndex(batches[0])
+    for batch in batches[1:]:
+        previous, previous_len = index, len(index)
+        index = index.append(batch)
+        # Indeks lama tidak berubah (snapshot sesi lain tetap konsisten)
+        assert len(previous) == previous_len
+        sizes = [len(segment) for segment in index.segments]
+        assert all(a > 2 * b for a, b in zip(sizes, sizes[1:]))
+        assert len(sizes) <= math.log2(len(batches)) + 1
+
+    assert len(index) == len(df)
+    # Setiap baris diurutkan ulang O(log n) kali, bukan pada setiap append
+    assert sum(sorted_rows) <= len(df) * (math.log2(len(batches)) + 2)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_select_over_segments_matches_pandas(seed):
+    df, batches = daily_batches(seed)
+    index = FilterIndex(batches[0])
+    for batch in batches[1:]:
+        index = index.append(batch)
+    assert len(index.segments) > 1
+
+    rng = np.random.default_rng(seed)
+    for _ in range(20):
+        areas, start, end, season = random_selection(df, rng)
+        got = index.select(areas, start, end, season)
+        expected = expected_rows(df, index, areas, start, end, season)
+        assert list(got['area'].astype(str)) == list(expected['area'])
+        np.testing.assert_array_equal(got['tanggal'].to_numpy(), expected['tanggal'].to_numpy())
+        np.testing.assert_array_equal(got['titik_panas'].to_numpy(), expected['titik_panas'].to_numpy())
+
+
+def test_append_with_new_area_rebuilds_codes():
+    df, batches = daily_batches(0)
+    index = FilterIndex(batches[0])
+    for batch in batches[1:50]:
+        index = index.append(batch)
+    extra = batches[50].assign(area='Area Baru')
+    index = index.append(extra)
+
+    assert index.areas[-1] == 'Area Baru' and len(index.segments) == 1
+    got = index.select(['Area Baru'])
+    assert len(got) == len(extra) and set(got['area'].astype(str)) == {'Area Baru'}
+    assert len(index.select()) == sum(len(b) for b in batches[:50]) + len(extra)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from titik_panas.forecast import BAND_Z, WARMUP_DAYS, ForecastEngine
+
+
+def test_forecast_before_any_update_is_empty():
+    engine = ForecastEngine()
+    prediction = engine.forecast(7)
+    assert prediction.empty
+    assert list(prediction.columns) == ['tanggal'] + [
+        f'{t}{suffix}' for t in engine.targets for suffix in ('', '_bawah', '_atas')
+    ]
+
+
+def test_single_area_matches_damped_holt_recurrence():
+    alpha, beta, phi, horizon = 0.4, 0.2, 0.9, 5
+    rng = np.random.default_rng(0)
+    # Seluruhnya bulan hujan: selisih musim nol, tersisa Holt teredam murni
+    dates = pd.date_range('2025-01-01', periods=40, freq='D')
+    y = 50 + 0.8 * np.arange(len(dates)) + rng.normal(0, 3, len(dates))
+
+    engine = ForecastEngine(targets=['titik_panas'], alphas=[alpha], betas=[beta], phi=phi)
+    engine.update(dates, ['A'], {'titik_panas': y[:, None]})
+    prediction = engine.forecast(horizon, aggs={'titik_panas': 'sum'})
+
+    level, trend, sse, n_err = y[0], 0.0, 0.0, 0
+    for t in range(1, len(y)):
+        pred = level + phi * trend
+        error = y[t] - pred
+        if t >= WARMUP_DAYS:
+            sse += error ** 2
+            n_err += 1
+        level = pred + alpha * error
+        trend = phi * trend + alpha * beta * error
+
+    h = np.arange(1, horizon + 1)
+    mean = level + np.array([sum(phi ** i for i in range(1, k + 1)) for k in h]) * trend
+    spread = BAND_Z * np.sqrt(sse / n_err * (1 + (h - 1) * alpha ** 2))
+    assert (prediction['tanggal'] == pd.date_range('2025-02-10', periods=horizon)).all()
+    np.testing.assert_allclose(prediction['titik_panas'], mean, rtol=1e-12)
+    np.testing.assert_allclose(prediction['titik_panas_bawah'], mean - spread, rtol=1e-12)
+    np.testing.assert_allclose(prediction['titik_panas_atas'], mean + spread, rtol=1e-12)
+    np.testing.assert_allclose(engine.params()['rmse'], np.sqrt(sse / n_err), rtol=1e-12)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from titik_panas.fwi import (
+    FWI_COLUMNS,
+    FireWeatherEngine,
+    buildup_index,
+    fire_weather_index,
+    initial_spread_index,
+    next_dc,
+    next_dmc,
+    next_ffmc,
+)
+
+# Dua hari pertama data uji standar Van Wagner & Pickett (1985), bulan April
+# (faktor panjang hari DMC 12.8 dan DC 0.9): (suhu, RH, angin km/jam, hujan)
+# lalu FFMC, DMC, DC, ISI, BUI, FWI yang dibulatkan satu desimal
+REFERENCE_DAYS = [
+    ((17.0, 42.0, 25.0, 0.0), (87.7, 8.5, 19.0, 10.9, 8.5, 10.1)),
+    ((20.0, 21.0, 25.0, 2.4), (86.2, 10.4, 23.6, 8.8, 10.4, 9.3)),
+]
+APRIL_DMC_DAY_LENGTH = 12.8
+APRIL_DC_DAY_LENGTH = 0.9
+
+
+def test_recurrence_matches_reference_days():
+    ffmc, dmc, dc = 85.0, 6.0, 15.0
+    for (temp, rh, wind, rain), expected in REFERENCE_DAYS:
+        ffmc = next_ffmc(ffmc, temp, rh, wind, rain)
+        dmc = next_dmc(dmc, temp, rh, rain, APRIL_DMC_DAY_LENGTH)
+        dc = next_dc(dc, temp, rain, APRIL_DC_DAY_LENGTH)
+        isi = initial_spread_index(ffmc, wind)
+        bui = buildup_index(dmc, dc)
+        fwi = fire_weather_index(isi, bui)
+        np.testing.assert_allclose([ffmc, dmc, dc, isi, bui, fwi], expected, atol=0.051)
+
+
+def weather_frame(seed, days=40, areas=('A', 'B', 'C')):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-06-01', periods=days, freq='D')
+    n = days * len(areas)
+    return pd.DataFrame({
+        'tanggal': np.repeat(dates, len(areas)),
+        'area': np.tile(areas, days),
+        'suhu': rng.uniform(24, 35, n),
+        'kelembaban': rng.uniform(40, 100, n),
+        'kecepatan_angin': rng.uniform(0, 8, n),
+        'curah_hujan': rng.exponential(4, n) * (rng.random(n) < 0.4)
+    })
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_engine_matches_scalar_recurrence(seed):
+    df = weather_frame(seed)
+    codes = FireWeatherEngine().run_frame(df)
+    for area, rows in df.groupby('area'):
+        ffmc, dmc, dc = 85.0, 6.0, 15.0
+        expected = []
+        for row in rows.itertuples():
+            wind = row.kecepatan_angin * 3.6
+            ffmc = next_ffmc(ffmc, row.suhu, row.kelembaban, wind, row.curah_hujan)
+            dmc = next_dmc(dmc, row.suhu, row.kelembaban, row.curah_hujan)
+            dc = next_dc(dc, row.suhu, row.curah_hujan)
+            isi = initial_spread_index(ffmc, wind)
+            bui = buildup_index(dmc, dc)
+            expected.append([ffmc, dmc, dc, isi, bui, fire_weather_index(isi, bui)])
+        np.testing.assert_allclose(codes.loc[rows.index, FWI_COLUMNS].to_numpy(), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_incremental_run_matches_single_run(seed):
+    df = weather_frame(seed)
+    full = FireWeatherEngine().run_frame(df)
+
+    engine = FireWeatherEngine()
+    cut = df['tanggal'].min() + pd.Timedelta(days=17)
+    first = engine.run_frame(df[df['tanggal'] < cut])
+    # Lanjut dari state tersimpan, seperti ingest setelah restart
+    engine = FireWeatherEngine.from_state_dict(engine.state_dict())
+    second = engine.run_frame(df)
+    pd.testing.assert_frame_equal(pd.concat([first, second]).sort_index(), full)
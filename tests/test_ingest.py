@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from titik_panas.generator import generate_pontianak_data
+from titik_panas.ingest import IncrementalDataset
+from titik_panas.rollup import RollupCube
+from titik_panas.schema import apply_schema
+from titik_panas.sources import DataSource
+from titik_panas.store import ParquetStore
+
+END = pd.Timestamp('2025-03-01')
+
+
+class FrameSource(DataSource):
+    """Sumber uji: DataFrame yang bisa ditambah, dengan pencatat pemanggilan"""
+
+    name = 'frame'
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = []
+
+    def load(self):
+        return self.frame
+
+    def load_since(self, watermark=None, fwi_engine=None):
+        self.calls.append(watermark)
+        new = super().load_since(watermark, fwi_engine)
+        if fwi_engine is not None:
+            # Seperti sumber nyata: state FWI dilanjutkan oleh baris baru
+            fwi_engine.run_frame(new)
+        return new
+
+    def cache_key(self):
+        return (self.name,)
+
+    def snapshot_key(self):
+        return len(self.frame)
+
+
+@pytest.fixture
+def history():
+    df = generate_pontianak_data(60, rng=0, end=END)
+    return apply_schema(df[df['tanggal'] <= END].reset_index(drop=True))
+
+
+def days_until(df, last):
+    return df[df['tanggal'] <= pd.Timestamp(last)]
+
+
+def test_refresh_reads_only_after_watermark(history):
+    source = FrameSource(days_until(history, '2025-02-10'))
+    dataset = IncrementalDataset(source)
+    assert dataset.refresh() == len(source.frame)
+    assert dataset.watermark == pd.Timestamp('2025-02-10') and dataset.version == 1
+
+    # Sumber tidak berubah: tidak dibaca sama sekali
+    assert dataset.refresh() == 0 and len(source.calls) == 1
+
+    # Baris terlambat untuk hari yang sudah di-ingest tidak ikut dua kali
+    late = days_until(history, '2025-02-10').tail(3)
+    source.frame = pd.concat([history, late], ignore_index=True)
+    added = dataset.refresh()
+    assert source.calls[-1] == pd.Timestamp('2025-02-10')
+    assert added == (history['tanggal'] > pd.Timestamp('2025-02-10')).sum()
+    assert dataset.watermark == END and dataset.version == 2
+
+    version, index, cube, _ = dataset.snapshot()
+    expected = RollupCube.from_frame(history)
+    assert len(index) == len(history)
+    np.testing.assert_allclose(cube.select().total('titik_panas'), expected.select().total('titik_panas'))
+    assert cube.select().row_count == len(history)
+
+
+def test_failed_ingest_leaves_snapshot_and_retries(history, monkeypatch):
+    source = FrameSource(days_until(history, '2025-02-10'))
+    dataset = IncrementalDataset(source)
+    dataset.refresh()
+    before = dataset.snapshot()
+    fwi_state = dataset.fwi_engine.state_dict()
+
+    def broken(self, new):
+        raise MemoryError("cube penuh")
+
+    source.frame = history
+    monkeypatch.setattr(RollupCube, 'appended', broken)
+    with pytest.raises(MemoryError):
+        dataset.refresh()
+
+    # Tidak ada komponen yang tertukar sebagian
+    assert all(a is b for a, b in zip(dataset.snapshot(), before))
+    assert dataset.watermark == pd.Timestamp('2025-02-10')
+    assert dataset.fwi_engine.state_dict() == fwi_state and fwi_state['areas']
+
+    # snapshot_key tidak dicatat: refresh berikutnya mencoba lagi dari watermark yang sama
+    monkeypatch.undo()
+    assert dataset.refresh() == (history['tanggal'] > pd.Timestamp('2025-02-10')).sum()
+    assert source.calls == [None, pd.Timestamp('2025-02-10'), pd.Timestamp('2025-02-10')]
+    assert before[2].select().row_count == len(days_until(history, '2025-02-10'))
+    assert dataset.snapshot()[2].select().row_count == len(history)
+
+
+def test_store_commit_is_last_and_state_survives_restart(history, tmp_path, monkeypatch):
+    root = tmp_path / 'store'
+    source = FrameSource(days_until(history, '2025-02-10'))
+    dataset = IncrementalDataset(source, ParquetStore(root))
+    dataset.refresh()
+
+    def full_disk(self, df, state=None):
+        raise OSError("disk penuh")
+
+    source.frame = history
+    monkeypatch.setattr(ParquetStore, 'append', full_disk)
+    with pytest.raises(OSError):
+        dataset.refresh()
+    assert dataset.version == 1 and dataset.watermark == pd.Timestamp('2025-02-10')
+    monkeypatch.undo()
+    dataset.refresh()
+
+    # Proses baru melanjutkan watermark dan state FWI dari manifest
+    restarted = IncrementalDataset(FrameSource(history), ParquetStore(root))
+    assert restarted.watermark == END and restarted.version == dataset.version
+    assert restarted.fwi_engine.state_dict() == dataset.fwi_engine.state_dict()
+    assert restarted.cube.select().row_count == len(history)
+    assert restarted.refresh() == 0
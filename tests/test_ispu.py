@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from titik_panas.ispu import (
+    AVERAGING_HOURS,
+    CONCENTRATION_BREAKPOINTS,
+    ISPU_BREAKPOINTS,
+    MIN_COVERAGE,
+    POLLUTANTS,
+    IspuEngine,
+    sub_index,
+)
+
+
+@pytest.mark.parametrize('pollutant', POLLUTANTS)
+def test_sub_index_at_breakpoints(pollutant):
+    bp = np.asarray(CONCENTRATION_BREAKPOINTS[pollutant], dtype=float)
+    np.testing.assert_allclose(sub_index(pollutant, bp), ISPU_BREAKPOINTS)
+    # Tepat di atas batas: masih di segmen berikutnya, naik linear dari batas itu
+    above = sub_index(pollutant, bp[:-1] + 1e-6)
+    assert (above >= ISPU_BREAKPOINTS[:-1]).all()
+    np.testing.assert_allclose(above, ISPU_BREAKPOINTS[:-1], atol=1e-3)
+    mid = sub_index(pollutant, (bp[:-1] + bp[1:]) / 2)
+    np.testing.assert_allclose(mid, (np.array(ISPU_BREAKPOINTS[:-1]) + ISPU_BREAKPOINTS[1:]) / 2)
+
+
+@pytest.mark.parametrize('pollutant', POLLUTANTS)
+def test_sub_index_outside_table(pollutant):
+    top = CONCENTRATION_BREAKPOINTS[pollutant][-1]
+    np.testing.assert_array_equal(sub_index(pollutant, [top * 1.01, top * 10, np.inf]), ISPU_BREAKPOINTS[-1])
+    assert sub_index(pollutant, -5.0) == 0
+    assert np.isnan(sub_index(pollutant, np.nan))
+
+
+def gappy_readings(seed, hours=110, areas=('A', 'B', 'C')):
+    """Bacaan per menit dua sensor per area dengan jam kosong dan nilai hilang"""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2025-08-01', periods=hours * 60, freq='min')
+    n = len(times) * len(areas)
+    df = pd.DataFrame({
+        'waktu': np.repeat(times.to_numpy(), len(areas)),
+        'area': np.tile(np.asarray(areas, dtype=object), len(times))
+    })
+    for pollutant in POLLUTANTS:
+        top = CONCENTRATION_BREAKPOINTS[pollutant][-2]
+        df[pollutant] = rng.uniform(0, top, n)
+    df = pd.concat([df, df.assign(**{p: df[p] * rng.uniform(0.5, 1.5, n) for p in POLLUTANTS})], ignore_index=True)
+    # Jam kosong per (area, polutan) agar aturan cakupan 75% ikut teruji
+    hour = df['waktu'].dt.floor('h')
+    for pollutant in POLLUTANTS:
+        for area in areas:
+            empty = rng.choice(hours, size=hours // 4, replace=False)
+            missing = (df['area'] == area) & hour.isin(times[::60][empty])
+            df.loc[missing, pollutant] = np.nan
+        df.loc[rng.random(len(df)) < 0.05, pollutant] = np.nan
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def reference_hourly(readings):
+    """Rolling mean rata-rata jam per jendela regulasi lalu sub-indeks, dengan pandas"""
+    hour = readings['waktu'].dt.floor('h').rename('jam')
+    means = readings.groupby([hour, 'area'])[POLLUTANTS].mean()
+    full = pd.date_range(hour.min(), hour.max(), freq='h', name='jam')
+    out = {}
+    for area, frame in means.groupby(level='area'):
+        frame = frame.droplevel('area').reindex(full)
+        sub = pd.DataFrame(index=full)
+        for pollutant in POLLUTANTS:
+            window = AVERAGING_HOURS[pollutant]
+            conc = frame[pollutant].rolling(window, min_periods=int(np.ceil(MIN_COVERAGE * window))).mean()
+            sub[f'ispu_{pollutant}'] = sub_index(pollutant, conc.to_numpy())
+        out[area] = sub
+    return pd.concat(out, names=['area', 'jam']).swaplevel().sort_index()
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_update_over_retention_matches_rolling_mean(seed):
+    readings = gappy_readings(seed)
+    engine = IspuEngine(retention_hours=48)
+    hourly = engine.update(readings)
+    hourly = hourly.set_index(['jam', 'area']).sort_index()
+    expected = reference_hourly(readings)
+    columns = [f'ispu_{p}' for p in POLLUTANTS]
+    expected = expected[expected[columns].notna().any(axis=1)]
+
+    # Setiap jam sepanjang 110 jam muncul tepat sekali, walau retensi hanya 48 jam
+    assert not hourly.index.duplicated().any()
+    assert hourly.index.equals(expected.index)
+    np.testing.assert_allclose(hourly[columns].to_numpy(), expected[columns].to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(hourly['ispu'], expected[columns].max(axis=1), rtol=1e-9)
+    # Aturan cakupan benar-benar membuang sebagian jendela
+    assert expected[columns].isna().any().any()
+
+
+def test_incremental_batches_match_single_update():
+    readings = gappy_readings(2, hours=60).sort_values('waktu', kind='stable')
+    single = IspuEngine().update(readings).set_index(['jam', 'area']).sort_index()
+
+    engine = IspuEngine()
+    latest = {}
+    for _, batch in readings.groupby(readings['waktu'].dt.floor('5min')):
+        for row in engine.update(batch).itertuples(index=False):
+            latest[(row.jam, row.area)] = row.ispu
+    batched = pd.Series(latest).sort_index()
+    np.testing.assert_allclose(batched.to_numpy(), single['ispu'].to_numpy(), rtol=1e-9)
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from titik_panas.generator import generate_pontianak_data, synthetic_areas
+from titik_panas.rollup import COMPARISONS, MOMENT_COLUMNS, STAT_COLUMNS, RollupCube, comparison_windows
+from titik_panas.schema import apply_schema
+
+SEEDS = [0, 1, 2]
+
+
+def make_frame(seed, days=120, n_areas=7, missing=0.05):
+    """Data mock kecil dengan sebagian nilai hilang dan sebagian baris dibuang"""
+    rng = np.random.default_rng(seed)
+    areas, coords = synthetic_areas(n_areas, rng=seed)
+    df = generate_pontianak_data(days, rng=rng, areas=areas, area_coords=coords, end=pd.Timestamp('2025-03-01'))
+    df = df[rng.random(len(df)) > 0.1].reset_index(drop=True)
+    for col in ['curah_hujan', 'suhu', 'kelembaban', 'skor_risiko']:
+        df[col] = df[col].astype(float).where(rng.random(len(df)) > missing)
+    return apply_schema(df)
+
+
+def select_rows(df, areas=None, start=None, end=None, season=None):
+    days = df['tanggal'].dt.normalize()
+    mask = np.ones(len(df), dtype=bool)
+    if areas is not None:
+        mask &= df['area'].isin(areas).to_numpy()
+    if start is not None:
+        mask &= (days >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (days <= pd.Timestamp(end)).to_numpy()
+    if season is not None:
+        mask &= (df['musim'] == season).to_numpy()
+    return df[mask]
+
+
+def random_selection(df, rng):
+    areas = sorted(df['area'].unique())
+    chosen = list(rng.choice(areas, size=rng.integers(1, len(areas) + 1), replace=False))
+    dates = pd.date_range(df['tanggal'].min(), df['tanggal'].max(), freq='D')
+    lo, hi = np.sort(rng.integers(0, len(dates), size=2))
+    season = rng.choice([None, 'Hujan', 'Kemarau'])
+    return chosen, dates[lo], dates[hi], season
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_selection_matches_groupby(seed):
+    df = make_frame(seed)
+    cube = RollupCube.from_frame(df)
+    rng = np.random.default_rng(seed)
+    for _ in range(10):
+        areas, start, end, season = random_selection(df, rng)
+        rows = select_rows(df, areas, start, end, season)
+        selection = cube.select(areas, start, end, season)
+
+        assert selection.row_count == len(rows)
+        for col in STAT_COLUMNS:
+            np.testing.assert_allclose(selection.total(col), rows[col].astype(float).sum(), rtol=1e-9, atol=1e-6)
+            expected = rows[col].astype(float).mean()
+            if np.isnan(expected):
+                assert np.isnan(selection.mean(col))
+            else:
+                np.testing.assert_allclose(selection.mean(col), expected, rtol=1e-9)
+        expected_risk = rows['tingkat_risiko'].astype(str).value_counts()
+        assert selection.risk_counts().to_dict() == expected_risk.to_dict()
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_daily_matches_groupby(seed):
+    df = make_frame(seed)
+    cube = RollupCube.from_frame(df)
+    areas, start, end, season = random_selection(df, np.random.default_rng(seed))
+    rows = select_rows(df, areas, start, end, season)
+    aggs = {'titik_panas': 'sum', 'curah_hujan': 'mean', 'suhu': 'mean'}
+
+    daily = cube.select(areas, start, end, season).daily(aggs)
+    expected = rows.groupby('tanggal').agg(aggs).reset_index()
+    pd.testing.assert_frame_equal(daily, expected, check_dtype=False, check_index_type=False)
+
+    area_daily = cube.select(areas, start, end, season).area_daily(aggs)
+    expected = rows.assign(area=rows['area'].astype(str)).groupby(['tanggal', 'area']).agg(aggs).reset_index()
+    pd.testing.assert_frame_equal(area_daily, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_moments_match_pandas(seed):
+    df = make_frame(seed)
+    cube = RollupCube.from_frame(df)
+    rng = np.random.default_rng(seed)
+    columns = ['titik_panas', 'curah_hujan', 'suhu', 'kelembaban']
+    checked = 0
+    for _ in range(10):
+        areas, start, end, season = random_selection(df, rng)
+        # Momen memakai baris lengkap di semua MOMENT_COLUMNS (complete-case)
+        rows = select_rows(df, areas, start, end, season)[MOMENT_COLUMNS].astype(float).dropna()
+        if len(rows) < 3:
+            continue
+        corr = cube.select(areas, start, end, season).corr(columns)
+        np.testing.assert_allclose(corr.to_numpy(), rows[columns].corr().to_numpy(), atol=1e-9)
+        checked += 1
+    assert checked
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_grouped_areas_match_groupby(seed):
+    df = make_frame(seed)
+    cube = RollupCube.from_frame(df)
+    labels = ['Utara', 'Selatan', 'Barat']
+    groups = np.arange(len(cube.areas)) % len(labels)
+    grouped = cube.group_areas(groups, labels)
+    mapping = dict(zip(cube.areas, np.asarray(labels)[groups]))
+
+    rain = df['curah_hujan'].astype(float)
+    expected = rain.groupby(df['area'].astype(str).map(mapping)).mean()
+    for label in labels:
+        np.testing.assert_allclose(grouped.select([label]).mean('curah_hujan'), expected[label], rtol=1e-9)
+
+
+def test_merge_matches_single_cube():
+    df = make_frame(3)
+    cut = df['tanggal'].min() + pd.Timedelta(days=50)
+    merged = RollupCube.from_frame(df[df['tanggal'] < cut]).merge(RollupCube.from_frame(df[df['tanggal'] >= cut]))
+    full = RollupCube.from_frame(df)
+    assert list(merged.dates) == list(full.dates) and merged.areas == full.areas
+    np.testing.assert_allclose(merged.cum_sums, full.cum_sums)
+    np.testing.assert_array_equal(merged.cum_counts, full.cum_counts)
+    np.testing.assert_array_equal(merged.cum_risk, full.cum_risk)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_prefix_windows_match_direct_sums(seed):
+    df = make_frame(seed, days=500)
+    cube = RollupCube.from_frame(df)
+    rng = np.random.default_rng(seed)
+    first, last = cube.dates[0], cube.dates[-1]
+    for _ in range(20):
+        areas, _, _, season = random_selection(df, rng)
+        # Jendela boleh menjorok keluar sumbu cube di kedua sisi
+        start, end = np.sort(rng.integers(-30, len(cube.dates) + 30, size=2))
+        start, end = first + pd.Timedelta(days=int(start)), first + pd.Timedelta(days=int(end))
+        rows = select_rows(df, areas, start, end, season)
+        window = cube.window(start, end, areas, season)
+
+        assert window.row_count == len(rows)
+        assert window.days == (min(end, last) - max(start, first)).days + 1
+        for col in STAT_COLUMNS:
+            values = rows[col].astype(float)
+            np.testing.assert_allclose(window.total(col), values.sum(), rtol=1e-9, atol=1e-6)
+            assert window.counts[STAT_COLUMNS.index(col)] == values.notna().sum()
+        high = rows['tingkat_risiko'].isin(['Tinggi', 'Sangat Tinggi']).sum()
+        assert window.risk_count(['Tinggi', 'Sangat Tinggi']) == high
+
+
+@pytest.mark.parametrize('mode', COMPARISONS)
+def test_comparison_windows_match_direct_sums(mode):
+    df = make_frame(4, days=500)
+    cube = RollupCube.from_frame(df)
+    start, end = cube.dates[-120], cube.dates[-1]
+    current, previous = comparison_windows(mode, start, end)
+    assert current[1] == end and previous[1] < current[0]
+    for lo, hi in (current, previous):
+        rows = select_rows(df, None, lo, hi)
+        np.testing.assert_allclose(cube.window(lo, hi).total('titik_panas'), rows['titik_panas'].sum())
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_appended_prefix_matches_rebuild(seed):
+    df = make_frame(seed)
+    days = df['tanggal'].dt.normalize()
+    cuts = pd.date_range(days.min() + pd.Timedelta(days=30), days.max(), freq='11D')
+    cube = RollupCube.from_frame(df[days < cuts[0]])
+    snapshots = [(cube, cube.cum_sums.copy())]
+    for lo, hi in zip(cuts, list(cuts[1:]) + [days.max() + pd.Timedelta(days=1)]):
+        cube = cube.appended(df[(days >= lo) & (days < hi)])
+        snapshots.append((cube, cube.cum_sums.copy()))
+
+    full = RollupCube.from_frame(df)
+    np.testing.assert_allclose(cube.cum_sums, full.cum_sums)
+    np.testing.assert_array_equal(cube.cum_risk, full.cum_risk)
+    np.testing.assert_allclose(cube.day_moments, full.day_moments)
+    np.testing.assert_allclose(cube.block_moments, full.block_moments)
+    # Versi lama tetap membaca baris prefixnya sendiri setelah buffer diperpanjang
+    for old, expected in snapshots:
+        np.testing.assert_array_equal(old.cum_sums, expected)
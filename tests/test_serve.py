@@ -0,0 +1,84 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from titik_panas.profiling import CacheLoads
+from titik_panas.serve import backend_healthy
+
+websockets = pytest.importorskip('websockets')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cache_loads_reports_first_session_after_seal():
+    loads, reports = CacheLoads(), []
+    loads.run_started('pra-panas')
+    loads.loaded('dataset')
+    loads.run_finished('pra-panas')
+    loads.seal(reports.append)
+
+    loads.run_started('a')
+    loads.run_started('b')
+    loads.loaded('wilayah')
+    loads.run_finished('b')
+    assert reports == []
+    loads.run_finished('a')
+    loads.run_finished('a')
+    assert reports == [{'session': 'a', 'reused': False, 'reloaded': ['wilayah']}]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def run_session(port):
+    """Satu sesi browser: minta rerun lewat websocket lalu tunggu script selesai"""
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    async with websockets.connect(f'ws://127.0.0.1:{port}/_stcore/stream', subprotocols=['streamlit'],
+                                  max_size=None) as ws:
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        await ws.send(msg.SerializeToString())
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(ws.recv(), 120))
+            if forward.WhichOneof('type') == 'script_finished':
+                return
+
+
+def test_first_real_session_reuses_warm_cache(tmp_path):
+    port = free_port()
+    status_file = tmp_path / f'worker-{port}.json'
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'titik_panas.serve', 'worker', 'dashboard_titik_panas.py',
+         '--port', str(port), '--address', '127.0.0.1', '--status', str(status_file)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 120
+        while not backend_healthy('127.0.0.1', port):
+            assert proc.poll() is None and time.monotonic() < deadline
+            time.sleep(0.5)
+        status = json.loads(status_file.read_text())
+        assert status['warm_loads'] == {'dataset': 1, 'wilayah': 1}
+
+        asyncio.run(run_session(port))
+        deadline = time.monotonic() + 30
+        while 'first_session' not in status:
+            assert time.monotonic() < deadline
+            time.sleep(0.2)
+            status = json.loads(status_file.read_text())
+        assert status['first_session']['reused'], status['first_session']
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from titik_panas.shared import SharedDataset, frame_bytes
+
+
+def segment(rows, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'tanggal': pd.date_range('2020-01-01', periods=rows, freq='h'),
+        'titik_panas': rng.integers(0, 50, rows),
+        'skor_risiko': rng.uniform(0, 100, rows)
+    })
+
+
+def table_size(frame):
+    return pa.Table.from_pandas(frame, preserve_index=False).nbytes
+
+
+def test_frame_bytes_counts_each_buffer_once():
+    values = np.arange(1000, dtype=np.float64)
+    df = pd.DataFrame({'a': values, 'b': values[::2].repeat(2)})
+    assert frame_bytes(df) == 2 * values.nbytes
+    # View menahan seluruh buffer pemiliknya
+    assert frame_bytes(df.iloc[:10]) == frame_bytes(df)
+
+
+def test_publish_spills_largest_segments_to_budget(tmp_path):
+    frames = [segment(40_000, 0), segment(10_000, 1), segment(1_000, 2)]
+    sizes = [table_size(frame) for frame in frames]
+    budget = sizes[1] + sizes[2] + 1_000
+    shared = SharedDataset(budget=budget, spill_dir=str(tmp_path))
+    views = shared.publish(1, frames)
+
+    report = shared.memory_report()
+    assert report['mapped'] == 1 and report['resident_bytes'] <= budget
+    assert shared.parts[0][2] is not None and shared.parts[1][2] is None
+    for view, frame in zip(views, frames):
+        pd.testing.assert_frame_equal(view, frame, check_dtype=False)
+    # File memory map langsung di-unlink; view tetap terbaca (POSIX)
+    if os.name == 'posix':
+        assert os.listdir(tmp_path) == []
+        assert views[0]['titik_panas'].sum() == frames[0]['titik_panas'].sum()
+
+
+def test_derived_bytes_count_against_budget(tmp_path):
+    frames = [segment(20_000, 0), segment(20_000, 1)]
+    budget = sum(table_size(frame) for frame in frames) + 1_000
+    shared = SharedDataset(budget=budget, spill_dir=str(tmp_path))
+    shared.publish(1, frames)
+    assert shared.memory_report()['mapped'] == 0
+
+    # Cube rollup yang membesar mendorong segmen ke memory map pada publish berikutnya
+    views = shared.publish(2, shared.frames + [segment(100, 2)], derived={'cube': budget // 2})
+    report = shared.memory_report()
+    assert report['mapped'] >= 1
+    assert report['derived_bytes'] == budget // 2
+    assert report['resident_bytes'] <= budget
+    assert len(views) == 3
+
+
+def test_republish_reuses_published_segments(tmp_path):
+    shared = SharedDataset(budget=2 ** 30, spill_dir=str(tmp_path))
+    first = shared.publish(1, [segment(5_000, 0)])
+    table = shared.parts[0][0]
+    second = shared.publish(2, first + [segment(100, 1)])
+    # Segmen yang sudah dipublikasikan tidak dikonversi ulang ke Arrow
+    assert second[0] is first[0] and shared.parts[0][0] is table
+    assert shared.version == 2 and len(shared.parts) == 2
+
+
+def test_slice_cache_lru_budget_and_versions():
+    shared = SharedDataset(budget=2 ** 30)
+    shared.publish(1, [segment(100, 0)])
+    slice_bytes = 8 * 1_000
+    # Tabel di heap ditambah tepat tiga potongan
+    shared.budget = shared.resident_bytes + 3 * slice_bytes + 100
+    calls = []
+
+    def loader(key, rows=1_000):
+        def load():
+            calls.append(key)
+            return pd.DataFrame({'x': np.zeros(rows)})
+        return load
+
+    for key in ['a', 'b', 'c']:
+        shared.get(1, key, loader(key))
+    assert shared.memory_report()['slice_bytes'] == 3 * slice_bytes
+    shared.get(1, 'a', loader('a'))
+    assert calls == ['a', 'b', 'c']
+
+    # Potongan baru mengusir yang paling lama tidak dipakai ('b', karena 'a' barusan dipakai)
+    shared.get(1, 'd', loader('d'))
+    assert list(shared._slices) == ['c', 'a', 'd']
+    assert shared.resident_bytes <= shared.budget
+
+    # Lebih besar dari sisa budget: dikembalikan tanpa disimpan
+    big = shared.get(1, 'besar', loader('besar', rows=100_000))
+    assert len(big) == 100_000 and 'besar' not in shared._slices
+
+    # Versi baru membuang potongan lama; sesi versi lama tidak menimpa
+    shared.publish(2, shared.frames)
+    assert shared.memory_report()['slices'] == 0
+    shared.get(2, 'a', loader('a'))
+    shared.get(1, 'lama', loader('lama'))
+    assert list(shared._slices) == ['a']
+
+
+def test_views_of_shared_tables_are_free_in_slice_cache():
+    shared = SharedDataset(budget=2 ** 30)
+    views = shared.publish(1, [segment(50_000, 0)])
+    piece = shared.get(1, 'potongan', lambda: views[0].iloc[100:20_000])
+    assert shared.memory_report()['slice_bytes'] == 0
+    assert len(piece) == 19_900
+
+
+@pytest.mark.parametrize('budget', [0, 1])
+def test_zero_budget_maps_every_segment(tmp_path, budget):
+    shared = SharedDataset(budget=budget, spill_dir=str(tmp_path))
+    shared.publish(1, [segment(1_000, 0), segment(10, 1)])
+    assert shared.memory_report()['mapped'] == 2
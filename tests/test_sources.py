@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from titik_panas.ispu import simulate_readings
+from titik_panas.sources import FileSource
+
+AREAS = ['Pontianak Kota', 'Pontianak Barat', 'Sungai Raya']
+START = pd.Timestamp('2025-08-01')
+COMPARED = ['tanggal', 'area', 'titik_panas', 'curah_hujan', 'suhu', 'kelembaban', 'arah_angin']
+
+
+def hotspot_rows(rng, first, last, n=400):
+    days = rng.integers(first, last + 1, n)
+    return pd.DataFrame({
+        'latitude': rng.normal(-0.03, 0.05, n).round(4),
+        'longitude': rng.normal(109.33, 0.05, n).round(4),
+        'acq_date': (START + pd.to_timedelta(days, unit='D')).strftime('%Y-%m-%d'),
+        'area': rng.choice(AREAS, n)
+    })
+
+
+def weather_rows(rng, first, last):
+    dates = pd.date_range(START + pd.Timedelta(days=first), START + pd.Timedelta(days=last))
+    df = pd.DataFrame({
+        'Tanggal': np.repeat(dates.strftime('%d-%m-%Y'), len(AREAS)),
+        'area': np.tile(AREAS, len(dates)),
+        'RR': rng.gamma(1, 5, len(dates) * len(AREAS)).round(1),
+        'Tavg': rng.normal(27, 1, len(dates) * len(AREAS)).round(1),
+        'RH_avg': rng.normal(80, 5, len(dates) * len(AREAS)).round(1),
+        'ddd_x': rng.integers(0, 360, len(dates) * len(AREAS))
+    })
+    df.loc[rng.random(len(df)) < 0.1, 'RR'] = 9999
+    return df
+
+
+def append_csv(path, df):
+    df.to_csv(path, mode='a', header=not path.exists(), index=False)
+
+
+def file_source(tmp_path, chunksize=64):
+    return FileSource(tmp_path / 'hotspot.csv', tmp_path / 'cuaca.csv', chunksize=chunksize,
+                      weather_dayfirst=True)
+
+
+@pytest.fixture
+def parsed_rows(monkeypatch):
+    """Jumlah baris CSV yang di-parse FileSource sejak fixture dibuat"""
+    counter = {'rows': 0}
+    normalize = FileSource._normalize
+
+    def counting(self, chunk, *args, **kwargs):
+        counter['rows'] += len(chunk)
+        return normalize(self, chunk, *args, **kwargs)
+
+    monkeypatch.setattr(FileSource, '_normalize', counting)
+    return counter
+
+
+def test_refresh_parses_only_appended_rows(tmp_path, parsed_rows):
+    rng = np.random.default_rng(0)
+    append_csv(tmp_path / 'hotspot.csv', hotspot_rows(rng, 0, 20))
+    # Cuaca tertinggal dua hari: hari 19-20 belum lengkap
+    append_csv(tmp_path / 'cuaca.csv', weather_rows(rng, 0, 18))
+    source = file_source(tmp_path)
+    first = source.load_since()
+    assert first['tanggal'].max() == START + pd.Timedelta(days=18)
+    watermark = first['tanggal'].max()
+
+    new_hotspots, new_weather = hotspot_rows(rng, 19, 40), weather_rows(rng, 19, 40)
+    append_csv(tmp_path / 'hotspot.csv', new_hotspots)
+    append_csv(tmp_path / 'cuaca.csv', new_weather)
+    parsed_rows['rows'] = 0
+    second = source.load_since(watermark)
+    assert parsed_rows['rows'] == len(new_hotspots) + len(new_weather)
+
+    incremental = pd.concat([first, second], ignore_index=True)[COMPARED]
+    full = file_source(tmp_path, chunksize=10_000).load_since()[COMPARED]
+    pd.testing.assert_frame_equal(incremental, full, check_dtype=False, check_categorical=False)
+
+    # Tanpa baris baru tidak ada yang di-parse, hasil tetap sama
+    parsed_rows['rows'] = 0
+    pd.testing.assert_frame_equal(source.load_since(watermark), second)
+    assert parsed_rows['rows'] == 0
+
+
+def test_rewritten_file_is_read_from_start(tmp_path):
+    rng = np.random.default_rng(1)
+    append_csv(tmp_path / 'hotspot.csv', hotspot_rows(rng, 0, 10))
+    append_csv(tmp_path / 'cuaca.csv', weather_rows(rng, 0, 10))
+    source = file_source(tmp_path)
+    source.load_since()
+
+    # Ditulis ulang di tempat (inode sama) dengan isi lain yang lebih panjang
+    hotspots = hotspot_rows(rng, 0, 10, n=900)
+    hotspots.to_csv(tmp_path / 'hotspot.csv', index=False)
+    again = source.load_since()
+    assert again['titik_panas'].sum() == len(hotspots)
+    pd.testing.assert_frame_equal(again, file_source(tmp_path).load_since())
+
+
+def test_unterminated_last_line_is_counted_once(tmp_path):
+    rng = np.random.default_rng(2)
+    hotspots = hotspot_rows(rng, 0, 5)
+    append_csv(tmp_path / 'cuaca.csv', weather_rows(rng, 0, 5))
+    text = hotspots.to_csv(index=False)
+    (tmp_path / 'hotspot.csv').write_text(text.rstrip('\n'))
+    source = file_source(tmp_path)
+    assert source.load_since()['titik_panas'].sum() == len(hotspots)
+
+    # Baris terakhir selesai ditulis lalu baris baru ditambahkan
+    more = hotspot_rows(rng, 0, 5, n=50)
+    with open(tmp_path / 'hotspot.csv', 'a') as f:
+        f.write('\n' + more.to_csv(index=False, header=False))
+    assert source.load_since()['titik_panas'].sum() == len(hotspots) + len(more)
+
+
+def test_pollutant_refresh_matches_full_read(tmp_path):
+    readings = simulate_readings(AREAS, START, 4 * 24 * 60, rng=3)
+    readings['waktu'] = readings['waktu'].dt.strftime('%Y-%m-%d %H:%M')
+    cut = 2 * 24 * 60 * len(AREAS) + 7 * 60 * len(AREAS)
+    path = tmp_path / 'udara.csv'
+    append_csv(path, readings.iloc[:cut])
+    source = FileSource(tmp_path / 'hotspot.csv', pollutant_path=path, chunksize=5_000)
+    first = source.read_pollutants()
+    watermark = first.index.get_level_values('tanggal')[-1] - pd.Timedelta(days=1)
+
+    append_csv(path, readings.iloc[cut:])
+    incremental = source.read_pollutants(watermark)
+    full = FileSource(tmp_path / 'hotspot.csv', pollutant_path=path, chunksize=5_000).read_pollutants(watermark)
+    pd.testing.assert_frame_equal(incremental, full)
+    assert incremental.index.get_level_values('tanggal').min() == watermark + pd.Timedelta(days=1)
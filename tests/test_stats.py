@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from titik_panas.generator import generate_pontianak_data, synthetic_areas
+from titik_panas.rollup import MOMENT_COLUMNS, RollupCube
+from titik_panas.stats import Moments, group_sum, packed_size
+
+SEEDS = [0, 1, 2, 3]
+
+
+def random_parts(rng, p=3, n_parts=6, offset=1e6):
+    """Partisi ber-ukuran acak (termasuk kosong) dengan rata-rata besar dan berbeda"""
+    sizes = rng.integers(0, 40, n_parts)
+    sizes[0] = max(sizes[0], 2)
+    return [offset + rng.normal(rng.normal(0, 50, p), rng.uniform(0.1, 5, p), (size, p)) for size in sizes]
+
+
+def moments_of(values):
+    return Moments.from_groups(values, np.zeros(len(values), dtype=np.int64), 1)[0]
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_chan_merge_matches_concatenation(seed):
+    rng = np.random.default_rng(seed)
+    parts = random_parts(rng)
+    merged = moments_of(parts[0])
+    for part in parts[1:]:
+        merged = merged.merge(moments_of(part))
+
+    values = np.concatenate(parts)
+    assert merged.n == len(values)
+    np.testing.assert_allclose(merged.mean, values.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(merged.m2[[0, 3, 5]] / (len(values) - 1), np.var(values, axis=0, ddof=1), rtol=1e-7)
+    np.testing.assert_allclose(merged.corr(), np.corrcoef(values, rowvar=False), atol=1e-9)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_merge_order_does_not_matter(seed):
+    rng = np.random.default_rng(seed)
+    parts = [moments_of(part) for part in random_parts(rng)]
+    forward = parts[0]
+    for part in parts[1:]:
+        forward = forward.merge(part)
+    backward = parts[-1]
+    for part in reversed(parts[:-1]):
+        backward = part.merge(backward)
+    np.testing.assert_allclose(forward.mean, backward.mean, rtol=1e-12)
+    np.testing.assert_allclose(forward.m2, backward.m2, rtol=1e-8)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_packed_reduce_matches_concatenation(seed):
+    rng = np.random.default_rng(seed)
+    parts = random_parts(rng)
+    packed = np.zeros((len(parts), packed_size(3)))
+    stacked = Moments.view(packed, 3)
+    for i, part in enumerate(parts):
+        stacked[i] = moments_of(part)
+
+    # Penugasan lewat view menulis ke array terpaket, seperti buffer cube
+    reduced = Moments.view(packed, 3).reduce()
+    values = np.concatenate(parts)
+    assert reduced.n == len(values)
+    np.testing.assert_allclose(reduced.mean, values.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(reduced.corr(), np.corrcoef(values, rowvar=False), atol=1e-9)
+
+
+def test_group_sum_along_axis():
+    rng = np.random.default_rng(0)
+    block = rng.normal(size=(4, 5, 3))
+    groups = np.array([1, -1, 0, 1, 2])
+    out = group_sum(block, groups, 3, axis=1)
+    expected = np.stack([block[:, groups == g].sum(axis=1) for g in range(3)], axis=1)
+    np.testing.assert_allclose(out, expected)
+
+
+def offset_frame(seed, days=1500, n_areas=3, offset=1e6):
+    """Data mock panjang dengan kolom momen digeser jauh dari nol"""
+    rng = np.random.default_rng(seed)
+    areas, coords = synthetic_areas(n_areas, rng=seed)
+    df = generate_pontianak_data(days, rng=rng, areas=areas, area_coords=coords, end=pd.Timestamp('2025-03-01'))
+    for k, col in enumerate(MOMENT_COLUMNS):
+        df[col] = df[col].astype(float) + offset * (k + 1)
+    return df
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+@pytest.mark.parametrize('window_days', [3, 20, 45])
+def test_selection_corr_on_short_late_window(seed, window_days):
+    df = offset_frame(seed)
+    days = df['tanggal'].dt.normalize()
+    # Cube dibangun bertahap seperti ingest: blok momen ditutup saat append
+    cube = RollupCube.from_frame(df[days < days.min() + pd.Timedelta(days=700)])
+    for start in pd.date_range(days.min() + pd.Timedelta(days=700), days.max(), freq='37D'):
+        cube = cube.appended(df[(days >= start) & (days < start + pd.Timedelta(days=37))])
+
+    end = days.max()
+    start = end - pd.Timedelta(days=window_days - 1)
+    areas = sorted(df['area'].unique())[:2]
+    rows = df[(days >= start) & df['area'].isin(areas)]
+    corr = cube.select(areas, start, end).corr()
+    np.testing.assert_allclose(corr.to_numpy(), rows[MOMENT_COLUMNS].corr().to_numpy(), atol=1e-9)
@@ -0,0 +1,91 @@
+import os
+
+import pandas as pd
+import pyarrow.dataset as ds
+import pytest
+
+from titik_panas.generator import generate_pontianak_data, synthetic_areas
+from titik_panas.store import ParquetStore
+
+END = pd.Timestamp('2025-03-01')
+
+
+def mock_frame(days, seed):
+    areas, coords = synthetic_areas(3, rng=0)
+    df = generate_pontianak_data(days, rng=seed, areas=areas, area_coords=coords, end=END)
+    return df[df['tanggal'] <= END]
+
+
+def test_failed_rewrite_keeps_old_contents(tmp_path, monkeypatch):
+    store = ParquetStore(tmp_path / 'store')
+    old = mock_frame(40, seed=0)
+    store.write(old)
+
+    def crash(*args, **kwargs):
+        real_write_dataset(*args, **kwargs)
+        raise OSError("disk penuh")
+
+    real_write_dataset = ds.write_dataset
+    monkeypatch.setattr(ds, 'write_dataset', crash)
+    with pytest.raises(OSError):
+        store.write(mock_frame(90, seed=1))
+    monkeypatch.undo()
+
+    # Pembaca baru (proses lain) melihat isi lama yang utuh
+    reader = ParquetStore(tmp_path / 'store')
+    assert reader.version == 1
+    assert reader.read()['titik_panas'].sum() == old['titik_panas'].sum()
+
+    # Tulis ulang berikutnya membersihkan sisa generasi yang gagal
+    new = mock_frame(90, seed=1)
+    store.write(new)
+    assert len(ParquetStore(tmp_path / 'store').read()) == len(new)
+
+
+def test_reader_with_previous_manifest_survives_rewrite(tmp_path):
+    root = tmp_path / 'store'
+    ParquetStore(root).write(mock_frame(40, seed=0))
+    reader = ParquetStore(root)
+    expected = reader.read()
+
+    writer = ParquetStore(root)
+    writer.write(mock_frame(60, seed=1))
+    writer.write(mock_frame(80, seed=2))
+    pd.testing.assert_frame_equal(ParquetStore(root).read(), writer.read())
+    # Generasi lama dihapus, hanya aktif dan sebelumnya yang tersisa
+    assert sorted(name for name in os.listdir(root) if name.startswith('data-v')) == ['data-v2', 'data-v3']
+
+    writer.write(mock_frame(40, seed=3))
+    assert not (root / 'data-v1').exists()
+    # Manifest lama yang dipegang pembaca menunjuk generasi yang sudah dihapus
+    assert reader.read().empty and len(expected) > 0
+
+
+def test_uncommitted_append_is_invisible(tmp_path):
+    df = mock_frame(40, seed=0)
+    cutoff = df['tanggal'].max() - pd.Timedelta(days=5)
+    store = ParquetStore(tmp_path / 'store')
+    store.write(df[df['tanggal'] <= cutoff])
+    reader = ParquetStore(tmp_path / 'store')
+    before = reader.read()
+
+    # File append sudah di disk tetapi manifest pembaca masih versi lama
+    store.append(df[df['tanggal'] > cutoff])
+    pd.testing.assert_frame_equal(reader.read(), before)
+    assert len(ParquetStore(tmp_path / 'store').read()) == len(df)
+
+
+def test_legacy_layout_is_read_then_replaced(tmp_path):
+    root = tmp_path / 'store'
+    df = mock_frame(40, seed=0)
+    legacy = ParquetStore(root)
+    # Tata letak lama: partisi langsung di root, manifest tanpa kunci data
+    legacy._write(df, os.fspath(root))
+    assert 'data' not in legacy.manifest
+    assert len(ParquetStore(root).read()) == len(df)
+
+    store = ParquetStore(root)
+    store.write(df)
+    store.write(df)
+    assert not any(name.startswith('bulan=') for name in os.listdir(root))
+    assert len(ParquetStore(root).read()) == len(df)
@@ -0,0 +1,19 @@
+"""Komponen data dan komputasi untuk Dashboard Monitoring Titik Panas Pontianak."""
+
+from .generator import (
+    AREA_COORDS,
+    DRY_MONTHS,
+    PONTIANAK_AREAS,
+    classify_risk,
+    generate_pontianak_data,
+    synthetic_areas,
+)
+
+__all__ = [
+    "AREA_COORDS",
+    "DRY_MONTHS",
+    "PONTIANAK_AREAS",
+    "classify_risk",
+    "generate_pontianak_data",
+    "synthetic_areas",
+]
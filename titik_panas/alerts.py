@@ -0,0 +1,319 @@
+"""Evaluator peringatan tanpa sesi browser
+
+Proses terjadwal yang meng-ingest data baru (``IncrementalDataset``), lalu
+mengevaluasi ambang skor risiko, ISPU dan FFMC untuk semua area sekaligus
+dari cube rollup. Peringatan dideduplikasi dan dibatasi per area, lalu
+ditulis ke outbox lokal (SQLite atau JSON-lines) yang dibaca notifier::
+
+    python -m titik_panas.alerts --outbox logs/alerts.db --interval 300
+
+Setiap siklus hanya mengevaluasi hari yang belum pernah dievaluasi, dan
+ingest memperpanjang prefix cube mulai hari baru saja; proses ini tidak
+menyimpan indeks filter baris mentah. Waktu siklus sebanding dengan jumlah
+baris baru dan area, bukan panjang riwayat; ``FileSource`` hanya mem-parse
+byte yang ditambahkan sejak pembacaan terakhir (file yang diganti atau
+dipotong dibaca ulang).
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .generator import RISK_LEVELS, RISK_THRESHOLDS
+from .ingest import IncrementalDataset
+from .sources import source_from_env
+from .store import ParquetStore
+
+logger = logging.getLogger(__name__)
+
+# Ambang eksklusif per indikator dan label tingkatnya (sama dengan label
+# dashboard); nilai <= ambang pertama tidak memicu peringatan
+ALERT_RULES = {
+    'skor_risiko': (RISK_THRESHOLDS[1:], RISK_LEVELS[2:]),
+    'ispu': ([100, 200, 300], ['Tidak Sehat', 'Sangat Tidak Sehat', 'Berbahaya']),
+    'ffmc': ([70, 85], ['Kering', 'Sangat Kering']),
+}
+
+DEFAULT_OUTBOX = os.path.join('logs', 'alerts.db')
+DEFAULT_INTERVAL = 300
+DEFAULT_MIN_INTERVAL = pd.Timedelta(hours=6)
+
+ALERT_COLUMNS = ['id', 'dibuat', 'area', 'indikator', 'tingkat', 'nilai', 'tanggal']
+
+
+def alert_levels(values, rules=ALERT_RULES):
+    """Tingkat peringatan (0: tidak ada) untuk nilai (area, indikator)"""
+    levels = np.zeros(values.shape, dtype=np.int64)
+    for k, (thresholds, _) in enumerate(rules.values()):
+        column = values[:, k]
+        # NaN (tidak ada data) tidak memicu peringatan
+        levels[:, k] = np.where(np.isnan(column), 0, np.searchsorted(thresholds, column, side='left'))
+    return levels
+
+
+class SqliteOutbox:
+    """Outbox SQLite: tabel ``alerts`` yang dibaca notifier (kolom ``terkirim``)
+
+    ``id`` peringatan adalah kunci dedup (area, indikator, tanggal, tingkat);
+    peringatan yang sama tidak pernah masuk dua kali.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        # WAL: notifier dapat membaca selama evaluator menulis
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS alerts ('
+            'seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE, dibuat TEXT, area TEXT, '
+            'indikator TEXT, tingkat TEXT, nilai REAL, tanggal TEXT, terkirim INTEGER DEFAULT 0)'
+        )
+        self.conn.execute('CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)')
+        self.conn.commit()
+
+    def append(self, alerts):
+        """Tulis peringatan; kembalikan jumlah yang benar-benar baru"""
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO alerts (id, dibuat, area, indikator, tingkat, nilai, tanggal) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                alerts[ALERT_COLUMNS].astype(object).itertuples(index=False, name=None)
+            )
+        return self.conn.total_changes - before
+
+    def pending(self, limit=100):
+        """Peringatan yang belum dikirim notifier (urutan masuk)"""
+        return pd.read_sql_query(
+            'SELECT seq, ' + ', '.join(ALERT_COLUMNS) + ' FROM alerts WHERE terkirim = 0 ORDER BY seq LIMIT ?',
+            self.conn, params=(limit,)
+        )
+
+    def mark_sent(self, seqs):
+        with self.conn:
+            self.conn.executemany('UPDATE alerts SET terkirim = 1 WHERE seq = ?', [(int(s),) for s in seqs])
+
+    def load_state(self):
+        row = self.conn.execute("SELECT value FROM state WHERE key = 'evaluator'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_state(self, state):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO state (key, value) VALUES ('evaluator', ?)", (json.dumps(state),)
+            )
+
+
+class FileOutbox:
+    """Outbox JSON-lines: satu peringatan per baris, state di ``path.state.json``
+
+    Notifier cukup membaca file mulai offset terakhirnya.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.state_path = path + '.state.json'
+        self._seen = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._seen = {json.loads(line)['id'] for line in f if line.strip()}
+
+    def append(self, alerts):
+        fresh = alerts[~alerts['id'].isin(self._seen)]
+        if len(fresh):
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for record in fresh[ALERT_COLUMNS].to_dict('records'):
+                    f.write(json.dumps(record, default=str) + '\n')
+            self._seen.update(fresh['id'])
+        return len(fresh)
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_state(self, state):
+        # Tulis ke file sementara lalu ganti agar state tidak pernah setengah jadi
+        tmp = self.state_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+
+def open_outbox(path=DEFAULT_OUTBOX):
+    """Outbox SQLite untuk ``.db``/``.sqlite``, selain itu JSON-lines"""
+    if path.endswith(('.db', '.sqlite', '.sqlite3')):
+        return SqliteOutbox(path)
+    return FileOutbox(path)
+
+
+class AlertEvaluator:
+    """Evaluasi ambang per area dengan dedup dan pembatasan laju
+
+    State per area disimpan sebagai array (area, indikator): tingkat terakhir
+    yang dikirim dan waktu kirim terakhir per area. Sebuah peringatan dikirim
+    bila tingkatnya naik dibanding peringatan terakhir indikator itu, atau
+    bila area sudah tidak mengirim peringatan selama ``min_interval``
+    (pengingat untuk kondisi yang bertahan). Tingkat kembali ke 0 saat nilai
+    turun di bawah ambang, sehingga kenaikan berikutnya dikirim lagi.
+    """
+
+    def __init__(self, outbox, rules=ALERT_RULES, min_interval=DEFAULT_MIN_INTERVAL, backfill_days=1):
+        self.outbox = outbox
+        self.rules = rules
+        self.indicators = list(rules)
+        self.min_interval = pd.Timedelta(min_interval)
+        self.backfill_days = backfill_days
+        # Tabel label (indikator, tingkat) untuk pencarian label secara vektor
+        width = 1 + max(len(labels) for _, labels in rules.values())
+        self._label_table = np.array(
+            [[''] + list(labels) + [''] * (width - 1 - len(labels)) for _, labels in rules.values()],
+            dtype=object
+        )
+        self.watermark = None
+        self.areas = pd.Index([], dtype=object)
+        self.last_level = np.zeros((0, len(rules)), dtype=np.int64)
+        self.last_sent = np.full(0, np.iinfo(np.int64).min // 2, dtype=np.int64)
+        state = outbox.load_state()
+        if state is not None:
+            self._restore(state)
+
+    def _restore(self, state):
+        self.watermark = pd.Timestamp(state['watermark']) if state.get('watermark') else None
+        self._extend(state['areas'])
+        for k, name in enumerate(self.indicators):
+            self.last_level[:, k] = state['last_level'].get(name, [0] * len(self.areas))
+        self.last_sent[:] = state['last_sent']
+
+    def state(self):
+        return {
+            'watermark': None if self.watermark is None else self.watermark.isoformat(),
+            'areas': list(self.areas),
+            'last_level': {name: self.last_level[:, k].tolist() for k, name in enumerate(self.indicators)},
+            'last_sent': self.last_sent.tolist()
+        }
+
+    def _extend(self, areas):
+        """Tambah area baru ke state; kembalikan posisi ``areas`` di state"""
+        new = [a for a in areas if a not in self.areas]
+        if new:
+            self.areas = self.areas.append(pd.Index(new, dtype=object))
+            self.last_level = np.vstack([self.last_level, np.zeros((len(new), len(self.rules)), dtype=np.int64)])
+            self.last_sent = np.concatenate([
+                self.last_sent, np.full(len(new), np.iinfo(np.int64).min // 2, dtype=np.int64)
+            ])
+        return self.areas.get_indexer(areas)
+
+    def pending_days(self, cube, now):
+        """Slice indeks hari cube yang belum dievaluasi, sampai hari ini"""
+        last = min(cube.dates[-1], pd.Timestamp(now).normalize())
+        if self.watermark is None:
+            first = last - pd.Timedelta(days=self.backfill_days - 1)
+        else:
+            first = self.watermark + pd.Timedelta(days=1)
+        lo = cube.dates.searchsorted(first, side='left')
+        hi = cube.dates.searchsorted(last, side='right')
+        return slice(lo, max(lo, hi))
+
+    def evaluate(self, cube, now=None):
+        """Evaluasi hari baru di ``cube``; kembalikan DataFrame peringatan yang ditulis"""
+        now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+        days = self.pending_days(cube, now)
+        if days.stop <= days.start:
+            return pd.DataFrame(columns=ALERT_COLUMNS)
+        # Rata-rata harian (area, hari, indikator) hanya untuk hari baru
+        values = np.stack([cube.area_daily_means(name, days) for name in self.indicators], axis=-1)
+        rows = self._extend(cube.areas)
+        now_ns = now.value
+        batches = []
+        for d, tanggal in enumerate(cube.dates[days]):
+            levels = alert_levels(values[:, d], self.rules)
+            last = self.last_level[rows]
+            quiet = now_ns - self.last_sent[rows] >= self.min_interval.value
+            send = (levels > 0) & ((levels > last) | quiet[:, None])
+            self.last_level[rows] = np.where(levels == 0, 0, np.where(send, levels, last))
+            self.last_sent[rows[send.any(axis=1)]] = now_ns
+            area_idx, rule_idx = np.nonzero(send)
+            if len(area_idx):
+                batches.append(self._records(cube.areas, area_idx, rule_idx, levels, values[:, d], tanggal, now))
+        alerts = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=ALERT_COLUMNS)
+        if len(alerts):
+            self.outbox.append(alerts)
+        self.watermark = cube.dates[days.stop - 1]
+        self.outbox.save_state(self.state())
+        return alerts
+
+    def _records(self, areas, area_idx, rule_idx, levels, values, tanggal, now):
+        names = np.asarray(self.indicators, dtype=object)[rule_idx]
+        labels = self._label_table[rule_idx, levels[area_idx, rule_idx]]
+        area_names = pd.Series(np.asarray(areas, dtype=object)[area_idx], dtype=str)
+        day = tanggal.date().isoformat()
+        return pd.DataFrame({
+            # Kunci dedup dirangkai per kolom (vektor), bukan per baris
+            'id': (area_names + '|' + pd.Series(names + '|' + day + '|' + labels, dtype=str)).to_numpy(object),
+            'dibuat': now.isoformat(),
+            'area': area_names.to_numpy(object),
+            'indikator': names,
+            'tingkat': labels,
+            'nilai': np.round(values[area_idx, rule_idx], 2),
+            'tanggal': day
+        })
+
+
+def run(dataset, evaluator, interval=DEFAULT_INTERVAL, cycles=None):
+    """Jalankan siklus ingest + evaluasi setiap ``interval`` detik"""
+    done = 0
+    while cycles is None or done < cycles:
+        started = time.perf_counter()
+        added = dataset.refresh()
+        _, _, cube, _ = dataset.snapshot()
+        alerts = evaluator.evaluate(cube) if cube is not None else []
+        elapsed = time.perf_counter() - started
+        logger.info(
+            'siklus %.1f ms: %d baris baru, %d area, %d peringatan',
+            elapsed * 1000, added, 0 if cube is None else len(cube.areas), len(alerts)
+        )
+        done += 1
+        if cycles is None or done < cycles:
+            time.sleep(max(0.0, interval - elapsed))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluator peringatan titik panas tanpa browser")
+    parser.add_argument('--outbox', default=DEFAULT_OUTBOX,
+                        help="File outbox (.db/.sqlite: SQLite, selain itu JSON-lines)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help="Jeda antar siklus (detik)")
+    parser.add_argument('--min-interval-hours', type=float, default=DEFAULT_MIN_INTERVAL / pd.Timedelta(hours=1),
+                        help="Jeda minimum antar peringatan per area kecuali tingkat naik")
+    parser.add_argument('--backfill-days', type=int, default=1,
+                        help="Jumlah hari terakhir yang dievaluasi saat pertama kali berjalan")
+    parser.add_argument('--once', action='store_true', help="Jalankan satu siklus lalu keluar")
+    parser.add_argument('--store', default=os.environ.get('TITIK_PANAS_STORE'))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    dataset = IncrementalDataset(source_from_env(), ParquetStore(args.store) if args.store else None,
+                                 filter_index=False)
+    evaluator = AlertEvaluator(
+        open_outbox(args.outbox),
+        min_interval=pd.Timedelta(hours=args.min_interval_hours),
+        backfill_days=args.backfill_days
+    )
+    try:
+        run(dataset, evaluator, args.interval, cycles=1 if args.once else None)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
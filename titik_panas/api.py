@@ -0,0 +1,528 @@
+"""API HTTP ekspor agregat untuk konsumen non-browser
+
+Agregat yang dihitung dashboard (titik panas harian per wilayah, skor
+risiko, status ISPU, prakiraan) dan baris data terfilter tersedia sebagai
+JSON, CSV atau Parquet tanpa Streamlit::
+
+    python -m titik_panas.api --port 8502
+    curl 'http://127.0.0.1:8502/api/harian?tingkat=kecamatan&mulai=2024-08-01&format=csv'
+
+Respons di-cache per (query, versi data) dengan LRU berbatas byte. ETag
+diturunkan dari versi data dan query, sehingga klien yang mengirim
+``If-None-Match`` mendapat 304 tanpa perhitungan ulang. Ekspor baris
+(``/api/ekspor``) dikirim bertahap per potongan dengan chunked transfer
+encoding, tidak ditampung utuh di memori.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .filtering import SEASONS
+from .generator import COLUMNS, classify_ispu, classify_risk
+from .ingest import IncrementalDataset
+from .regions import RegionRegistry, RegionRollup
+from .sources import source_from_env
+from .store import ParquetStore, months_between
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8502
+DEFAULT_CACHE_BYTES = 64 * 2 ** 20
+DEFAULT_CACHE_ENTRIES = 256
+
+# Respons lebih besar dari ini tidak disimpan di cache (tetap ber-ETag)
+MAX_CACHED_BYTES = 8 * 2 ** 20
+
+# Jeda minimum (detik) antar pemeriksaan data baru di sumber
+DEFAULT_REFRESH = 60
+
+# Baris per potongan ekspor bertahap
+STREAM_ROWS = 50_000
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+# Agregat harian (sum/mean) yang diekspor per wilayah dan untuk seleksi
+DAILY_AGGS = {
+    'titik_panas': 'sum',
+    'skor_risiko': 'mean',
+    'ispu': 'mean',
+    'ffmc': 'mean',
+    'fwi': 'mean',
+    'curah_hujan': 'mean',
+    'suhu': 'mean',
+    'kelembaban': 'mean'
+}
+
+MAX_HORIZON = 30
+
+
+class ApiError(Exception):
+    """Galat request dengan status HTTP"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseCache:
+    """Cache LRU respons (ETag, content type, body) berbatas byte dan entri"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        size = len(entry[2])
+        if size > min(self.max_bytes, MAX_CACHED_BYTES):
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[2])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class _Drain:
+    """Sink file-like untuk ParquetWriter; byte ditampung sampai ``drain``"""
+
+    def __init__(self):
+        self._parts = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self):
+        return True
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def _json_default(value):
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tidak dapat diserialisasi: {type(value).__name__}")
+
+
+def encode(chunks, fmt):
+    """Serialisasi potongan DataFrame ke byte secara bertahap (json/csv/parquet)
+
+    ``chunks`` minimal berisi satu frame (boleh kosong) agar skema/header
+    tetap terbentuk.
+    """
+    if fmt == 'csv':
+        for i, chunk in enumerate(chunks):
+            yield chunk.to_csv(index=False, header=i == 0, date_format='%Y-%m-%d').encode()
+    elif fmt == 'json':
+        yield b'['
+        first = True
+        for chunk in chunks:
+            if len(chunk):
+                records = chunk.to_json(orient='records', date_format='iso', force_ascii=False)[1:-1]
+                yield (records if first else ',' + records).encode()
+                first = False
+        yield b']'
+    elif fmt == 'parquet':
+        sink, writer = _Drain(), None
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+    else:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Format tidak didukung: {fmt}")
+
+
+def _chunks(df, rows=STREAM_ROWS):
+    for lo in range(0, max(len(df), 1), rows):
+        yield df.iloc[lo:lo + rows]
+
+
+def _labels(df):
+    """Tambahkan tingkat risiko dan status ISPU dari rata-rata"""
+    return df.assign(
+        tingkat_risiko=np.where(df['skor_risiko'].isna(), None, classify_risk(df['skor_risiko'])),
+        status_ispu=classify_ispu(df['ispu'])
+    )
+
+
+class Snapshot:
+    """Komponen satu versi data yang dipakai handler"""
+
+    def __init__(self, tag, version, index, store, rollup, forecast):
+        self.tag = tag
+        self.version = version
+        self.index = index
+        self.store = store
+        self.rollup = rollup
+        self.registry = rollup.registry
+        self.forecast = forecast
+
+
+class ExportApi:
+    """Handler endpoint ``/api/*`` di atas ``IncrementalDataset``
+
+    Data baru diperiksa paling sering setiap ``refresh_interval`` detik saat
+    ada request; cube per tingkat wilayah dibangun ulang hanya bila versi
+    data berubah, dan cache respons versi lama dibuang.
+    """
+
+    def __init__(self, dataset, regions_path=None, cache=None, refresh_interval=DEFAULT_REFRESH):
+        self.dataset = dataset
+        self.regions_path = regions_path
+        self.cache = cache or ResponseCache()
+        self.refresh_interval = refresh_interval
+        self._registry = RegionRegistry.from_file(regions_path) if regions_path else None
+        self._snapshot = None
+        self._refreshed = None
+        self._lock = threading.Lock()
+        self.endpoints = {
+            '/api/versi': self.versi,
+            '/api/harian': self.harian,
+            '/api/ringkasan': self.ringkasan,
+            '/api/prakiraan': self.prakiraan,
+            '/api/ekspor': self.ekspor
+        }
+
+    def snapshot(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._refreshed is None or now - self._refreshed >= self.refresh_interval:
+                added = self.dataset.refresh()
+                self._refreshed = now
+                if added:
+                    logger.info('%d baris baru', added)
+            version, index, cube, forecast = self.dataset.snapshot()
+            if cube is None:
+                raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, "Data belum tersedia")
+            if self._snapshot is None or self._snapshot.version != version:
+                previous = None if self._snapshot is None else self._snapshot.rollup
+                registry = self._registry
+                if registry is None:
+                    # Registri bawaan dipakai ulang selama area data sama agar
+                    # cube tingkat atas cukup diperpanjang (lihat ``RegionRollup``)
+                    same = previous is not None and previous.cubes[previous.registry.leaf_level].areas == cube.areas
+                    registry = previous.registry if same else RegionRegistry.default_for(cube.areas)
+                tag = hashlib.blake2b(
+                    repr((self.dataset.source.cache_key(), self.regions_path, version)).encode(),
+                    digest_size=8
+                ).hexdigest()
+                self._snapshot = Snapshot(tag, version, index, self.dataset.store,
+                                          RegionRollup(cube, registry, previous), forecast)
+                self.cache.clear()
+            return self._snapshot
+
+    # Parameter query
+
+    def selection(self, snap, params):
+        """(tingkat, unit atau None, mulai, akhir, musim) dari query"""
+        registry = snap.registry
+        level = params.get('tingkat', registry.leaf_level)
+        if level not in registry.levels:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Tingkat tidak dikenal: {level} (pilihan: {', '.join(registry.levels)})")
+        units = None
+        if params.get('wilayah'):
+            units = [u.strip() for u in params['wilayah'].split(',') if u.strip()]
+            unknown = sorted(set(units) - set(registry.units(level)))
+            if unknown:
+                raise ApiError(HTTPStatus.BAD_REQUEST, f"Wilayah tidak dikenal di tingkat {level}: {', '.join(unknown[:5])}")
+        try:
+            start = pd.Timestamp(params['mulai']) if params.get('mulai') else None
+            end = pd.Timestamp(params['akhir']) if params.get('akhir') else None
+        except ValueError as exc:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Tanggal tidak valid: {exc}")
+        season = params.get('musim', 'Semua')
+        if season != 'Semua' and season not in SEASONS:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Musim tidak dikenal: {season}")
+        return level, units, start, end, None if season == 'Semua' else season
+
+    # Endpoint: DataFrame (tabel) atau dict (hanya JSON)
+
+    def versi(self, snap, params):
+        cube = snap.rollup.cubes[snap.registry.leaf_level]
+        return {
+            'versi': snap.version,
+            'etag_versi': snap.tag,
+            'tanggal_awal': cube.dates[0].date().isoformat() if len(cube.dates) else None,
+            'tanggal_akhir': cube.dates[-1].date().isoformat() if len(cube.dates) else None,
+            'tingkat': {level: snap.registry.units(level) for level in snap.registry.levels},
+            'endpoint': sorted(self.endpoints)
+        }
+
+    def harian(self, snap, params):
+        """Agregat harian per unit wilayah di tingkat terpilih"""
+        level, units, start, end, season = self.selection(snap, params)
+        daily = snap.rollup.select(level, units, start, end, season).area_daily(DAILY_AGGS)
+        return _labels(daily.rename(columns={'area': 'wilayah'}))
+
+    def ringkasan(self, snap, params):
+        """Agregat harian gabungan seluruh seleksi"""
+        level, units, start, end, season = self.selection(snap, params)
+        return _labels(snap.rollup.select(level, units, start, end, season).daily(DAILY_AGGS))
+
+    def prakiraan(self, snap, params):
+        """Prakiraan harian dengan pita 80% untuk area di bawah seleksi"""
+        level, units, _, _, _ = self.selection(snap, params)
+        try:
+            horizon = int(params.get('horizon', 7))
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "horizon harus bilangan bulat")
+        if not 1 <= horizon <= MAX_HORIZON:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"horizon harus 1-{MAX_HORIZON}")
+        areas = None if units is None else snap.registry.leaves_under(level, units)
+        return snap.forecast.forecast(horizon, areas=areas)
+
+    def ekspor(self, snap, params):
+        """Baris data terfilter sebagai generator potongan (tidak di-cache)"""
+        level, units, start, end, season = self.selection(snap, params)
+        columns = COLUMNS
+        if params.get('kolom'):
+            columns = [c.strip() for c in params['kolom'].split(',') if c.strip()]
+            unknown = [c for c in columns if c not in COLUMNS]
+            if unknown:
+                raise ApiError(HTTPStatus.BAD_REQUEST, f"Kolom tidak dikenal: {', '.join(unknown)}")
+        areas = None if units is None else snap.registry.leaves_under(level, units)
+        if snap.store is None:
+            frame = snap.index.select(areas, start, end, season)
+            return (chunk[columns] for chunk in _chunks(frame))
+        return self._store_chunks(snap.store, areas, start, end, season, columns)
+
+    def _store_chunks(self, store, areas, start, end, season, columns):
+        # Dibaca per partisi bulan: memori terbatas pada satu bulan
+        manifest = store.manifest
+        first, last = pd.Timestamp(manifest['min_date']), pd.Timestamp(manifest['max_date'])
+        start, end = max(start or first, first), min(end or last, last)
+        empty = True
+        for bulan in months_between(start, end, season):
+            month_start = pd.Timestamp(year=bulan // 100, month=bulan % 100, day=1)
+            month_end = month_start + pd.offsets.MonthEnd(0)
+            part = store.read(areas, max(start, month_start), min(end, month_end), season, columns)
+            if len(part):
+                empty = False
+                yield from _chunks(part)
+        if empty:
+            yield store.read(areas, start, end, season, columns).iloc[0:0]
+
+    # HTTP
+
+    def etag(self, snap, path, params):
+        canonical = repr((snap.tag, path, sorted(params.items())))
+        return '"' + hashlib.blake2b(canonical.encode(), digest_size=12).hexdigest() + '"'
+
+    def respond(self, request):
+        """(status, header, content type, body) untuk satu request
+
+        ``body`` berupa bytes, atau iterator bytes untuk ekspor bertahap yang
+        potongan pertamanya sudah dihitung (galat awal belum mengirim header).
+        """
+        url = urlsplit(request.path)
+        params = dict(parse_qsl(url.query))
+        endpoint = self.endpoints.get(url.path.rstrip('/'))
+        if endpoint is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Endpoint tidak ada: {url.path}")
+        fmt = params.setdefault('format', 'json')
+        if fmt not in CONTENT_TYPES:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Format tidak didukung: {fmt}")
+        snap = self.snapshot()
+        etag = self.etag(snap, url.path, params)
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'X-Data-Version': str(snap.version)}
+        if _etag_matches(request.headers.get('If-None-Match'), etag):
+            return HTTPStatus.NOT_MODIFIED, headers, None, b''
+
+        # ETag sudah memuat versi data, endpoint dan query
+        cached = self.cache.get(etag)
+        if cached is not None:
+            return HTTPStatus.OK, headers, cached[1], cached[2]
+
+        result = endpoint(snap, params)
+        if isinstance(result, dict):
+            if fmt != 'json':
+                raise ApiError(HTTPStatus.BAD_REQUEST, f"{url.path} hanya tersedia sebagai json")
+            body = json.dumps(result, default=_json_default, ensure_ascii=False).encode()
+        elif isinstance(result, pd.DataFrame):
+            body = b''.join(encode(_chunks(result), fmt))
+        else:
+            headers['Content-Disposition'] = f'attachment; filename="titik_panas-{url.path.rsplit("/", 1)[-1]}.{fmt}"'
+            parts = encode(result, fmt)
+            first = next(parts)
+            return HTTPStatus.OK, headers, CONTENT_TYPES[fmt], itertools.chain([first], parts)
+        self.cache.put(etag, (etag, CONTENT_TYPES[fmt], body))
+        return HTTPStatus.OK, headers, CONTENT_TYPES[fmt], body
+
+    def handle(self, request):
+        try:
+            status, headers, content_type, body = self.respond(request)
+        except ApiError as exc:
+            status, headers, content_type, body = exc.status, {}, CONTENT_TYPES['json'], _error_body(str(exc))
+        except Exception:
+            # Galat tak terduga (mis. baca Parquet, pandas di endpoint) tetap
+            # dijawab sebelum header terkirim agar koneksi keep-alive utuh
+            logger.exception('Galat menangani %s', request.path)
+            status, headers, content_type = HTTPStatus.INTERNAL_SERVER_ERROR, {}, CONTENT_TYPES['json']
+            body = _error_body("Galat internal server")
+        if isinstance(body, bytes):
+            return self._send(request, status, headers, content_type, body)
+        return self._stream(request, headers, content_type, body)
+
+    def _send(self, request, status, headers, content_type=None, body=b''):
+        request.send_response(status)
+        for name, value in headers.items():
+            request.send_header(name, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            request.send_header('Content-Type', content_type)
+            request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        if body:
+            request.wfile.write(body)
+
+    def _stream(self, request, headers, content_type, parts):
+        request.send_response(HTTPStatus.OK)
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Transfer-Encoding', 'chunked')
+        request.end_headers()
+        try:
+            for data in parts:
+                if data:
+                    request.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+        except Exception:
+            # Status 200 sudah terkirim: koneksi diputus tanpa chunk penutup
+            # agar klien melihat body terpotong, bukan ekspor yang tampak lengkap
+            logger.exception('Ekspor bertahap terputus: %s', request.path)
+            request.close_connection = True
+            return
+        request.wfile.write(b'0\r\n\r\n')
+
+
+def _error_body(message):
+    return json.dumps({'error': message}, ensure_ascii=False).encode()
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'TitikPanasAPI/1.0'
+
+    def do_GET(self):
+        self.server.api.handle(self)
+
+    def log_message(self, format, *args):
+        logger.info('%s %s', self.address_string(), format % args)
+
+
+def make_server(api, host='127.0.0.1', port=DEFAULT_PORT):
+    server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.daemon_threads = True
+    server.api = api
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API ekspor agregat titik panas (JSON/CSV/Parquet)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_BYTES // 2 ** 20)
+    parser.add_argument('--refresh', type=float, default=DEFAULT_REFRESH,
+                        help="Jeda minimum antar pemeriksaan data baru (detik)")
+    parser.add_argument('--store', default=os.environ.get('TITIK_PANAS_STORE'))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    dataset = IncrementalDataset(source_from_env(), ParquetStore(args.store) if args.store else None)
+    api = ExportApi(
+        dataset,
+        regions_path=os.environ.get('TITIK_PANAS_REGIONS'),
+        cache=ResponseCache(args.cache_mb * 2 ** 20),
+        refresh_interval=args.refresh
+    )
+    api.snapshot()
+    server = make_server(api, args.host, args.port)
+    logger.info('API ekspor di http://%s:%d/api/versi', args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
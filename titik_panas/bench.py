@@ -0,0 +1,180 @@
+"""Benchmark tahap pipeline dashboard pada beberapa kelipatan ukuran data
+
+Jalankan dengan ``python -m titik_panas.bench``. Setiap tahap diukur waktu
+(terbaik dari ``--repeat`` kali), memori puncak (tracemalloc, satu run
+terpisah agar tidak membebani waktu) dan ukuran payload figure.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from .pipeline import (
+    apply_filters,
+    build_dataset,
+    build_hotspot_index,
+    default_filter,
+    load_data,
+    make_source,
+    tab_stages,
+)
+from .views import payload_bytes
+
+SCALES = [1, 10, 100, 1000]
+
+DEFAULT_BASELINE = os.path.join('benchmarks', 'baseline.json')
+
+# Tanggal akhir tetap agar payload antar run dapat dibandingkan
+BENCH_END = pd.Timestamp('2024-09-30')
+
+# Ambang regresi: rasio terhadap baseline dan selisih absolut minimum
+TIME_TOLERANCE = 1.5
+MEMORY_TOLERANCE = 1.5
+PAYLOAD_TOLERANCE = 1.1
+MIN_TIME_DIFF = 0.005
+MIN_MEMORY_DIFF = 1 << 20
+MIN_PAYLOAD_DIFF = 1 << 10
+
+
+def measure(fn, repeat=1):
+    """(hasil, detik terbaik, byte memori puncak) untuk ``fn()``"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def run_scale(scale, repeat=1, seed=0):
+    """Ukur semua tahap pada satu kelipatan ukuran; kembalikan daftar record"""
+    records = []
+
+    def record(stage, rows, seconds, peak, payload=None):
+        records.append({
+            'scale': scale,
+            'stage': stage,
+            'rows': int(rows),
+            'seconds': seconds,
+            'peak_bytes': int(peak),
+            'payload_bytes': payload
+        })
+
+    source = make_source(scale, seed=seed, end=BENCH_END)
+    (frame, fwi_engine), seconds, peak = measure(lambda: load_data(source), repeat)
+    record('muat', len(frame), seconds, peak)
+
+    dataset, seconds, peak = measure(lambda: build_dataset(source, frame, fwi_engine), repeat)
+    record('ingest', len(frame), seconds, peak)
+    index, cube, forecast_engine = dataset.index, dataset.cube, dataset.forecast
+
+    hotspot_index, seconds, peak = measure(lambda: build_hotspot_index(source, frame), repeat)
+    record('indeks_deteksi', len(hotspot_index) if hotspot_index is not None else 0, seconds, peak)
+
+    filters = {'filter:semua': default_filter(index), 'filter:7_hari': default_filter(index, days=7)}
+    for stage, (areas, start, end) in filters.items():
+        (filtered_df, rollup), seconds, peak = measure(
+            lambda: apply_filters(index, cube, areas, start, end), repeat)
+        record(stage, len(filtered_df), seconds, peak)
+
+    # Tab diukur pada filter bawaan sidebar (semua area, seluruh rentang)
+    areas, start, end = filters['filter:semua']
+    filtered_df, rollup = apply_filters(index, cube, areas, start, end)
+    for tab, (aggregate, build) in tab_stages(
+            filtered_df, rollup, forecast_engine, areas, hotspot_index).items():
+        data, seconds, peak = measure(aggregate, repeat)
+        record(f'{tab}:agregasi', len(filtered_df), seconds, peak)
+        figures, seconds, peak = measure(lambda: build(data), repeat)
+        record(f'{tab}:figure', len(filtered_df), seconds, peak)
+        payload, seconds, peak = measure(
+            lambda: sum(payload_bytes(fig) for fig in figures.values()), repeat)
+        record(f'{tab}:serialisasi', len(filtered_df), seconds, peak, payload)
+    return records
+
+
+def compare(records, baseline):
+    """Tandai regresi terhadap baseline (kunci: scale + stage)"""
+    base = {(r['scale'], r['stage']): r for r in baseline}
+    for r in records:
+        flags = []
+        old = base.get((r['scale'], r['stage']))
+        if old is not None:
+            if r['seconds'] > old['seconds'] * TIME_TOLERANCE and r['seconds'] - old['seconds'] > MIN_TIME_DIFF:
+                flags.append('waktu')
+            if (r['peak_bytes'] > old['peak_bytes'] * MEMORY_TOLERANCE
+                    and r['peak_bytes'] - old['peak_bytes'] > MIN_MEMORY_DIFF):
+                flags.append('memori')
+            if (r['payload_bytes'] is not None and old.get('payload_bytes') is not None
+                    and r['payload_bytes'] > old['payload_bytes'] * PAYLOAD_TOLERANCE
+                    and r['payload_bytes'] - old['payload_bytes'] > MIN_PAYLOAD_DIFF):
+                flags.append('payload')
+        r['regresi'] = ','.join(flags)
+    return records
+
+
+def report(records):
+    """Tabel ringkas: waktu (ms), memori puncak (MB), payload (KB)"""
+    table = pd.DataFrame(records)
+    table['ms'] = (table['seconds'] * 1000).round(1)
+    table['peak_mb'] = (table['peak_bytes'] / 2 ** 20).round(2)
+    table['payload_kb'] = (table['payload_bytes'].astype(float) / 1024).round(1)
+    columns = ['scale', 'stage', 'rows', 'ms', 'peak_mb', 'payload_kb']
+    if 'regresi' in table:
+        columns.append('regresi')
+    return table[columns].to_string(index=False, na_rep='-')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline dashboard titik panas")
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Simpan hasil run ini sebagai baseline")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Exit code 1 bila ada regresi terhadap baseline")
+    args = parser.parse_args(argv)
+
+    records = []
+    for scale in args.scales:
+        records.extend(run_scale(scale, repeat=args.repeat, seed=args.seed))
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['records']
+        compare(records, baseline)
+    print(report(records))
+
+    regressions = [r for r in records if r.get('regresi')]
+    if baseline is not None:
+        print(f"\n{len(regressions)} regresi terhadap {args.baseline}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        saved = [{k: v for k, v in r.items() if k != 'regresi'} for r in records]
+        with open(args.baseline, 'w') as f:
+            json.dump({'created': pd.Timestamp.now().isoformat(), 'records': saved}, f, indent=1)
+        print(f"Baseline disimpan ke {args.baseline}")
+
+    if args.fail_on_regression and regressions:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
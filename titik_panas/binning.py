@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+# Di atas jumlah baris ini scatter dikirim dalam bentuk bin, bukan titik mentah
+SCATTER_ROW_THRESHOLD = 2_000
+
+COMPASS_16 = [
+    'U', 'UTL', 'TL', 'TTL', 'T', 'TTG', 'TG', 'STG',
+    'S', 'SBD', 'BD', 'BBD', 'B', 'BBL', 'BL', 'UBL'
+]
+
+WIND_SPEED_BINS = [0, 1, 2, 3, 4, 5, np.inf]
+
+
+def wind_rose(direction, speed, n_sectors=16, speed_bins=WIND_SPEED_BINS):
+    """Frekuensi arah x kecepatan angin (%) dengan ``numpy.histogram2d``
+
+    Sektor dipusatkan pada arah mata angin (sektor utara mencakup
+    348.75°-11.25°), sehingga ukuran hasil selalu ``n_sectors x n_kecepatan``.
+    """
+    direction = np.asarray(direction, dtype=float)
+    speed = np.asarray(speed, dtype=float)
+    valid = ~(np.isnan(direction) | np.isnan(speed))
+    width = 360 / n_sectors
+    # Geser setengah sektor agar sektor pertama berpusat di 0°
+    shifted = (direction[valid] + width / 2) % 360
+    counts, _, _ = np.histogram2d(
+        shifted, speed[valid],
+        bins=[np.linspace(0, 360, n_sectors + 1), speed_bins]
+    )
+    total = counts.sum()
+    freq = counts / total * 100 if total else counts
+
+    labels = COMPASS_16 if n_sectors == 16 else [f'{i * width:.0f}°' for i in range(n_sectors)]
+    speed_labels = [
+        f'{lo:g}-{hi:g} m/s' if np.isfinite(hi) else f'>{lo:g} m/s'
+        for lo, hi in zip(speed_bins[:-1], speed_bins[1:])
+    ]
+    return pd.DataFrame({
+        'arah': np.repeat(labels, len(speed_labels)),
+        'kecepatan': np.tile(speed_labels, n_sectors),
+        'frekuensi': freq.ravel()
+    })
+
+
+def box_stats(df, by, column):
+    """Kuartil dan pagar Tukey per kelompok untuk ``go.Box`` yang sudah dihitung"""
+    rows = []
+    for key, values in df.groupby(by, observed=True)[column]:
+        values = values.dropna().to_numpy()
+        if len(values) == 0:
+            continue
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        iqr = q3 - q1
+        inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+        rows.append({
+            by: key,
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'lowerfence': inside.min(),
+            'upperfence': inside.max(),
+            'mean': values.mean(),
+            'n': len(values)
+        })
+    return pd.DataFrame(rows, columns=[by, 'q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean', 'n'])
+
+
+def hexbin(x, y, gridsize=40, extent=None):
+    """Tetapkan titik ke sel heksagonal (algoritma dua kisi seperti matplotlib)
+
+    Mengembalikan koordinat pusat sel untuk setiap titik.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if extent is None:
+        extent = (np.nanmin(x), np.nanmax(x), np.nanmin(y), np.nanmax(y))
+    xmin, xmax, ymin, ymax = extent
+    nx = gridsize
+    ny = max(1, int(nx / np.sqrt(3)))
+    sx = (xmax - xmin) / nx or 1.0
+    sy = (ymax - ymin) / ny or 1.0
+    ix = (x - xmin) / sx
+    iy = (y - ymin) / sy
+
+    # Kisi 1: titik bulat; kisi 2: titik bulat digeser setengah sel
+    i1, j1 = np.round(ix), np.round(iy)
+    i2, j2 = np.floor(ix) + 0.5, np.floor(iy) + 0.5
+    d1 = (ix - i1) ** 2 + 3 * (iy - j1) ** 2
+    d2 = (ix - i2) ** 2 + 3 * (iy - j2) ** 2
+    use_first = d1 <= d2
+    cx = np.where(use_first, i1, i2) * sx + xmin
+    cy = np.where(use_first, j1, j2) * sy + ymin
+    return cx, cy
+
+
+def binned_scatter(df, x, y, color=None, size=None, gridsize=40):
+    """Agregasi scatter ke sel heksagonal per kategori warna
+
+    Hasil berisi pusat sel, jumlah baris (``jumlah``) dan rata-rata kolom
+    ``size`` bila diberikan; ukurannya dibatasi jumlah sel x kategori.
+    """
+    data = df[[c for c in (x, y, color, size) if c is not None]].dropna(subset=[x, y])
+    cx, cy = hexbin(data[x], data[y], gridsize=gridsize)
+    keys = {x: cx, y: cy}
+    if color is not None:
+        keys[color] = data[color].to_numpy()
+    grouped = pd.DataFrame(keys)
+    grouped['jumlah'] = 1
+    aggs = {'jumlah': ('jumlah', 'sum')}
+    if size is not None:
+        grouped[size] = data[size].to_numpy()
+        aggs[size] = (size, 'mean')
+    return grouped.groupby(list(keys), observed=True).agg(**aggs).reset_index()
@@ -0,0 +1,136 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Lebar area konten (px) bila pemanggil tidak memberi lebar grafik sebenarnya
+CHART_WIDTH_PX = 1200
+
+# Jarak antar kolom ``st.columns`` (gap "small" = 1rem)
+COLUMN_GAP_PX = 16
+
+# Di atas jumlah titik ini trace memakai WebGL (Scattergl) alih-alih SVG
+WEBGL_POINT_THRESHOLD = 1_000
+
+
+def max_points_for_width(width_px=CHART_WIDTH_PX, points_per_pixel=2):
+    """Jumlah titik maksimum per trace untuk lebar plot tertentu"""
+    return int(width_px * points_per_pixel)
+
+
+def column_width(n_columns, page_width=CHART_WIDTH_PX, gap_px=COLUMN_GAP_PX):
+    """Lebar (px) satu kolom dari ``st.columns(n_columns)`` yang sama lebar"""
+    return max((page_width - gap_px * (n_columns - 1)) // n_columns, 1)
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb(x, y, n_out):
+    """Indeks titik terpilih dengan Largest-Triangle-Three-Buckets
+
+    Titik bucket ke-i bergantung pada titik terpilih bucket sebelumnya, jadi
+    pemilihan dihitung vektor untuk semua bucket lalu diulang hanya untuk
+    bucket yang titik acuannya berubah. Setelah putaran ke-k, k bucket
+    pertama pasti sama dengan LTTB berurutan, sehingga titik tetapnya adalah
+    hasil LTTB yang sama; pada data nyata tercapai dalam beberapa putaran.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    # Digeser ke titik pertama agar epoch nanodetik tidak menelan presisi luas
+    x = x - x[0]
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (n_out - 2)
+    bounds = (np.arange(n_out) * every).astype(np.int64) + 1
+    starts, ends = bounds[:-2], bounds[1:-1]
+    # Bucket berikutnya dari bucket i adalah [ends[i], ends[i + 1]), terakhir s.d. n
+    sizes = np.diff(np.append(ends, n))
+    avg_x = np.add.reduceat(x, ends) / sizes
+    avg_y = np.add.reduceat(y, ends) / sizes
+
+    width = np.arange((ends - starts).max())
+    candidates = starts[:, None] + width
+    padding = candidates >= ends[:, None]
+    candidates[padding] = n - 1
+
+    def pick(buckets, anchors):
+        cand = candidates[buckets]
+        xa, ya = x[anchors][:, None], y[anchors][:, None]
+        # Luas segitiga (titik terpilih sebelumnya, kandidat, rata-rata bucket berikut)
+        area = np.abs(
+            (xa - avg_x[buckets, None]) * (y[cand] - ya) -
+            (xa - x[cand]) * (avg_y[buckets, None] - ya)
+        )
+        area[padding[buckets]] = -1
+        return cand[np.arange(len(buckets)), area.argmax(axis=1)]
+
+    # Tebakan awal acuan: titik pertama bucket sebelumnya
+    anchors = np.concatenate([[0], starts[:-1]])
+    picked = pick(np.arange(len(starts)), anchors)
+    while True:
+        previous = np.concatenate([[0], picked[:-1]])
+        changed = np.flatnonzero(previous != anchors)
+        if len(changed) == 0:
+            break
+        anchors = previous
+        picked[changed] = pick(changed, anchors[changed])
+    return np.concatenate([[0], picked, [n - 1]])
+
+
+def minmax(x, y, n_out):
+    """Indeks titik terpilih dengan amplop min/max per bucket
+
+    Setiap bucket menyumbang titik minimum dan maksimumnya (urut waktu),
+    sehingga puncak dan lembah selalu terjaga. Titik pertama dan terakhir
+    selalu ikut agar rentang sumbu x tidak menyusut.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=float)
+    n_buckets = (n_out - 2) // 2
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    # Urutkan per bucket lalu nilai: awal segmen = min, akhir segmen = max
+    order = np.lexsort((y, bucket))
+    starts = edges[:-1]
+    ends = edges[1:] - 1
+    picked = np.concatenate([[0, n - 1], order[starts], order[ends]])
+    return np.unique(picked)
+
+
+METHODS = {'lttb': lttb, 'minmax': minmax}
+
+
+def downsample_frame(df, x, y, max_points=None, method='minmax'):
+    """Potong DataFrame time series menjadi paling banyak ``max_points`` baris"""
+    if max_points is None:
+        max_points = max_points_for_width()
+    data = df.dropna(subset=[y])
+    if len(data) <= max_points:
+        return data
+    idx = METHODS[method](data[x].to_numpy(), data[y].to_numpy(), max_points)
+    return data.iloc[idx]
+
+
+def render_mode(n_points):
+    """'webgl' untuk trace besar, 'svg' untuk trace kecil (argumen ``px.line``)"""
+    return 'webgl' if n_points > WEBGL_POINT_THRESHOLD else 'svg'
+
+
+def scatter_trace(df, x, y, max_points=None, method='minmax', **kwargs):
+    """``go.Scatter``/``go.Scattergl`` dari data yang sudah di-downsample"""
+    data = downsample_frame(df, x, y, max_points, method)
+    trace_cls = go.Scattergl if render_mode(len(data)) == 'webgl' else go.Scatter
+    return trace_cls(x=data[x], y=data[y], **kwargs)
+
+
+def line_frame(df, x, y, max_points=None, method='minmax'):
+    """Data dan render_mode siap pakai untuk ``px.line``"""
+    data = downsample_frame(df, x, y, max_points, method)
+    return data, render_mode(len(data))
+
@@ -0,0 +1,267 @@
+"""Ensemble Monte Carlo skenario iklim (El Nino/La Nina)
+
+Setiap realisasi menjalankan generator mock (vektor area x hari) dengan
+amplitudo dan fase osilasi iklim yang diganggu serta noise ber-seed
+sendiri. Realisasi dijalankan paralel di process pool dan langsung
+diringkas ke reducer yang dapat digabung (histogram per hari untuk
+kuantil, cacah lampauan ambang per area per hari), sehingga memori tidak
+bergantung pada jumlah realisasi::
+
+    python -m titik_panas.ensemble --realizations 200 --workers 1 2 4
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .forecast import FORECAST_AGGS
+from .generator import AREA_COORDS, PONTIANAK_AREAS, RISK_THRESHOLDS, generate_pontianak_data, synthetic_areas
+
+DEFAULT_REALIZATIONS = 200
+
+# Gangguan skenario: amplitudo osilasi ~ N(1, sd), fase ~ U(-x, x) hari
+ENSO_AMPLITUDE_SD = 0.35
+ENSO_PHASE_DAYS = 180
+
+# Kuantil pita ketidakpastian (pita 80% + median)
+QUANTILES = [0.1, 0.5, 0.9]
+
+# Histogram kuantil: jumlah bin dan batas atas relatif terhadap realisasi dasar
+HIST_BINS = 128
+HIST_HEADROOM = 2.5
+
+# P(risiko >= "Tinggi"): skor di atas batas bawah tingkat Tinggi
+EXCEEDANCE_THRESHOLD = RISK_THRESHOLDS[1]
+
+# Beberapa chunk per worker agar beban tetap seimbang
+CHUNKS_PER_WORKER = 4
+
+
+class HistogramReducer:
+    """Histogram bin tetap per sel yang dapat digabung (jumlah cacah)
+
+    Nilai di luar ``edges`` dimasukkan ke bin tepi, sehingga kuantil ekstrem
+    terpotong pada rentang histogram.
+    """
+
+    def __init__(self, edges, shape):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(tuple(shape) + (len(self.edges) - 1,), dtype=np.int64)
+
+    def add(self, values):
+        n_bins = self.counts.shape[-1]
+        bins = np.clip(np.searchsorted(self.edges, values, side='right') - 1, 0, n_bins - 1)
+        cells = np.arange(values.size).reshape(values.shape)
+        self.counts += np.bincount(
+            (cells * n_bins + bins).ravel(), minlength=self.counts.size
+        ).reshape(self.counts.shape)
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    def quantile(self, q):
+        """Kuantil ``q`` per sel, interpolasi linear di dalam bin"""
+        cum = np.cumsum(self.counts, axis=-1)
+        total = cum[..., -1:]
+        target = q * total
+        k = (cum < target).sum(axis=-1, keepdims=True).clip(max=self.counts.shape[-1] - 1)
+        before = np.take_along_axis(cum, k, axis=-1) - np.take_along_axis(self.counts, k, axis=-1)
+        inside = np.take_along_axis(self.counts, k, axis=-1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frac = np.where(inside > 0, (target - before) / inside, 0.0)
+        lo, hi = self.edges[k], self.edges[k + 1]
+        return np.where(total > 0, lo + frac * (hi - lo), np.nan)[..., 0]
+
+
+class ExceedanceReducer:
+    """Cacah realisasi yang melewati ``threshold`` per sel (dapat digabung)"""
+
+    def __init__(self, threshold, shape):
+        self.threshold = threshold
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.n = 0
+
+    def add(self, values):
+        self.counts += values > self.threshold
+        self.n += 1
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.n += other.n
+        return self
+
+    def probability(self):
+        return self.counts / max(self.n, 1)
+
+
+class EnsembleSpec:
+    """Sumbu dan parameter ensemble (dikirim ke setiap worker)"""
+
+    def __init__(self, areas, area_coords, start, end, aggs=FORECAST_AGGS):
+        self.areas = list(areas)
+        # Koordinat hanya ikut ke kolom keluaran generator
+        self.area_coords = {a: area_coords.get(a, {'lat': np.nan, 'lon': np.nan}) for a in self.areas}
+        # Generator menghasilkan ``days`` hari sebelum ``end`` + 7 hari sesudahnya
+        self.end = pd.Timestamp(end).normalize()
+        self.days = max(0, (self.end - pd.Timestamp(start).normalize()).days)
+        self.aggs = dict(aggs)
+
+    @property
+    def dates(self):
+        return pd.date_range(self.end - pd.Timedelta(days=self.days), self.end + pd.Timedelta(days=7), freq='D')
+
+    def realize(self, seed, perturb=True):
+        """Satu realisasi: {kolom: array (hari, area)}"""
+        rng = np.random.default_rng(seed)
+        amplitude, phase = 1.0, 0.0
+        if perturb:
+            amplitude = max(0.0, rng.normal(1.0, ENSO_AMPLITUDE_SD))
+            phase = rng.uniform(-ENSO_PHASE_DAYS, ENSO_PHASE_DAYS)
+        df = generate_pontianak_data(
+            self.days, rng=rng, areas=self.areas, area_coords=self.area_coords, end=self.end,
+            enso_amplitude=amplitude, enso_phase=phase
+        )
+        # Baris berurutan tanggal lalu area
+        shape = (len(df) // len(self.areas), len(self.areas))
+        return {col: df[col].to_numpy(dtype=float).reshape(shape) for col in self.aggs}
+
+    def aggregate(self, values):
+        """Seri harian lintas area sesuai ``aggs`` (sum/mean)"""
+        return {
+            col: values[col].sum(axis=1) if how == 'sum' else values[col].mean(axis=1)
+            for col, how in self.aggs.items()
+        }
+
+
+class EnsembleReducer:
+    """Ringkasan ensemble yang dapat digabung antar worker
+
+    Untuk setiap kolom di ``spec.aggs`` disimpan histogram agregat harian
+    lintas area; untuk skor risiko per area disimpan cacah realisasi di atas
+    ``EXCEEDANCE_THRESHOLD``.
+    """
+
+    def __init__(self, spec, edges):
+        self.spec = spec
+        n_days = len(spec.dates)
+        self.histograms = {col: HistogramReducer(edges[col], (n_days,)) for col in spec.aggs}
+        self.exceedance = ExceedanceReducer(EXCEEDANCE_THRESHOLD, (len(spec.areas), n_days))
+
+    @property
+    def n(self):
+        return self.exceedance.n
+
+    def add(self, values):
+        for col, series in self.spec.aggregate(values).items():
+            self.histograms[col].add(series)
+        self.exceedance.add(values['skor_risiko'].T)
+
+    def merge(self, other):
+        for col, hist in self.histograms.items():
+            hist.merge(other.histograms[col])
+        self.exceedance.merge(other.exceedance)
+        return self
+
+    def bands(self, quantiles=QUANTILES):
+        """DataFrame ``tanggal`` + ``<kolom>_p10`` dst. per kuantil"""
+        out = {'tanggal': self.spec.dates}
+        for col, hist in self.histograms.items():
+            for q in quantiles:
+                out[f'{col}_p{round(q * 100)}'] = hist.quantile(q)
+        return pd.DataFrame(out)
+
+    def exceedance_probability(self):
+        """P(skor risiko > ambang Tinggi) per area (baris) per tanggal (kolom)"""
+        return pd.DataFrame(
+            self.exceedance.probability(),
+            index=pd.Index(self.spec.areas, name='area'),
+            columns=self.spec.dates
+        )
+
+
+def histogram_edges(spec, seed=None, bins=HIST_BINS):
+    """Bin histogram bersama semua worker, dari realisasi tanpa gangguan"""
+    base = spec.aggregate(spec.realize(seed, perturb=False))
+    return {col: np.linspace(0.0, HIST_HEADROOM * max(float(np.nanmax(series)), 1.0), bins + 1)
+            for col, series in base.items()}
+
+
+def _run_chunk(spec, edges, seeds):
+    """Worker: jalankan realisasi ``seeds`` dan kembalikan reducer parsialnya"""
+    reducer = EnsembleReducer(spec, edges)
+    for seed in seeds:
+        reducer.add(spec.realize(seed))
+    return reducer
+
+
+def open_pool(workers=None):
+    """Process pool untuk ensemble; simpan dan pakai ulang agar biaya start proses tidak berulang"""
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    # spawn: aman dipakai dari proses ber-thread (mis. server Streamlit)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def run_ensemble(spec, n=DEFAULT_REALIZATIONS, seed=0, pool=None, workers=None):
+    """Jalankan ``n`` realisasi ber-seed; kembalikan ``EnsembleReducer``
+
+    Dengan ``pool`` (lihat ``open_pool``) realisasi dibagi ke
+    ``CHUNKS_PER_WORKER`` chunk per worker; ``workers`` adalah jumlah worker
+    yang dipakai saat membuka pool (bawaan: jumlah CPU, sama dengan
+    ``open_pool``). Tanpa pool dijalankan di proses ini. Seed setiap
+    realisasi diturunkan dari ``seed`` (``SeedSequence.spawn``), sehingga
+    hasil tidak bergantung pada jumlah worker.
+    """
+    root = np.random.SeedSequence(seed)
+    edges = histogram_edges(spec, root.spawn(1)[0])
+    seeds = root.spawn(n)
+    if pool is None:
+        return _run_chunk(spec, edges, seeds)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    chunks = np.array_split(np.arange(n), workers * CHUNKS_PER_WORKER)
+    chunks = [[seeds[i] for i in chunk] for chunk in chunks if len(chunk)]
+    reducer = EnsembleReducer(spec, edges)
+    # Hanya reducer parsial (bukan realisasi) yang dikirim balik dari worker
+    for part in pool.map(_run_chunk, [spec] * len(chunks), [edges] * len(chunks), chunks):
+        reducer.merge(part)
+    return reducer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput ensemble skenario iklim per jumlah worker")
+    parser.add_argument('--realizations', type=int, default=DEFAULT_REALIZATIONS)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--areas', type=int, default=0,
+                        help="Jumlah area sintetis (0: 6 kecamatan Pontianak)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    areas, coords = synthetic_areas(args.areas, rng=args.seed) if args.areas else (PONTIANAK_AREAS, AREA_COORDS)
+    end = pd.Timestamp.now().normalize()
+    spec = EnsembleSpec(areas, coords, end - pd.Timedelta(days=args.days), end)
+    base = None
+    for workers in args.workers:
+        pool = open_pool(workers) if workers > 1 else None
+        if pool is not None:
+            # Pemanasan: start proses tidak ikut diukur
+            run_ensemble(spec, workers, args.seed, pool, workers)
+        started = time.perf_counter()
+        result = run_ensemble(spec, args.realizations, args.seed, pool, workers)
+        elapsed = time.perf_counter() - started
+        if pool is not None:
+            pool.shutdown()
+        base = base or elapsed
+        print(f"{workers:>3} worker: {elapsed:7.2f} s, {result.n / elapsed:8.1f} realisasi/s, "
+              f"speedup {base / elapsed:.2f}x")
+    print(result.bands().set_index('tanggal').tail(8).round(1).to_string())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
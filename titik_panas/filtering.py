@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+from .generator import RISK_LEVELS
+
+SEASONS = ['Hujan', 'Kemarau']
+
+ONE_DAY = np.int64(86_400_000_000_000)
+
+
+class FilterSegment:
+    """Satu potongan data terurut (area, tanggal) dengan kunci gabungan
+
+    Setiap baris punya kunci ``kode_area * n_hari + nomor_hari`` yang
+    terurut, sehingga rentang tanggal untuk semua area terpilih diselesaikan
+    dengan satu ``searchsorted`` vektor dan tidak ada pembuatan objek
+    ``date`` per baris. Kode area memakai daftar area ``FilterIndex``.
+    """
+
+    def __init__(self, df, areas):
+        # Salinan dangkal: kolom hanya disalin bila diubah (copy-on-write)
+        frame = df.copy(deep=False)
+        frame['area'] = pd.Categorical(frame['area'], categories=areas)
+        frame['musim'] = pd.Categorical(frame['musim'], categories=SEASONS)
+        frame['tingkat_risiko'] = pd.Categorical(frame['tingkat_risiko'], categories=RISK_LEVELS)
+
+        tanggal = frame['tanggal'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        self._day0 = tanggal.min() // ONE_DAY if len(frame) else 0
+        day_number = tanggal // ONE_DAY - self._day0
+        self._n_days = int(day_number.max()) + 2 if len(frame) else 1
+        key = frame['area'].cat.codes.to_numpy(np.int64) * self._n_days + day_number
+        # Urutan stabil (area, hari); gabungan dua segmen hanya berisi dua
+        # run terurut sehingga timsort mendekati linear
+        if (np.diff(key) >= 0).all():
+            # Sudah terurut (mis. view dataset bersama): tanpa salinan baris
+            self.frame = frame.reset_index(drop=True)
+            self._key = key
+        else:
+            order = np.argsort(key, kind='stable')
+            self.frame = frame.take(order).reset_index(drop=True)
+            self._key = key[order]
+        self._season_codes = self.frame['musim'].cat.codes.to_numpy()
+        self.min_date = pd.Timestamp(tanggal.min()) if len(frame) else pd.NaT
+        self.max_date = pd.Timestamp(tanggal.max()) if len(frame) else pd.NaT
+
+    def __len__(self):
+        return len(self.frame)
+
+    def with_frame(self, frame):
+        """Segmen yang sama di atas ``frame`` berisi baris identik (mis. view Arrow bersama)"""
+        segment = object.__new__(FilterSegment)
+        segment.__dict__.update(self.__dict__)
+        segment.frame = frame
+        segment._season_codes = frame['musim'].cat.codes.to_numpy()
+        return segment
+
+    def _day_number(self, value, shift=0):
+        """Nomor hari relatif terhadap hari pertama, dipotong ke rentang kunci
+
+        ``_n_days`` menyisakan satu hari kosong setelah data sehingga batas
+        yang dipotong tidak pernah menyeberang ke blok area berikutnya.
+        """
+        day = pd.Timestamp(value).normalize().value // ONE_DAY - self._day0 + shift
+        return int(np.clip(day, 0, self._n_days - 1))
+
+    def ranges(self, codes, start=None, end=None):
+        """Rentang posisi [lo, hi) per kode area untuk rentang tanggal"""
+        first = self._day_number(start) if start is not None else 0
+        # Tanggal akhir inklusif: batas atas adalah awal hari berikutnya
+        last = self._day_number(end, 1) if end is not None else self._n_days - 1
+        lo = np.searchsorted(self._key, codes * self._n_days + first, side='left')
+        hi = np.searchsorted(self._key, codes * self._n_days + last, side='left')
+        return lo, np.maximum(lo, hi)
+
+    def positions(self, codes, start=None, end=None, season=None):
+        """Posisi baris (terurut) yang lolos filter"""
+        lo, hi = self.ranges(codes, start, end)
+        lengths = hi - lo
+        total = int(lengths.sum())
+        # Gabungkan rentang tanpa loop Python: arange + offset per rentang
+        offsets = np.repeat(lo - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        positions = np.arange(total, dtype=np.int64) + offsets
+        if season is not None:
+            positions = positions[self._season_codes[positions] == SEASONS.index(season)]
+        return positions
+
+    def select(self, codes, start=None, end=None, season=None):
+        """DataFrame terfilter; berupa view (slice) bila hasilnya satu rentang kontigu"""
+        lo, hi = self.ranges(codes, start, end)
+        nonempty = hi > lo
+        if season is None:
+            if not nonempty.any():
+                return self.frame.iloc[0:0]
+            lo, hi = lo[nonempty], hi[nonempty]
+            # Area berurutan dengan rentang bersambung membentuk satu slice
+            if len(lo) == 1 or (lo[1:] == hi[:-1]).all():
+                return self.frame.iloc[lo[0]:hi[-1]]
+        return self.frame.take(self.positions(codes, start, end, season))
+
+
+class FilterIndex:
+    """Mesin filter terindeks untuk filter sidebar
+
+    Data disimpan sebagai beberapa ``FilterSegment`` terurut (area, tanggal)
+    dengan kode kategorikal bersama untuk area, musim dan tingkat risiko.
+    ``append`` menambah segmen baru berisi baris baru saja; segmen terakhir
+    digabung bila ukurannya tidak lagi jauh di bawah segmen sebelumnya,
+    sehingga jumlah segmen tetap logaritmik dan setiap baris hanya diurutkan
+    ulang O(log n) kali sepanjang umurnya, bukan pada setiap append.
+    """
+
+    def __init__(self, df=None, segments=None, areas=None):
+        if segments is None:
+            areas = list(pd.unique(df['area']))
+            segments = [FilterSegment(df, areas)]
+        self.areas = list(areas)
+        self._area_codes = {a: i for i, a in enumerate(self.areas)}
+        self.segments = list(segments)
+
+    @property
+    def frames(self):
+        return [segment.frame for segment in self.segments]
+
+    def __len__(self):
+        return sum(len(segment) for segment in self.segments)
+
+    def append(self, df):
+        """Indeks baru berisi baris lama ditambah ``df`` (indeks lama tidak diubah)"""
+        if len(df) == 0:
+            return self
+        if not set(pd.unique(df['area'])) <= self._area_codes.keys():
+            # Area baru mengubah kode kategorikal: bangun ulang sekali
+            return FilterIndex(pd.concat(self.frames + [df], ignore_index=True))
+        segments = self.segments + [FilterSegment(df, self.areas)]
+        while len(segments) > 1 and len(segments[-2]) <= 2 * len(segments[-1]):
+            last = segments.pop()
+            segments[-1] = FilterSegment(pd.concat([segments[-1].frame, last.frame], ignore_index=True), self.areas)
+        return FilterIndex(segments=segments, areas=self.areas)
+
+    def with_frames(self, frames):
+        """Indeks yang sama di atas ``frames`` (satu per segmen, baris identik)"""
+        segments = [segment if frame is segment.frame else segment.with_frame(frame)
+                    for segment, frame in zip(self.segments, frames)]
+        return FilterIndex(segments=segments, areas=self.areas)
+
+    @property
+    def min_date(self):
+        return min(segment.min_date for segment in self.segments)
+
+    @property
+    def max_date(self):
+        return max(segment.max_date for segment in self.segments)
+
+    def _codes(self, areas=None):
+        if areas is None:
+            return np.arange(len(self.areas), dtype=np.int64)
+        return np.array(sorted(self._area_codes[a] for a in areas if a in self._area_codes), dtype=np.int64)
+
+    def select(self, areas=None, start=None, end=None, season=None):
+        """DataFrame terfilter terurut (area, tanggal); view bila cukup satu segmen"""
+        if season == 'Semua':
+            season = None
+        codes = self._codes(areas)
+        parts = [segment.select(codes, start, end, season) for segment in self.segments]
+        nonempty = [part for part in parts if len(part)]
+        if len(nonempty) <= 1:
+            return nonempty[0] if nonempty else parts[0]
+        frame = pd.concat(nonempty, ignore_index=True)
+        order = np.lexsort((frame['tanggal'].to_numpy(), frame['area'].cat.codes.to_numpy()))
+        return frame.take(order).reset_index(drop=True)
@@ -0,0 +1,218 @@
+import numpy as np
+import pandas as pd
+
+from .generator import DRY_MONTHS
+
+FORECAST_TARGETS = ['titik_panas', 'curah_hujan', 'skor_risiko']
+
+# Agregasi lintas area, sama dengan agregasi harian tab trend
+FORECAST_AGGS = {'titik_panas': 'sum', 'curah_hujan': 'mean', 'skor_risiko': 'mean'}
+
+# Grid parameter pemulusan (alpha: level, beta: trend) dan redaman trend
+ALPHAS = [0.1, 0.3, 0.5, 0.7, 0.9]
+BETAS = [0.0, 0.1, 0.3]
+PHI = 0.9
+
+# Galat satu langkah awal belum dihitung dalam SSE (level belum stabil)
+WARMUP_DAYS = 3
+
+# Kuantil normal untuk pita prakiraan 80%
+BAND_Z = 1.2816
+
+# Sumbu area pada array state berbentuk (kombinasi, area)
+AREA_AXIS = {'level': 1, 'trend': 1, 'sse': 1}
+
+
+class ForecastEngine:
+    """Prakiraan per area dengan pemulusan eksponensial musiman (batch)
+
+    Setiap target dimodelkan sebagai rata-rata musim (kovariat kemarau/hujan,
+    diketahui dari kalender) ditambah level dan trend teredam (Holt) pada
+    sisa deseasonalized. Semua kombinasi parameter di grid dijalankan
+    bersamaan dengan bentuk (kombinasi, area); parameter terbaik per area
+    adalah SSE galat satu langkah terkecil. Karena SSE juga diperbarui per
+    hari, ``update`` dengan hari baru sekaligus memperbarui fit tanpa refit
+    dari awal, dan ``forecast`` hanya membaca state.
+    """
+
+    def __init__(self, targets=FORECAST_TARGETS, alphas=ALPHAS, betas=BETAS, phi=PHI):
+        self.targets = list(targets)
+        grid = np.array([(a, b) for a in alphas for b in betas], dtype=float)
+        self.alpha = grid[:, 0]
+        self.beta = grid[:, 1]
+        self.phi = phi
+        self.areas = []
+        self.last_date = None
+        self._state = {t: self._empty_state(0) for t in self.targets}
+
+    def _empty_state(self, n_areas):
+        n_grid = len(self.alpha)
+        return {
+            'level': np.zeros((n_grid, n_areas)),
+            'trend': np.zeros((n_grid, n_areas)),
+            'sse': np.zeros((n_grid, n_areas)),
+            'n_err': np.zeros(n_areas),
+            'n_obs': np.zeros(n_areas),
+            # Jumlah dan cacah per musim: kolom 0 = hujan, 1 = kemarau
+            'season_sum': np.zeros((n_areas, 2)),
+            'season_cnt': np.zeros((n_areas, 2))
+        }
+
+    def add_areas(self, areas):
+        """Tambahkan area baru dengan state kosong"""
+        new = [a for a in areas if a not in set(self.areas)]
+        if not new:
+            return
+        self.areas.extend(new)
+        extra = self._empty_state(len(new))
+        for state in self._state.values():
+            for key, values in state.items():
+                state[key] = np.concatenate([values, extra[key]], axis=AREA_AXIS.get(key, 0))
+
+    def _season_offset(self, state, is_dry):
+        """Selisih rata-rata musim terhadap rata-rata keseluruhan per area"""
+        season = int(is_dry)
+        total_cnt = state['season_cnt'].sum(axis=1)
+        cnt = state['season_cnt'][:, season]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            offset = state['season_sum'][:, season] / cnt - state['season_sum'].sum(axis=1) / total_cnt
+        return np.where(cnt > 0, offset, 0.0)
+
+    def _step(self, state, y, is_dry):
+        """Satu hari rekurensi untuk satu target; ``y`` berbentuk (area,)"""
+        valid = ~np.isnan(y)
+        x = y - self._season_offset(state, is_dry)
+        first = valid & (state['n_obs'] == 0)
+        update = valid & (state['n_obs'] > 0)
+        scored = update & (state['n_obs'] >= WARMUP_DAYS)
+
+        level, trend = state['level'], state['trend']
+        pred = level + self.phi * trend
+        error = np.where(update, x - pred, 0.0)
+        state['level'] = np.where(first, x, pred + self.alpha[:, None] * error)
+        state['trend'] = np.where(
+            first, 0.0, self.phi * trend + (self.alpha * self.beta)[:, None] * error
+        )
+        state['sse'] += np.where(scored, error ** 2, 0.0)
+        state['n_err'] += scored
+
+        season = int(is_dry)
+        state['season_sum'][:, season] += np.where(valid, y, 0.0)
+        state['season_cnt'][:, season] += valid
+        state['n_obs'] += valid
+
+    def update(self, dates, areas, values):
+        """Perbarui state dengan nilai harian per area
+
+        ``values`` berisi array (hari, area) per target untuk ``dates``
+        berurutan. Hanya hari setelah ``last_date`` yang diproses; hari yang
+        terlewat dijalankan sebagai hari tanpa observasi.
+        """
+        dates = pd.DatetimeIndex(dates).normalize()
+        keep = np.ones(len(dates), dtype=bool) if self.last_date is None else dates > self.last_date
+        if not keep.any():
+            return self
+        self.add_areas(areas)
+        area_pos = {a: i for i, a in enumerate(self.areas)}
+        area_idx = np.array([area_pos[a] for a in areas], dtype=np.int64)
+
+        first = dates[keep][0] if self.last_date is None else self.last_date + pd.Timedelta(days=1)
+        days = pd.date_range(first, dates[keep][-1], freq='D')
+        day_idx = (dates[keep] - first).days
+        is_dry = np.isin(days.month, DRY_MONTHS)
+
+        for target in self.targets:
+            grid = np.full((len(days), len(self.areas)), np.nan)
+            grid[np.ix_(day_idx, area_idx)] = np.asarray(values[target], dtype=float)[keep]
+            state = self._state[target]
+            for d in range(len(days)):
+                self._step(state, grid[d], is_dry[d])
+        self.last_date = days[-1]
+        return self
+
+    def update_from_cube(self, cube, until=None):
+        """Perbarui state dari rata-rata harian per area di ``RollupCube``
+
+        Rata-rata hanya dihitung untuk hari setelah ``last_date``, sehingga
+        biaya per ingest sebanding jumlah hari baru. ``until`` (hari observasi
+        terakhir, lihat ``DataSource.observed_until``) mengecualikan baris
+        setelahnya, mis. hari prakiraan sintetis sumber mock, agar prakiraan
+        dimulai sehari setelah observasi terakhir.
+        """
+        first = 0 if self.last_date is None else cube.dates.searchsorted(self.last_date, side='right')
+        last = len(cube.dates) if until is None else cube.dates.searchsorted(pd.Timestamp(until), side='right')
+        days = slice(first, max(first, last))
+        values = {t: cube.area_daily_means(t, days).T for t in self.targets}
+        return self.update(cube.dates[days], cube.areas, values)
+
+    def _best(self, state):
+        """Indeks kombinasi parameter terbaik per area"""
+        best = state['sse'].argmin(axis=0)
+        # Tanpa galat tercatat: pakai kombinasi tengah grid
+        return np.where(state['n_err'] > 0, best, len(self.alpha) // 2)
+
+    def params(self):
+        """Parameter terpilih dan RMSE satu langkah per area dan target"""
+        rows = []
+        for target in self.targets:
+            state = self._state[target]
+            best = self._best(state)
+            cols = np.arange(len(self.areas))
+            rmse = np.sqrt(state['sse'][best, cols] / np.maximum(state['n_err'], 1))
+            rows.append(pd.DataFrame({
+                'area': self.areas,
+                'variabel': target,
+                'alpha': self.alpha[best],
+                'beta': self.beta[best],
+                'rmse': rmse
+            }))
+        return pd.concat(rows, ignore_index=True)
+
+    def forecast(self, horizon=7, areas=None, aggs=None):
+        """Prakiraan ``horizon`` hari setelah ``last_date`` dengan pita 80%
+
+        Prakiraan per area digabung sesuai ``aggs`` (sum/mean) untuk area
+        terpilih; varians digabung dengan asumsi galat antar area independen.
+        Mengembalikan DataFrame ``tanggal`` + ``<target>``, ``<target>_bawah``,
+        ``<target>_atas``; kosong (dengan kolom yang sama) bila engine belum
+        menerima data.
+        """
+        if aggs is None:
+            aggs = FORECAST_AGGS
+        if self.last_date is None:
+            columns = ['tanggal'] + [f'{t}{suffix}' for t in self.targets for suffix in ('', '_bawah', '_atas')]
+            return pd.DataFrame({col: pd.Series(dtype='datetime64[ns]' if col == 'tanggal' else float)
+                                 for col in columns})
+        dates = pd.date_range(self.last_date + pd.Timedelta(days=1), periods=horizon, freq='D')
+        if areas is None:
+            cols = np.arange(len(self.areas))
+        else:
+            area_pos = {a: i for i, a in enumerate(self.areas)}
+            cols = np.array([area_pos[a] for a in areas if a in area_pos], dtype=np.int64)
+        result = pd.DataFrame({'tanggal': dates})
+        steps = np.arange(1, horizon + 1)
+        damping = np.cumsum(self.phi ** steps)
+
+        for target in self.targets:
+            state = self._state[target]
+            best = self._best(state)[cols]
+            level = state['level'][best, cols]
+            trend = state['trend'][best, cols]
+            alpha = self.alpha[best]
+            sigma2 = state['sse'][best, cols] / np.maximum(state['n_err'][cols], 1)
+
+            offsets = {flag: self._season_offset(state, flag)[cols] for flag in (False, True)}
+            season = np.stack([offsets[flag] for flag in np.isin(dates.month, DRY_MONTHS)])
+            mean = level + damping[:, None] * trend + season
+            var = sigma2 * (1 + (steps[:, None] - 1) * alpha ** 2)
+
+            if aggs.get(target, 'mean') == 'sum':
+                total, total_var = mean.sum(axis=1), var.sum(axis=1)
+            else:
+                n = max(len(cols), 1)
+                total, total_var = mean.sum(axis=1) / n, var.sum(axis=1) / n ** 2
+            spread = BAND_Z * np.sqrt(total_var)
+            result[target] = np.maximum(total, 0)
+            result[f'{target}_bawah'] = np.maximum(total - spread, 0)
+            result[f'{target}_atas'] = np.maximum(total + spread, 0)
+        return result
@@ -0,0 +1,241 @@
+import numpy as np
+import pandas as pd
+
+# Nilai awal standar sistem FWI Kanada (Van Wagner 1987)
+FFMC_START = 85.0
+DMC_START = 6.0
+DC_START = 15.0
+
+# Faktor panjang hari untuk lintang khatulistiwa (Lawson & Armitage 2008):
+# konstan sepanjang tahun untuk DMC dan DC
+DMC_DAY_LENGTH = 9.0
+DC_DAY_LENGTH = 1.4
+
+FWI_COLUMNS = ['ffmc', 'dmc', 'dc', 'isi', 'bui', 'fwi']
+
+# Nilai pengganti bila data cuaca harian hilang
+DEFAULT_WEATHER = {'temp': 27.0, 'rh': 80.0, 'wind': 0.0, 'rain': 0.0}
+
+
+def next_ffmc(ffmc, temp, rh, wind, rain):
+    """Fine Fuel Moisture Code hari ini dari nilai kemarin (vektor)"""
+    mo = 147.2 * (101 - ffmc) / (59.5 + ffmc)
+
+    wet = rain > 0.5
+    rf = np.where(wet, rain - 0.5, 1.0)
+    gain = 42.5 * rf * np.exp(-100 / (251 - mo)) * (1 - np.exp(-6.93 / rf))
+    gain = np.where(mo > 150, gain + 0.0015 * (mo - 150) ** 2 * np.sqrt(rf), gain)
+    mo = np.where(wet, np.minimum(mo + gain, 250), mo)
+
+    ed = 0.942 * rh ** 0.679 + 11 * np.exp((rh - 100) / 10) + 0.18 * (21.1 - temp) * (1 - np.exp(-0.115 * rh))
+    ew = 0.618 * rh ** 0.753 + 10 * np.exp((rh - 100) / 10) + 0.18 * (21.1 - temp) * (1 - np.exp(-0.115 * rh))
+
+    # Pengeringan (mo > ed)
+    ko = 0.424 * (1 - (rh / 100) ** 1.7) + 0.0694 * np.sqrt(wind) * (1 - (rh / 100) ** 8)
+    kd = ko * 0.581 * np.exp(0.0365 * temp)
+    m_dry = ed + (mo - ed) * 10 ** (-kd)
+    # Pembasahan (mo < ew)
+    k1 = 0.424 * (1 - ((100 - rh) / 100) ** 1.7) + 0.0694 * np.sqrt(wind) * (1 - ((100 - rh) / 100) ** 8)
+    kw = k1 * 0.581 * np.exp(0.0365 * temp)
+    m_wet = ew - (ew - mo) * 10 ** (-kw)
+
+    m = np.where(mo > ed, m_dry, np.where(mo < ew, m_wet, mo))
+    return np.clip(59.5 * (250 - m) / (147.2 + m), 0, 101)
+
+
+def next_dmc(dmc, temp, rh, rain, day_length=DMC_DAY_LENGTH):
+    """Duff Moisture Code hari ini dari nilai kemarin (vektor)"""
+    temp = np.maximum(temp, -1.1)
+    rk = 1.894 * (temp + 1.1) * (100 - rh) * day_length * 1e-4
+
+    wet = rain > 1.5
+    re = 0.92 * rain - 1.27
+    mo = 20 + np.exp(5.6348 - dmc / 43.43)
+    with np.errstate(divide='ignore'):
+        log_dmc = np.log(np.maximum(dmc, 1e-12))
+    b = np.where(
+        dmc <= 33, 100 / (0.5 + 0.3 * dmc),
+        np.where(dmc <= 65, 14 - 1.3 * log_dmc, 6.2 * log_dmc - 17.2)
+    )
+    mr = mo + 1000 * re / (48.77 + b * re)
+    pr = np.where(wet, np.maximum(244.72 - 43.43 * np.log(np.maximum(mr - 20, 1e-12)), 0), dmc)
+    return np.maximum(pr + rk, 0)
+
+
+def next_dc(dc, temp, rain, day_length=DC_DAY_LENGTH):
+    """Drought Code hari ini dari nilai kemarin (vektor)"""
+    temp = np.maximum(temp, -2.8)
+    pe = np.maximum((0.36 * (temp + 2.8) + day_length) / 2, 0)
+
+    wet = rain > 2.8
+    rd = 0.83 * rain - 1.27
+    qr = 800 * np.exp(-dc / 400) + 3.937 * rd
+    dr = np.where(wet, np.maximum(400 * np.log(800 / np.maximum(qr, 1e-12)), 0), dc)
+    return dr + pe
+
+
+def initial_spread_index(ffmc, wind):
+    """Initial Spread Index dari FFMC dan angin (km/jam)"""
+    m = 147.2 * (101 - ffmc) / (59.5 + ffmc)
+    ff = 91.9 * np.exp(-0.1386 * m) * (1 + m ** 5.31 / 4.93e7)
+    return 0.208 * np.exp(0.05039 * wind) * ff
+
+
+def buildup_index(dmc, dc):
+    """Buildup Index dari DMC dan DC"""
+    total = dmc + 0.4 * dc
+    with np.errstate(invalid='ignore', divide='ignore'):
+        low = np.where(total > 0, 0.8 * dmc * dc / total, 0)
+        high = dmc - (1 - 0.8 * dc / total) * (0.92 + (0.0114 * dmc) ** 1.7)
+    return np.maximum(np.where(dmc <= 0.4 * dc, low, high), 0)
+
+
+def fire_weather_index(isi, bui):
+    """Fire Weather Index dari ISI dan BUI"""
+    fd = np.where(bui <= 80, 0.626 * bui ** 0.809 + 2, 1000 / (25 + 108.64 * np.exp(-0.023 * bui)))
+    b = 0.1 * isi * fd
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.exp(2.72 * (0.434 * np.log(np.maximum(b, 1e-12))) ** 0.647)
+    return np.where(b > 1, s, b)
+
+
+class FireWeatherEngine:
+    """Mesin indeks cuaca kebakaran (FFMC/DMC/DC/ISI/BUI/FWI) lintas area
+
+    Rekurensi dijalankan berurutan per hari dan vektor untuk semua area
+    sekaligus. State (kode kemarin per area dan tanggal terakhir) disimpan,
+    sehingga penambahan satu hari hanya berbiaya O(jumlah area).
+    """
+
+    def __init__(self, areas=(), ffmc=None, dmc=None, dc=None, last_date=None):
+        self.areas = list(areas)
+        n = len(self.areas)
+        self.ffmc = np.full(n, FFMC_START) if ffmc is None else np.asarray(ffmc, dtype=float)
+        self.dmc = np.full(n, DMC_START) if dmc is None else np.asarray(dmc, dtype=float)
+        self.dc = np.full(n, DC_START) if dc is None else np.asarray(dc, dtype=float)
+        self.last_date = None if last_date is None else pd.Timestamp(last_date).normalize()
+
+    def add_areas(self, areas):
+        """Tambahkan area baru dengan nilai awal standar"""
+        new = [a for a in areas if a not in set(self.areas)]
+        if new:
+            self.areas.extend(new)
+            self.ffmc = np.concatenate([self.ffmc, np.full(len(new), FFMC_START)])
+            self.dmc = np.concatenate([self.dmc, np.full(len(new), DMC_START)])
+            self.dc = np.concatenate([self.dc, np.full(len(new), DC_START)])
+
+    def step(self, temp, rh, wind, rain):
+        """Majukan state satu hari; input berupa array per area (urut ``self.areas``)
+
+        ``wind`` dalam km/jam dan ``rain`` dalam mm/24 jam.
+        """
+        temp = np.asarray(temp, dtype=float)
+        rh = np.clip(np.asarray(rh, dtype=float), 0, 100)
+        wind = np.maximum(np.asarray(wind, dtype=float), 0)
+        rain = np.maximum(np.asarray(rain, dtype=float), 0)
+
+        self.ffmc = next_ffmc(self.ffmc, temp, rh, wind, rain)
+        self.dmc = next_dmc(self.dmc, temp, rh, rain)
+        self.dc = next_dc(self.dc, temp, rain)
+        isi = initial_spread_index(self.ffmc, wind)
+        bui = buildup_index(self.dmc, self.dc)
+        return {
+            'ffmc': self.ffmc,
+            'dmc': self.dmc,
+            'dc': self.dc,
+            'isi': isi,
+            'bui': bui,
+            'fwi': fire_weather_index(isi, bui)
+        }
+
+    def run(self, temp, rh, wind, rain):
+        """Jalankan rekurensi untuk array (hari, area); kembalikan kode (hari, area)"""
+        n_days = len(temp)
+        out = {col: np.empty((n_days, len(self.areas))) for col in FWI_COLUMNS}
+        for d in range(n_days):
+            codes = self.step(temp[d], rh[d], wind[d], rain[d])
+            for col in FWI_COLUMNS:
+                out[col][d] = codes[col]
+        return out
+
+    def run_grid(self, dates, areas, temp, rh, wind, rain):
+        """Jalankan rekurensi untuk grid (hari, area) dengan kolom ``areas``
+
+        ``dates`` harus harian berurutan dan setelah ``last_date``. Area di
+        state yang tidak ada di grid dimajukan dengan cuaca default.
+        """
+        self.add_areas(areas)
+        area_pos = {a: i for i, a in enumerate(self.areas)}
+        pos = np.array([area_pos[a] for a in areas], dtype=np.int64)
+
+        def full(values, default):
+            if len(pos) == len(self.areas) and (pos == np.arange(len(pos))).all():
+                return values
+            grid = np.full((len(values), len(self.areas)), default, dtype=float)
+            grid[:, pos] = values
+            return grid
+
+        codes = self.run(
+            full(temp, DEFAULT_WEATHER['temp']),
+            full(rh, DEFAULT_WEATHER['rh']),
+            full(wind, DEFAULT_WEATHER['wind']),
+            full(rain, DEFAULT_WEATHER['rain'])
+        )
+        self.last_date = pd.Timestamp(dates[-1]).normalize()
+        return {col: values[:, pos] for col, values in codes.items()}
+
+    def run_frame(self, df, rain_scale=1.0):
+        """Hitung kode FWI untuk DataFrame berskema dashboard
+
+        Hanya hari setelah ``last_date`` yang diproses (lanjutan inkremental).
+        Hari yang hilang diisi cuaca default agar rekurensi tetap harian.
+        Mengembalikan DataFrame (tanggal, area, kode...) untuk hari baru.
+        """
+        days = df['tanggal'].dt.normalize()
+        if self.last_date is not None:
+            df = df[days > self.last_date]
+            days = days[days > self.last_date]
+        if len(df) == 0:
+            return pd.DataFrame(columns=['tanggal', 'area'] + FWI_COLUMNS)
+        self.add_areas(pd.unique(df['area']))
+
+        first = days.min() if self.last_date is None else self.last_date + pd.Timedelta(days=1)
+        dates = pd.date_range(first, days.max(), freq='D')
+        day_idx = (days - first).dt.days.to_numpy()
+        area_pos = {a: i for i, a in enumerate(self.areas)}
+        area_idx = df['area'].map(area_pos).to_numpy(dtype=np.int64)
+
+        def grid(column, default, scale=1.0):
+            values = np.full((len(dates), len(self.areas)), default, dtype=float)
+            column_values = df[column].to_numpy(dtype=float) * scale
+            valid = ~np.isnan(column_values)
+            values[day_idx[valid], area_idx[valid]] = column_values[valid]
+            return values
+
+        codes = self.run(
+            grid('suhu', DEFAULT_WEATHER['temp']),
+            grid('kelembaban', DEFAULT_WEATHER['rh']),
+            # Kecepatan angin dashboard dalam m/s, FWI memakai km/jam
+            grid('kecepatan_angin', DEFAULT_WEATHER['wind'], 3.6),
+            grid('curah_hujan', DEFAULT_WEATHER['rain'], rain_scale)
+        )
+        self.last_date = dates[-1]
+
+        result = pd.DataFrame({'tanggal': df['tanggal'].to_numpy(), 'area': df['area'].to_numpy()}, index=df.index)
+        for col in FWI_COLUMNS:
+            result[col] = codes[col][day_idx, area_idx]
+        return result
+
+    def state_dict(self):
+        """State yang dapat disimpan (JSON) untuk melanjutkan perhitungan"""
+        return {
+            'areas': list(self.areas),
+            'ffmc': self.ffmc.tolist(),
+            'dmc': self.dmc.tolist(),
+            'dc': self.dc.tolist(),
+            'last_date': None if self.last_date is None else self.last_date.isoformat()
+        }
+
+    @classmethod
+    def from_state_dict(cls, state):
+        return cls(state['areas'], state['ffmc'], state['dmc'], state['dc'], state['last_date'])
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from .fwi import FireWeatherEngine
+from .ispu import ispu_from_concentrations, smoke_concentrations
+
+# Wilayah/Kecamatan di Kota Pontianak
+PONTIANAK_AREAS = [
+    'Pontianak Kota',
+    'Pontianak Selatan',
+    'Pontianak Utara',
+    'Pontianak Timur',
+    'Pontianak Barat',
+    'Pontianak Tenggara'
+]
+
+# Koordinat approximate untuk setiap area
+AREA_COORDS = {
+    'Pontianak Kota': {'lat': -0.0263, 'lon': 109.3425},
+    'Pontianak Selatan': {'lat': -0.0500, 'lon': 109.3200},
+    'Pontianak Utara': {'lat': 0.0100, 'lon': 109.3300},
+    'Pontianak Timur': {'lat': -0.0200, 'lon': 109.3600},
+    'Pontianak Barat': {'lat': -0.0300, 'lon': 109.3000},
+    'Pontianak Tenggara': {'lat': -0.0600, 'lon': 109.3500}
+}
+
+# Area urban lebih rendah, area pinggiran lebih tinggi (hanya di musim kemarau)
+AREA_HOTSPOT_FACTOR = {
+    'Pontianak Kota': 0.6,
+    'Pontianak Utara': 1.3,
+    'Pontianak Timur': 1.3
+}
+
+# Musim kemarau: Apr-Okt, musim hujan: Nov-Mar
+DRY_MONTHS = [4, 5, 6, 7, 8, 9, 10]
+
+RISK_LEVELS = ['Rendah', 'Sedang', 'Tinggi', 'Sangat Tinggi']
+RISK_THRESHOLDS = [30, 50, 70]
+
+# Kategori ISPU (batas atas eksklusif, sama dengan label dashboard)
+ISPU_STATUS = ['Baik', 'Sedang', 'Tidak Sehat', 'Sangat Tidak Sehat', 'Berbahaya']
+ISPU_THRESHOLDS = [50, 100, 200, 300]
+
+# Curah hujan mock berskala bulanan; engine FWI memerlukan mm per 24 jam
+MOCK_RAIN_TO_DAILY = 1 / 30
+
+COLUMNS = [
+    'tanggal', 'area', 'latitude', 'longitude', 'titik_panas', 'curah_hujan',
+    'sinaran_matahari', 'kecepatan_angin', 'arah_angin', 'suhu', 'kelembaban',
+    'ffmc', 'fwi', 'ispu', 'tingkat_risiko', 'skor_risiko', 'musim'
+]
+
+
+def classify_risk(risk_score):
+    """Klasifikasi skor risiko menjadi tingkat risiko (vektor)"""
+    risk_score = np.asarray(risk_score, dtype=float)
+    # Batas atas eksklusif: skor 70 masih "Tinggi", 70.01 sudah "Sangat Tinggi"
+    codes = np.searchsorted(RISK_THRESHOLDS, risk_score, side='left')
+    return np.asarray(RISK_LEVELS, dtype=object)[codes]
+
+
+def classify_ispu(ispu):
+    """Status ISPU (vektor); None bila tidak ada data"""
+    ispu = np.asarray(ispu, dtype=float)
+    status = np.asarray(ISPU_STATUS, dtype=object)[np.searchsorted(ISPU_THRESHOLDS, ispu, side='left')]
+    return np.where(np.isnan(ispu), None, status)
+
+
+def compute_risk_score(hotspot_count, rainfall, temperature, ffmc, wind_speed):
+    """Skor risiko berdasarkan kondisi spesifik Pontianak (vektor)"""
+    return (
+        hotspot_count * 0.35 +
+        np.maximum(0, (100 - rainfall / 3)) * 0.25 +
+        np.maximum(0, (temperature - 26)) * 0.15 +
+        np.maximum(0, (ffmc - 40)) * 0.15 +
+        np.maximum(0, (wind_speed - 2)) * 0.10
+    )
+
+
+def synthetic_areas(n_areas, rng=None):
+    """Buat area sintetis di sekitar Pontianak untuk uji beban"""
+    rng = np.random.default_rng(rng)
+    names = [f'Area {i:05d}' for i in range(n_areas)]
+    lats = -0.026 + rng.uniform(-0.5, 0.5, n_areas)
+    lons = 109.34 + rng.uniform(-0.5, 0.5, n_areas)
+    coords = {
+        name: {'lat': float(lat), 'lon': float(lon)}
+        for name, lat, lon in zip(names, lats, lons)
+    }
+    return names, coords
+
+
+def generate_pontianak_data(days=30, rng=None, areas=None, area_coords=None, end=None,
+                            fwi_engine=None, enso_amplitude=1.0, enso_phase=0.0):
+    """Generate data mock untuk monitoring Pontianak secara vektor (NumPy)
+
+    Semua noise diambil sekaligus per kolom dari ``rng`` (``numpy.random.Generator``
+    atau seed), sehingga hasil dapat direproduksi dan ukuran data hanya dibatasi
+    memori array, bukan jumlah dict per baris. ``fwi_engine`` yang sudah berisi
+    state melanjutkan rekurensi FFMC/FWI dari hari terakhirnya.
+    ``enso_amplitude`` dan ``enso_phase`` (hari) mengubah osilasi El Nino/La
+    Nina untuk skenario ensemble (lihat ``titik_panas.ensemble``).
+    """
+    rng = np.random.default_rng(rng)
+    if areas is None:
+        areas = PONTIANAK_AREAS
+    if area_coords is None:
+        area_coords = AREA_COORDS
+    if end is None:
+        end = datetime.now()
+
+    dates = pd.date_range(
+        start=end - timedelta(days=days),
+        end=end + timedelta(days=7),
+        freq='D'
+    )
+    n_dates, n_areas = len(dates), len(areas)
+    n = n_dates * n_areas
+
+    # Urutan baris sama dengan versi loop: tanggal lalu area
+    date_idx = np.repeat(np.arange(n_dates), n_areas)
+    area_idx = np.tile(np.arange(n_areas), n_dates)
+
+    is_dry_season = np.isin(dates.month, DRY_MONTHS)[date_idx]
+
+    # Faktor El Nino/La Nina (simulasi) - siklus 3 tahun
+    climate_oscillation = enso_amplitude * np.sin(
+        2 * np.pi * (np.asarray(dates.dayofyear) + enso_phase) / 1095
+    )[date_idx]
+
+    area_factor = np.array([AREA_HOTSPOT_FACTOR.get(a, 1.0) for a in areas])[area_idx]
+    hotspot_base = np.where(
+        is_dry_season,
+        (25 + climate_oscillation * 15) * area_factor,
+        8 + climate_oscillation * 5
+    )
+    hotspot_count = np.maximum(0, np.trunc(hotspot_base + rng.normal(0, 8, n))).astype(np.int64)
+
+    # Curah hujan - karakteristik iklim tropis basah Pontianak
+    rainfall_base = np.where(
+        is_dry_season,
+        120 - climate_oscillation * 60,
+        280 + climate_oscillation * 80
+    )
+    rainfall = np.maximum(0, rainfall_base + rng.normal(0, 40, n))
+
+    # Sinaran matahari - relatif konstan di khatulistiwa
+    solar_radiation = np.where(is_dry_season, 450, 350) + rng.normal(0, 50, n)
+
+    # Angin timur-tenggara di musim kemarau, barat daya di musim hujan
+    wind_speed = np.maximum(0, np.where(is_dry_season, 3.5, 2.8) + rng.normal(0, 1.2, n))
+    wind_direction = (np.where(is_dry_season, 120, 240) + rng.normal(0, 30, n)) % 360
+
+    # Suhu dan kelembaban - relatif stabil (iklim khatulistiwa)
+    temperature = np.where(is_dry_season, 27.5, 26.8) + rng.normal(0, 1.5, n)
+    humidity = np.clip(np.where(is_dry_season, 75, 85) + rng.normal(0, 8, n), 40, 95)
+
+    # FFMC/FWI - rekurensi harian sistem FWI Kanada, vektor lintas area
+    grid = (n_dates, n_areas)
+    if fwi_engine is None:
+        fwi_engine = FireWeatherEngine()
+    codes = fwi_engine.run_grid(
+        dates,
+        areas,
+        temperature.reshape(grid),
+        humidity.reshape(grid),
+        (wind_speed * 3.6).reshape(grid),
+        (rainfall * MOCK_RAIN_TO_DAILY).reshape(grid)
+    )
+    ffmc = codes['ffmc'].ravel()
+    fwi = codes['fwi'].ravel()
+
+    risk_score = compute_risk_score(hotspot_count, rainfall, temperature, ffmc, wind_speed)
+    risk_level = classify_risk(risk_score)
+
+    # ISPU (Indeks Standar Pencemaran Udara) dari konsentrasi polutan mock yang
+    # naik bersama titik panas, lewat tabel batas regulasi (lihat titik_panas.ispu)
+    ispu = ispu_from_concentrations(smoke_concentrations(hotspot_count, rng)).astype(np.int64)
+
+    area_names = np.asarray(areas, dtype=object)
+    lats = np.array([area_coords[a]['lat'] for a in areas])
+    lons = np.array([area_coords[a]['lon'] for a in areas])
+
+    return pd.DataFrame({
+        'tanggal': dates[date_idx],
+        'area': area_names[area_idx],
+        'latitude': lats[area_idx],
+        'longitude': lons[area_idx],
+        'titik_panas': hotspot_count,
+        'curah_hujan': rainfall,
+        'sinaran_matahari': solar_radiation,
+        'kecepatan_angin': wind_speed,
+        'arah_angin': wind_direction,
+        'suhu': temperature,
+        'kelembaban': humidity,
+        'ffmc': ffmc,
+        'fwi': fwi,
+        'ispu': ispu,
+        'tingkat_risiko': risk_level,
+        'skor_risiko': risk_score,
+        'musim': np.where(is_dry_season, 'Kemarau', 'Hujan').astype(object)
+    }, columns=COLUMNS)
@@ -0,0 +1,142 @@
+import copy
+import threading
+
+import pandas as pd
+
+from .filtering import FilterIndex
+from .forecast import ForecastEngine
+from .fwi import FireWeatherEngine
+from .rollup import RollupCube
+
+
+class IncrementalDataset:
+    """Dataset append-only dengan watermark per sumber
+
+    ``refresh`` hanya meminta baris setelah watermark sumber lalu memperbarui
+    indeks filter (atau store Parquet), cube rollup, state FWI dan model
+    prakiraan secara inkremental. Setiap ingest yang membawa data baru
+    menaikkan ``version``, yang dipakai sebagai kunci cache turunan
+    (bukan jam dinding). Komponen turunan dibangun sebagai objek baru lalu
+    ditukar sekaligus, sehingga sesi yang sedang merender tetap memegang
+    snapshot lama yang konsisten. Dengan ``shared`` (``SharedDataset``),
+    frame indeks filter adalah view zero-copy dari tabel Arrow bersama.
+    Proses yang hanya membaca cube (mis. evaluator peringatan) dapat memakai
+    ``filter_index=False`` agar baris mentah tidak disimpan di memori.
+    """
+
+    def __init__(self, source, store=None, shared=None, filter_index=True):
+        self.source = source
+        self.store = store
+        self.shared = shared
+        self.filter_index = filter_index
+        self.version = 0
+        self.watermarks = {}
+        self.index = None
+        self.cube = None
+        self.forecast = None
+        self.fwi_engine = FireWeatherEngine()
+        self._snapshot_key = None
+        self._lock = threading.Lock()
+        if store is not None and not store.is_empty():
+            self._restore()
+
+    def _restore(self):
+        """Lanjutkan dari store yang sudah terisi (watermark dan state FWI dari manifest)"""
+        manifest = self.store.manifest
+        state = manifest.get('ingest', {})
+        self.watermarks = {name: pd.Timestamp(value) for name, value in state.get('watermarks', {}).items()}
+        if not self.watermarks:
+            # Store tanpa state ingest: watermark dari tanggal terakhir di manifest
+            self.watermarks[self.source.name] = pd.Timestamp(manifest['max_date']).normalize()
+        if 'fwi' in state:
+            self.fwi_engine = FireWeatherEngine.from_state_dict(state['fwi'])
+        self.cube = RollupCube.from_store(self.store)
+        if self.shared is not None:
+            self.shared.track('cube', self.cube.nbytes)
+        self.forecast = ForecastEngine().update_from_cube(self.cube, self.source.observed_until())
+        self.version = self.store.version
+
+    @property
+    def watermark(self):
+        """Tanggal terakhir yang sudah di-ingest dari sumber aktif"""
+        return self.watermarks.get(self.source.name)
+
+    def _state(self, watermarks=None, fwi_engine=None):
+        watermarks = self.watermarks if watermarks is None else watermarks
+        fwi_engine = self.fwi_engine if fwi_engine is None else fwi_engine
+        return {
+            'watermarks': {name: value.isoformat() for name, value in watermarks.items()},
+            'fwi': fwi_engine.state_dict()
+        }
+
+    def snapshot(self):
+        """(version, index, cube, forecast) yang konsisten satu sama lain"""
+        with self._lock:
+            return self.version, self.index, self.cube, self.forecast
+
+    def refresh(self):
+        """Ingest baris baru dari sumber; kembalikan jumlah baris yang ditambahkan
+
+        Sumber hanya dibaca bila ``snapshot_key`` berubah, sehingga pemanggilan
+        pada setiap rerun murah selama tidak ada data baru. Bila pemuatan atau
+        ingest gagal, tidak ada state yang berubah (termasuk ``snapshot_key``)
+        sehingga rerun berikutnya mencoba lagi dari watermark yang sama.
+        """
+        with self._lock:
+            snapshot_key = self.source.snapshot_key()
+            if snapshot_key == self._snapshot_key:
+                return 0
+            # State FWI dilanjutkan pada salinan agar ingest yang gagal tidak merusaknya
+            fwi_engine = copy.deepcopy(self.fwi_engine)
+            new = self.source.load_since(self.watermark, fwi_engine)
+            if len(new):
+                self._ingest(new, fwi_engine)
+            self._snapshot_key = snapshot_key
+            return len(new)
+
+    def ingest(self, new, fwi_engine=None):
+        """Tambahkan baris yang sudah dimuat (kolom FFMC/FWI sudah dihitung)"""
+        with self._lock:
+            self._ingest(new, self.fwi_engine if fwi_engine is None else fwi_engine)
+        return self
+
+    def _ingest(self, new, fwi_engine):
+        """Bangun semua komponen versi baru ke variabel lokal, lalu tukar sekaligus
+
+        Atribut hanya diubah setelah semua langkah berhasil; pada mode store,
+        penulisan store (bersama watermark dan state FWI di manifest) adalah
+        titik commit terakhir yang bisa gagal.
+        """
+        watermark = new['tanggal'].max().normalize()
+        if self.watermark is not None:
+            watermark = max(watermark, self.watermark)
+        watermarks = {**self.watermarks, self.source.name: watermark}
+
+        # Prefix diperpanjang mulai hari baru saja (lihat ``RollupCube.appended``)
+        cube = RollupCube.from_frame(new) if self.cube is None else self.cube.appended(new)
+        # Prefix lintas area dihitung sebelum ditukar, bukan saat render
+        cube.totals()
+        forecast = ForecastEngine() if self.forecast is None else copy.deepcopy(self.forecast)
+        forecast.update_from_cube(cube, self.source.observed_until())
+
+        index = self.index
+        if self.store is not None:
+            state = self._state(watermarks, fwi_engine)
+            if self.store.is_empty():
+                self.store.write(new, state=state)
+            else:
+                self.store.append(new, state=state)
+            version = self.store.version
+        elif not self.filter_index:
+            version = self.version + 1
+        else:
+            index = FilterIndex(new) if self.index is None else self.index.append(new)
+            version = self.version + 1
+            if self.shared is not None:
+                # Segmen baru dipindah ke buffer Arrow bersama; salinan pandas dilepas
+                index = index.with_frames(self.shared.publish(version, index.frames, derived={'cube': cube.nbytes}))
+
+        self.watermarks, self.fwi_engine = watermarks, fwi_engine
+        self.index, self.cube, self.forecast, self.version = index, cube, forecast, version
+        if self.shared is not None:
+            self.shared.track('cube', cube.nbytes)
@@ -0,0 +1,99 @@
+import pandas as pd
+
+from .fwi import FireWeatherEngine
+from .downsample import CHART_WIDTH_PX
+from .generator import PONTIANAK_AREAS, synthetic_areas
+from .ingest import IncrementalDataset
+from .sources import MockSource
+from .spatial import HotspotIndex
+from .views import (
+    cluster_data,
+    cluster_figure,
+    ffmc_ispu_data,
+    ffmc_ispu_figures,
+    map_data,
+    map_figures,
+    risk_data,
+    risk_figures,
+    trend_data,
+    trend_figures,
+    weather_data,
+    weather_figures,
+)
+
+# Ukuran data default dashboard: 30 hari + 7 hari prakiraan x 6 area
+BASE_DAYS = 30
+FORECAST_DAYS = 7
+
+
+def scale_shape(scale, base_days=BASE_DAYS, base_areas=len(PONTIANAK_AREAS)):
+    """(days, n_areas) untuk kelipatan ukuran default: hari dulu (s.d. 10x), lalu area"""
+    day_factor = min(scale, 10)
+    area_factor = max(scale // day_factor, 1)
+    total_days = (base_days + FORECAST_DAYS) * day_factor
+    return total_days - FORECAST_DAYS, base_areas * area_factor
+
+
+def make_source(scale=1, seed=0, end=None):
+    """MockSource berukuran ``scale`` x data default (area sintetis bila > 6 area)"""
+    days, n_areas = scale_shape(scale)
+    if n_areas == len(PONTIANAK_AREAS):
+        return MockSource(days=days, seed=seed, end=end)
+    areas, coords = synthetic_areas(n_areas, rng=seed)
+    return MockSource(days=days, seed=seed, areas=areas, area_coords=coords, end=end)
+
+
+def load_data(source):
+    """Tahap muat: seluruh data sumber beserta state FWI di akhir data"""
+    fwi_engine = FireWeatherEngine()
+    return source.load_since(None, fwi_engine), fwi_engine
+
+
+def build_dataset(source, frame, fwi_engine=None):
+    """Tahap ingest: indeks filter, cube rollup dan model prakiraan"""
+    return IncrementalDataset(source).ingest(frame, fwi_engine)
+
+
+def build_hotspot_index(source, frame):
+    """Indeks grid deteksi titik individual (None bila sumber tanpa deteksi)"""
+    detections = source.load_detections(frame)
+    if detections is None or len(detections) == 0:
+        return None
+    return HotspotIndex.from_frame(detections)
+
+
+def apply_filters(index, cube, areas=None, start=None, end=None, season='Semua'):
+    """Tahap filter sidebar: baris terfilter dan seleksi rollup yang sesuai"""
+    filtered_df = index.select(areas, start, end, season)
+    rollup = cube.select(areas, start, end, None if season == 'Semua' else season)
+    return filtered_df, rollup
+
+
+def tab_stages(filtered_df, rollup, forecast_engine, areas=None, hotspot_index=None,
+               variable='curah_hujan', zoom=11, page_width=CHART_WIDTH_PX):
+    """Tahap per tab sebagai pasangan (agregasi, figure) tanpa argumen
+
+    Fungsi agregasi mengembalikan data tab; fungsi figure menerima data itu
+    dan mengembalikan dict figure Plotly, persis seperti yang dirender tab
+    pada halaman selebar ``page_width`` px.
+    """
+    stages = {
+        'trend': (lambda: trend_data(rollup, forecast_engine, areas, page_width=page_width), trend_figures),
+        'peta': (lambda: map_data(filtered_df, rollup), map_figures),
+        'cuaca': (lambda: weather_data(filtered_df, rollup, variable, page_width), weather_figures),
+        'risiko': (lambda: risk_data(filtered_df, rollup, page_width=page_width), risk_figures),
+        'ffmc_ispu': (lambda: ffmc_ispu_data(filtered_df, rollup, page_width), ffmc_ispu_figures)
+    }
+    if hotspot_index is not None and not filtered_df.empty:
+        stages['klaster'] = (
+            lambda: cluster_data(filtered_df, hotspot_index, zoom),
+            lambda data: {'clusters': cluster_figure(data)}
+        )
+    return stages
+
+
+def default_filter(index, days=None):
+    """Filter bawaan sidebar (semua area, seluruh rentang) atau ``days`` hari terakhir"""
+    end = index.max_date
+    start = index.min_date if days is None else end - pd.Timedelta(days=days - 1)
+    return list(index.areas), start.date(), end.date()
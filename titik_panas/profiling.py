@@ -0,0 +1,234 @@
+"""Instrumentasi waktu per bagian dashboard (opt-in)
+
+Aktif dengan ``TITIK_PANAS_PROFILE=1`` atau query parameter ``?profile=1``.
+Setiap rerun dicatat sebagai satu baris JSON (sesi, state filter, durasi per
+bagian) ke log berotasi; ringkasan p50/p95 per bagian lintas pengguna dengan
+``python -m titik_panas.profiling [log]``.
+"""
+import argparse
+import collections
+import contextlib
+import glob
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+DEFAULT_LOG = os.path.join('logs', 'profiling.jsonl')
+DEFAULT_MAX_BYTES = 5 * 2 ** 20
+DEFAULT_BACKUPS = 5
+
+# Pemisah nama bagian bertingkat, mis. "tab:trend/chart:trend"
+SEPARATOR = '/'
+
+
+def profiling_enabled(query_params=None, environ=None):
+    """Profiling aktif via environment atau query parameter ``profile``"""
+    environ = os.environ if environ is None else environ
+    if environ.get('TITIK_PANAS_PROFILE', '') == '1':
+        return True
+    return query_params is not None and query_params.get('profile', '') in ('1', 'true')
+
+
+def open_log(path=DEFAULT_LOG, max_bytes=DEFAULT_MAX_BYTES, backups=DEFAULT_BACKUPS):
+    """Logger JSON-lines berotasi (``path``, ``path.1``, ...); satu handler per path"""
+    logger = logging.getLogger(f'{__name__}.{os.path.abspath(path)}')
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class CacheLoads:
+    """Cacah pemuatan mahal ``st.cache_resource`` per proses (dataset, cube wilayah)
+
+    Fungsi ber-cache memanggil ``loaded(name)`` hanya saat cache miss. Mode
+    produksi memanggil ``seal`` setelah pra-panas; rerun pertama sesi baru
+    sesudahnya dilaporkan ke ``callback`` dengan nama yang dimuat ulang,
+    sehingga pra-panas yang tidak dipakai server terlihat di status worker.
+    """
+
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.report = None
+        self._sealed = None
+        self._session = None
+        self._callback = None
+        self._lock = threading.Lock()
+
+    def loaded(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def seal(self, callback=None):
+        with self._lock:
+            self._sealed = collections.Counter(self.counts)
+            self._session = None
+            self._callback = callback
+            self.report = None
+
+    def run_started(self, session):
+        with self._lock:
+            if self._sealed is not None and self._session is None:
+                self._session = session
+
+    def run_finished(self, session):
+        with self._lock:
+            if self._sealed is None or self._session != session or self.report is not None:
+                return
+            reloaded = sorted(self.counts - self._sealed)
+            self.report = {'session': session, 'reused': not reloaded, 'reloaded': reloaded}
+            report, callback = self.report, self._callback
+        if callback is not None:
+            callback(report)
+
+
+# Satu pencacah per proses: dipakai bersama rerun pra-panas dan server
+cache_loads = CacheLoads()
+
+
+class Profiler:
+    """Pencatat durasi bagian bertingkat untuk satu rerun
+
+    ``section`` dipakai sebagai context manager; bagian di dalam bagian lain
+    diberi nama gabungan ``induk/anak``. Saat tidak aktif ``section`` hanya
+    mengembalikan context kosong sehingga biaya instrumentasi praktis nol.
+    Bagian yang dibuka setelah ``flush`` (rerun fragment) dicatat sebagai
+    rerun tersendiri begitu bagian terluarnya selesai.
+    """
+
+    def __init__(self, enabled=False, logger=None, session=None, state=None):
+        self.enabled = enabled
+        self.logger = logger
+        self.session = session
+        self.state = dict(state or {})
+        self.records = []
+        self.flushed = False
+        self._stack = []
+        self._started = time.perf_counter()
+
+    def section(self, name):
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._section(name)
+
+    @contextlib.contextmanager
+    def _section(self, name):
+        fragment = self.flushed and not self._stack
+        if fragment:
+            self.records, self._started = [], time.perf_counter()
+        self._stack.append(name)
+        # Dicatat saat dibuka agar urutan rincian mengikuti urutan render
+        record = {'section': SEPARATOR.join(self._stack), 'ms': float('nan')}
+        self.records.append(record)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record['ms'] = (time.perf_counter() - started) * 1000
+            self._stack.pop()
+            if fragment:
+                self._emit('fragment')
+
+    def update_state(self, **state):
+        """Tambahkan state filter/tampilan yang ikut dicatat"""
+        self.state.update(state)
+
+    def total_ms(self):
+        return (time.perf_counter() - self._started) * 1000
+
+    def breakdown(self):
+        """DataFrame durasi per bagian (urutan render), dengan kolom level"""
+        table = pd.DataFrame(self.records, columns=['section', 'ms'])
+        table['level'] = table['section'].str.count(SEPARATOR)
+        return table
+
+    def _emit(self, run):
+        if self.logger is None:
+            return
+        self.logger.info(json.dumps({
+            'time': pd.Timestamp.now().isoformat(),
+            'session': self.session,
+            'run': run,
+            'total_ms': round(self.total_ms(), 3),
+            'state': self.state,
+            'sections': [{'section': r['section'], 'ms': round(r['ms'], 3)} for r in self.records]
+        }, default=str))
+
+    def flush(self):
+        """Tulis rerun penuh ke log (sekali per rerun)"""
+        if not self.enabled or self.flushed:
+            return
+        self._emit('full')
+        self.flushed = True
+
+
+def read_log(path=DEFAULT_LOG):
+    """Baca log beserta file rotasinya; satu baris per (rerun, bagian)"""
+    rows = []
+    for file in sorted(glob.glob(glob.escape(path) + '*')):
+        with open(file, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                for section in entry['sections']:
+                    rows.append({
+                        'time': entry['time'],
+                        'session': entry['session'],
+                        'run': entry['run'],
+                        'section': section['section'],
+                        'ms': section['ms']
+                    })
+                rows.append({
+                    'time': entry['time'],
+                    'session': entry['session'],
+                    'run': entry['run'],
+                    'section': f"total:{entry['run']}",
+                    'ms': entry['total_ms']
+                })
+    return pd.DataFrame(rows, columns=['time', 'session', 'run', 'section', 'ms'])
+
+
+def summarize(records):
+    """p50/p95/maks per bagian, diurutkan dari p95 terbesar"""
+    grouped = records.groupby('section')['ms']
+    table = pd.DataFrame({
+        'n': grouped.size(),
+        'sessions': records.groupby('section')['session'].nunique(),
+        'p50_ms': grouped.quantile(0.5),
+        'p95_ms': grouped.quantile(0.95),
+        'max_ms': grouped.max()
+    })
+    return table.sort_values('p95_ms', ascending=False).round(1).reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ringkasan log profiling dashboard titik panas")
+    parser.add_argument('log', nargs='?', default=DEFAULT_LOG)
+    parser.add_argument('--since', help="Hanya rerun sejak waktu ini (ISO)")
+    args = parser.parse_args(argv)
+
+    records = read_log(args.log)
+    if args.since:
+        records = records[pd.to_datetime(records['time']) >= pd.Timestamp(args.since)]
+    if records.empty:
+        print(f"Tidak ada data profiling di {args.log}")
+        return 1
+    print(summarize(records).to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""Registri wilayah bertingkat dan rollup per tingkat
+
+Hierarki provinsi → kabupaten/kota → kecamatan → desa/kelurahan dibaca dari
+file konfigurasi JSON atau GeoJSON (``RegionRegistry.from_file``). Unit di
+tingkat terbawah adalah nilai kolom ``area`` pada data; agregat tingkat di
+atasnya dibangun sekali per versi data dari partial tingkat anaknya
+(``RegionRollup``), bukan dengan memindai ulang baris.
+"""
+import json
+from collections import Counter
+
+import numpy as np
+
+from .generator import AREA_COORDS, PONTIANAK_AREAS, synthetic_areas
+from .spatial import geometry_rings
+
+LEVELS = ['provinsi', 'kabupaten', 'kecamatan', 'desa']
+
+LEVEL_LABELS = {
+    'provinsi': 'Provinsi',
+    'kabupaten': 'Kabupaten/Kota',
+    'kecamatan': 'Kecamatan',
+    'desa': 'Desa/Kelurahan'
+}
+
+PROVINCE = 'Kalimantan Barat'
+
+
+class RegionRegistry:
+    """Registri unit wilayah bertingkat
+
+    Setiap unit berupa dict ``kode``, ``nama``, ``level`` (salah satu
+    ``LEVELS``), ``induk`` (kode unit induk) serta opsional ``lat``/``lon``.
+    Unit dirujuk dengan label yang unik per tingkat: nama unit, atau
+    "Nama (Induk)" bila nama yang sama muncul di induk berbeda. Label unit
+    tingkat terbawah sama dengan nilai kolom ``area`` pada data. Unit tanpa
+    koordinat memakai rata-rata koordinat anaknya.
+    """
+
+    def __init__(self, units):
+        units = [dict(unit) for unit in units]
+        by_kode = {}
+        for unit in units:
+            unit['kode'] = str(unit.get('kode') or unit['nama'])
+            if unit.get('level') not in LEVELS:
+                raise ValueError(f"Tingkat wilayah tidak dikenal: {unit.get('level')!r} ({unit['kode']})")
+            if unit['kode'] in by_kode:
+                raise ValueError(f"Kode wilayah ganda: {unit['kode']}")
+            unit['induk'] = None if unit.get('induk') in (None, '') else str(unit['induk'])
+            by_kode[unit['kode']] = unit
+        for unit in units:
+            parent = by_kode.get(unit['induk'])
+            if unit['induk'] is not None and parent is None:
+                raise ValueError(f"Induk {unit['induk']} untuk wilayah {unit['kode']} tidak ada")
+            if parent is not None and LEVELS.index(parent['level']) >= LEVELS.index(unit['level']):
+                raise ValueError(f"Induk {parent['kode']} harus di tingkat di atas {unit['kode']}")
+        if not units:
+            raise ValueError("Registri wilayah kosong")
+        self._by_kode = by_kode
+        self.levels = [level for level in LEVELS if any(u['level'] == level for u in units)]
+        self.leaf_level = self.levels[-1]
+        self._units = {level: [u for u in units if u['level'] == level] for level in self.levels}
+        for level in self.levels:
+            self._label(self._units[level])
+        for level in reversed(self.levels):
+            self._fill_coords(self._units[level])
+        self._by_label = {
+            level: {u['label']: u for u in members} for level, members in self._units.items()
+        }
+
+    def _label(self, members):
+        counts = Counter(u['nama'] for u in members)
+        for u in members:
+            parent = self._by_kode.get(u['induk'])
+            if counts[u['nama']] > 1 and parent is not None:
+                u['label'] = f"{u['nama']} ({parent['nama']})"
+            else:
+                u['label'] = u['nama']
+        # Induk bernama sama pun masih bisa bentrok: pakai kode
+        counts = Counter(u['label'] for u in members)
+        for u in members:
+            if counts[u['label']] > 1:
+                u['label'] = f"{u['nama']} ({u['kode']})"
+
+    def _fill_coords(self, members):
+        children = {}
+        for unit in self._by_kode.values():
+            if unit.get('lat') is not None and unit['induk'] is not None:
+                children.setdefault(unit['induk'], []).append((unit['lat'], unit['lon']))
+        for u in members:
+            if u.get('lat') is None and u['kode'] in children:
+                u['lat'], u['lon'] = (float(v) for v in np.mean(children[u['kode']], axis=0))
+
+    @classmethod
+    def from_file(cls, path):
+        """Baca registri dari JSON (``{"units": [...]}``) atau GeoJSON FeatureCollection"""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get('type') == 'FeatureCollection':
+            return cls.from_geojson(data)
+        return cls(data['units'] if isinstance(data, dict) else data)
+
+    @classmethod
+    def from_geojson(cls, geojson):
+        """Registri dari fitur GeoJSON berproperti ``kode``, ``nama``, ``level``, ``induk``
+
+        Poligon disimpan untuk penetapan area deteksi; koordinat unit tanpa
+        ``lat``/``lon`` adalah rata-rata titik sudut poligonnya.
+        """
+        units = []
+        for feature in geojson['features']:
+            props = feature['properties']
+            unit = {key: props.get(key) for key in ('kode', 'nama', 'level', 'induk', 'lat', 'lon')}
+            rings = geometry_rings(feature.get('geometry'))
+            if rings:
+                unit['rings'] = rings
+                if unit['lat'] is None:
+                    # Titik penutup ring (sama dengan titik awal) tidak dihitung dua kali
+                    vertices = np.vstack([r[:-1] if (r[0] == r[-1]).all() else r for r in rings])
+                    lon, lat = vertices.mean(axis=0)
+                    unit['lat'], unit['lon'] = float(lat), float(lon)
+            units.append(unit)
+        return cls(units)
+
+    @classmethod
+    def pontianak(cls):
+        """Registri bawaan: Kalimantan Barat → Kota Pontianak → 6 kecamatan"""
+        units = [
+            {'kode': '61', 'nama': PROVINCE, 'level': 'provinsi'},
+            {'kode': '6171', 'nama': 'Kota Pontianak', 'level': 'kabupaten', 'induk': '61'}
+        ]
+        for area in PONTIANAK_AREAS:
+            units.append({'nama': area, 'level': 'kecamatan', 'induk': '6171', **AREA_COORDS[area]})
+        return cls(units)
+
+    @classmethod
+    def flat(cls, areas, area_coords=None):
+        """Registri satu tingkat di bawah provinsi untuk daftar area bebas"""
+        area_coords = area_coords or {}
+        units = [{'kode': '61', 'nama': PROVINCE, 'level': 'provinsi'}]
+        for area in areas:
+            units.append({'kode': f'area:{area}', 'nama': area, 'level': 'kecamatan', 'induk': '61',
+                          **area_coords.get(area, {})})
+        return cls(units)
+
+    @classmethod
+    def default_for(cls, areas, area_coords=None):
+        """Registri bawaan untuk area data: Pontianak bila cocok, selain itu datar"""
+        areas = list(areas)
+        if areas and set(areas) <= set(PONTIANAK_AREAS):
+            return cls.pontianak()
+        return cls.flat(areas, area_coords)
+
+    @classmethod
+    def synthetic(cls, n_leaves, fanout=10, rng=None):
+        """Registri sintetis provinsi → kabupaten → kecamatan → desa untuk uji beban"""
+        _, coords = synthetic_areas(n_leaves, rng)
+        units = [{'kode': '61', 'nama': PROVINCE, 'level': 'provinsi'}]
+        n_kecamatan = -(-n_leaves // fanout)
+        n_kabupaten = -(-n_kecamatan // fanout)
+        units += [{'kode': f'kab{i}', 'nama': f'Kabupaten {i:03d}', 'level': 'kabupaten', 'induk': '61'}
+                  for i in range(n_kabupaten)]
+        units += [{'kode': f'kec{i}', 'nama': f'Kecamatan {i:04d}', 'level': 'kecamatan',
+                   'induk': f'kab{i // fanout}'} for i in range(n_kecamatan)]
+        units += [{'kode': f'desa{i}', 'nama': f'Desa {i:05d}', 'level': 'desa',
+                   'induk': f'kec{i // fanout}', **coord} for i, coord in enumerate(coords.values())]
+        return cls(units)
+
+    @property
+    def leaves(self):
+        """Label unit tingkat terbawah (nilai kolom ``area``)"""
+        return self.units(self.leaf_level)
+
+    def units(self, level, parents=None, parent_level=None):
+        """Label unit di ``level``, opsional hanya keturunan ``parents`` di ``parent_level``"""
+        members = self._units.get(level, [])
+        if parents is None:
+            return [u['label'] for u in members]
+        parents = set(parents)
+        result = []
+        for u in members:
+            ancestor = self._ancestor(u, parent_level)
+            if ancestor is not None and ancestor['label'] in parents:
+                result.append(u['label'])
+        return result
+
+    def _ancestor(self, unit, level):
+        while unit is not None and unit['level'] != level:
+            unit = self._by_kode.get(unit['induk'])
+        return unit
+
+    def leaves_under(self, level, labels):
+        """Label daun di bawah unit ``labels`` pada ``level`` (urutan registri)"""
+        return self.units(self.leaf_level, labels, level)
+
+    def groups(self, level, child_level, children):
+        """Indeks unit induk di ``level`` untuk setiap label ``children`` (-1 bila tidak ada)"""
+        index = {label: i for i, label in enumerate(self.units(level))}
+        lookup = self._by_label.get(child_level, {})
+        groups = np.full(len(children), -1, dtype=np.int64)
+        for i, label in enumerate(children):
+            ancestor = self._ancestor(lookup.get(label), level)
+            if ancestor is not None:
+                groups[i] = index[ancestor['label']]
+        return groups, list(index)
+
+    def coords(self, level=None):
+        """``{label: {'lat', 'lon'}}`` untuk unit berkoordinat (bawaan: tingkat terbawah)"""
+        return {
+            u['label']: {'lat': u['lat'], 'lon': u['lon']}
+            for u in self._units[level or self.leaf_level] if u.get('lat') is not None
+        }
+
+    def polygons(self):
+        """Poligon unit tingkat terbawah (lihat ``spatial.assign_areas``) atau None"""
+        polygons = {u['label']: u['rings'] for u in self._units[self.leaf_level] if u.get('rings')}
+        return polygons or None
+
+    def missing(self, areas):
+        """Area data yang tidak ada di tingkat terbawah registri"""
+        known = self._by_label[self.leaf_level]
+        return [a for a in areas if a not in known]
+
+
+class RegionRollup:
+    """Cube rollup untuk setiap tingkat registri
+
+    Cube tingkat terbawah adalah cube dataset; cube setiap tingkat di atasnya
+    dibangun dari cube tingkat anaknya dengan ``RollupCube.group_areas``,
+    sehingga provinsi digabung dari partial kabupaten, kabupaten dari
+    kecamatan, dan seterusnya. Area data di luar registri tidak ikut di
+    tingkat atas.
+
+    Bila ``previous`` (rollup registri yang sama) dibangun dari cube yang
+    diperpanjang oleh ``cube`` (lihat ``RollupCube.extends``), cube tingkat
+    atas hanya menjumlah hari baru (``RollupCube.follow``).
+    """
+
+    def __init__(self, cube, registry, previous=None):
+        self.registry = registry
+        self.cubes = {registry.leaf_level: cube}
+        follow = (previous is not None and previous.registry is registry
+                  and cube.extends(previous.cubes[registry.leaf_level]))
+        child_level = registry.leaf_level
+        for level in reversed(registry.levels[:-1]):
+            child = self.cubes[child_level]
+            if follow:
+                self.cubes[level] = previous.cubes[level].follow(child)
+            else:
+                groups, labels = registry.groups(level, child_level, child.areas)
+                self.cubes[level] = child.group_areas(groups, labels)
+            child_level = level
+
+    @property
+    def nbytes(self):
+        """Byte cube tingkat atas (cube tingkat terbawah milik dataset)"""
+        leaf = self.registry.leaf_level
+        return sum(cube.nbytes for level, cube in self.cubes.items() if level != leaf)
+
+    def select(self, level, units=None, start=None, end=None, season=None):
+        """Seleksi unit di ``level`` (lihat ``RollupCube.select``)"""
+        return self.cubes[level].select(units, start, end, season)
+
+    def window(self, level, units=None, start=None, end=None, season=None):
+        """Total jendela waktu unit di ``level`` dari prefix cube (lihat ``RollupCube.window``)"""
+        return self.cubes[level].window(start, end, units, season)
@@ -0,0 +1,670 @@
+import numpy as np
+import pandas as pd
+
+from .generator import DRY_MONTHS, RISK_LEVELS
+from .stats import Moments, group_sum, packed_size
+
+# Kolom numerik yang disimpan sebagai partial (jumlah + cacah non-NaN)
+STAT_COLUMNS = [
+    'titik_panas', 'curah_hujan', 'sinaran_matahari', 'kecepatan_angin',
+    'suhu', 'kelembaban', 'ffmc', 'fwi', 'ispu', 'skor_risiko'
+]
+
+# Kolom dengan momen gabungan (kovarians/korelasi), mis. matriks korelasi faktor risiko
+MOMENT_COLUMNS = ['titik_panas', 'curah_hujan', 'suhu', 'kelembaban', 'kecepatan_angin', 'skor_risiko']
+
+# Panjang blok hari untuk momen gabungan per blok (lihat ``RollupCube``)
+MOMENT_BLOCK_DAYS = 16
+
+# Cacah disimpan int32: tetap eksak selama total baris dataset < 2**31
+COUNT_DTYPE = np.int32
+
+
+class RollupCube:
+    """Cube agregat harian per area dalam bentuk jumlah kumulatif (prefix)
+
+    Untuk setiap area disimpan jumlah kumulatif sepanjang sumbu hari: baris
+    ``d`` dari ``cum_sums`` adalah jumlah setiap kolom ``STAT_COLUMNS`` untuk
+    semua hari sebelum hari ke-d (baris 0 bernilai nol), begitu pula cacah
+    non-NaN dan cacah baris per tingkat risiko. Total jendela hari [lo, hi)
+    adalah ``cum[hi] - cum[lo]`` dan nilai satu hari adalah selisih dua baris
+    berurutan, sehingga prefix menggantikan partial per hari (bukan salinan
+    tambahan). Rata-rata seleksi apa pun = total jumlah / total cacah, sama
+    dengan ``groupby(...).mean()`` pada data mentah. Tata letak (hari + 1,
+    area, k) membuat satu baris prefix kontigu per hari.
+
+    Cube tingkat data juga menyimpan ``Moments`` (cacah, rata-rata, ko-momen
+    terpusat) ``MOMENT_COLUMNS`` untuk kovarians dan korelasi, bukan sebagai
+    prefix: ``day_moments[d + 1]`` adalah momen sel (hari d, area) dan
+    ``block_moments[b]`` gabungan Chan hari [b, b + 1) * ``MOMENT_BLOCK_DAYS``
+    per area. Seleksi menggabungkan blok penuh di dalam rentang dan hari sisa
+    di tepinya, sehingga jendela pendek di ujung riwayat panjang tidak pernah
+    mengurangkan dua jumlah kuadrat besar. Cube hasil ``group_areas`` tidak
+    menyimpannya: momennya dibaca dari cube tingkat data lewat pemetaan area
+    daun ke grup.
+
+    Blok prefix boleh lebih panjang dari ``len(dates) + 1`` baris (kapasitas
+    cadangan): ``appended`` dan ``follow`` menulis hari baru ke baris cadangan
+    buffer yang sama, sehingga cube versi lama tetap valid tanpa salinan.
+    """
+
+    def __init__(self, dates, areas, sums, counts, risk_counts, moments=None, moment_source=None,
+                 block_moments=None):
+        self.dates = pd.DatetimeIndex(dates)
+        self.areas = list(areas)
+        self._area_index = {a: i for i, a in enumerate(self.areas)}
+        self.is_dry = np.isin(self.dates.month, DRY_MONTHS)
+        self._buffers = [sums, counts, risk_counts]
+        rows = slice(0, len(self.dates) + 1)
+        self.cum_sums = sums[rows]
+        self.cum_counts = counts[rows]
+        self.cum_risk = risk_counts[rows]
+        self._moment_buffers = None
+        self.day_moments = None
+        self.block_moments = None
+        if moments is not None:
+            n_blocks = len(self.dates) // MOMENT_BLOCK_DAYS
+            if block_moments is None:
+                block_moments = np.zeros((n_blocks,) + moments.shape[1:])
+            self._moment_buffers = [moments, block_moments]
+            self.day_moments = moments[rows]
+            self.block_moments = block_moments[:n_blocks]
+            moment_source = (self, np.arange(len(self.areas)))
+        # (cube tingkat data, indeks area cube ini untuk setiap area daun) atau None
+        self.moment_source = moment_source
+        # Indeks grup per area cube anak (hanya cube hasil ``group_areas``)
+        self.groups = None
+        # Cube dengan lineage sama berbagi buffer dan hanya berbeda panjang
+        # sumbu hari; isinya jumlah hari cube terpanjang (ujung) lineage
+        self._lineage = [len(self.dates)]
+        self._total_buffers = None
+        self._season_edges = None
+
+    @classmethod
+    def empty(cls, dates, areas, moments=True):
+        shape = (len(dates) + 1, len(areas))
+        return cls(
+            dates,
+            areas,
+            np.zeros(shape + (len(STAT_COLUMNS),)),
+            np.zeros(shape + (len(STAT_COLUMNS),), dtype=COUNT_DTYPE),
+            np.zeros(shape + (len(RISK_LEVELS),), dtype=COUNT_DTYPE),
+            np.zeros(shape + (packed_size(len(MOMENT_COLUMNS)),)) if moments else None
+        )
+
+    @classmethod
+    def from_frame(cls, df, dates=None, areas=None):
+        """Bangun cube dari DataFrame berskema dashboard"""
+        days = df['tanggal'].dt.normalize()
+        if dates is None:
+            dates = pd.date_range(days.min(), days.max(), freq='D')
+        if areas is None:
+            areas = sorted(df['area'].unique())
+        cube = cls.empty(dates, areas)
+        cube._scatter(df, 0, cube._blocks(slice(1, None)), cube.day_moments[1:])
+        cube._accumulate()
+        cube._seal_blocks()
+        return cube
+
+    @classmethod
+    def from_store(cls, store):
+        """Bangun cube dari ParquetStore per bulan (memori terbatas per partisi)"""
+        from .store import months_between
+
+        manifest = store.manifest
+        start = pd.Timestamp(manifest['min_date']).normalize()
+        end = pd.Timestamp(manifest['max_date']).normalize()
+        cube = cls.empty(pd.date_range(start, end, freq='D'), manifest['areas'])
+        # Nilai harian ditulis langsung ke baris prefix, lalu dijumlah kumulatif sekali
+        daily = cube._blocks(slice(1, None))
+        for bulan in months_between(start, end):
+            month_start = pd.Timestamp(year=bulan // 100, month=bulan % 100, day=1)
+            month_end = month_start + pd.offsets.MonthEnd(0)
+            part = store.read(start=month_start, end=month_end,
+                              columns=['tanggal', 'area', 'tingkat_risiko'] + STAT_COLUMNS)
+            cube._scatter(part, 0, daily, cube.day_moments[1:])
+        cube._accumulate()
+        cube._seal_blocks()
+        return cube
+
+    def _blocks(self, rows):
+        """Baris ``rows`` dari setiap blok prefix (jumlah, cacah, cacah risiko)"""
+        return [self.cum_sums[rows], self.cum_counts[rows], self.cum_risk[rows]]
+
+    def _scatter(self, df, first, blocks, moments=None):
+        """Tambahkan nilai harian ``df`` ke ``blocks`` (baris 0 = hari ``first``, belum kumulatif)
+
+        Momen sel digabung ke ``moments`` (baris 0 = hari ``first``) bila diberikan.
+        """
+        if len(df) == 0:
+            return
+        day_idx = (df['tanggal'].dt.normalize() - self.dates[0]).dt.days.to_numpy()
+        area_idx = df['area'].map(self._area_index).to_numpy()
+        if (day_idx < first).any() or (day_idx >= len(self.dates)).any() or pd.isna(area_idx).any():
+            raise ValueError("Baris di luar sumbu tanggal/area cube")
+        n_areas = len(self.areas)
+        shape = blocks[0].shape[:2]
+        size = shape[0] * shape[1]
+        flat = (day_idx - first) * n_areas + area_idx.astype(np.int64)
+        sums, counts, risk = blocks
+        for k, col in enumerate(STAT_COLUMNS):
+            values = df[col].to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            sums[:, :, k] += np.bincount(flat[valid], weights=values[valid], minlength=size).reshape(shape)
+            counts[:, :, k] += np.bincount(flat[valid], minlength=size).reshape(shape)
+        risk_idx = pd.Categorical(df['tingkat_risiko'], categories=RISK_LEVELS).codes
+        valid = risk_idx >= 0
+        risk += np.bincount(
+            flat[valid] * len(RISK_LEVELS) + risk_idx[valid],
+            minlength=size * len(RISK_LEVELS)
+        ).reshape(risk.shape)
+        if moments is not None:
+            # Momen sel dua lintasan dari baris baru, lalu digabung (Chan) ke sel lama
+            touched, local = np.unique(flat, return_inverse=True)
+            new = Moments.from_groups(df[MOMENT_COLUMNS].to_numpy(dtype=float), local, len(touched))
+            cells = np.unravel_index(touched, shape)
+            target = Moments.view(moments, len(MOMENT_COLUMNS))
+            target[cells] = target[cells].merge(new)
+
+    def _accumulate(self):
+        """Ubah nilai harian di baris 1.. menjadi jumlah kumulatif (di tempat)"""
+        for block in self._blocks(slice(None)):
+            np.cumsum(block, axis=0, out=block)
+
+    def _seal_blocks(self, first=0):
+        """Isi ``block_moments`` untuk blok lengkap mulai blok ``first`` dari momen harian"""
+        size = MOMENT_BLOCK_DAYS
+        last = len(self.dates) // size
+        if self.day_moments is None or last <= first:
+            return
+        days = self.day_moments[1 + first * size:1 + last * size]
+        days = days.reshape((last - first, size) + days.shape[1:])
+        p = len(MOMENT_COLUMNS)
+        Moments.view(self.block_moments[first:last], p)[...] = Moments.view(days, p).reduce(axis=1)
+
+    def add_frame(self, df):
+        """Tambahkan baris ke cube (tanggal dan area harus ada di sumbu)
+
+        Hanya baris prefix mulai hari terawal di ``df`` yang berubah.
+        """
+        if len(df) == 0:
+            return self
+        first = (df['tanggal'].min().normalize() - self.dates[0]).days
+        first = min(max(first, 0), len(self.dates))
+        increments = [np.zeros((len(self.dates) - first,) + block.shape[1:], dtype=block.dtype)
+                      for block in self._blocks(slice(1, None))]
+        moments = None if self.day_moments is None else self.day_moments[first + 1:]
+        self._scatter(df, first, increments, moments)
+        for block, increment in zip(self._blocks(slice(first + 1, None)), increments):
+            block += np.cumsum(increment, axis=0, dtype=block.dtype)
+        self._seal_blocks(first // MOMENT_BLOCK_DAYS)
+        self._total_buffers = None
+        return self
+
+    def totals(self):
+        """Prefix lintas semua area (jumlah, cacah, cacah risiko): (hari + 1, k), di-cache"""
+        if self._total_buffers is None:
+            self._total_buffers = [block.sum(axis=1) for block in self._blocks(slice(None))]
+        return tuple(total[:len(self.dates) + 1] for total in self._total_buffers)
+
+    @property
+    def nbytes(self):
+        """Byte buffer prefix dan momen (termasuk kapasitas cadangan dan prefix lintas area)"""
+        buffers = self._buffers + (self._moment_buffers or []) + (self._total_buffers or [])
+        return sum(buffer.nbytes for buffer in buffers)
+
+    def extends(self, other):
+        """True bila cube ini adalah ``other`` ditambah hari baru (lihat ``appended``)"""
+        return (self._lineage is other._lineage and len(self.dates) >= len(other.dates)
+                and self.areas == other.areas)
+
+    def _grown(self, n_days):
+        """Cube kosong berlineage sama dengan sumbu ``n_days`` hari di buffer cube ini
+
+        Bila kapasitas kurang, buffer baru dua kali lipat dialokasikan dan baris
+        lama disalin sekali (amortisasi O(1) per hari). Cube yang bukan ujung
+        lineage-nya (sudah pernah diperpanjang) selalu disalin ke lineage baru
+        agar baris cube lain tidak tertimpa. Baris setelah hari terakhir cube
+        ini belum diisi.
+        """
+        n_rows = len(self.dates) + 1
+        tip = self._lineage[0] == len(self.dates)
+
+        def grow(buffer, used=n_rows, needed=n_days + 1):
+            if tip and buffer.shape[0] >= needed:
+                return buffer
+            grown = np.empty((max(needed, 2 * buffer.shape[0]),) + buffer.shape[1:], dtype=buffer.dtype)
+            grown[:used] = buffer[:used]
+            return grown
+
+        moments = block_moments = None
+        if self._moment_buffers is not None:
+            moments = grow(self._moment_buffers[0])
+            block_moments = grow(self._moment_buffers[1], len(self.dates) // MOMENT_BLOCK_DAYS,
+                                 n_days // MOMENT_BLOCK_DAYS)
+        cube = RollupCube(pd.date_range(self.dates[0], periods=n_days, freq='D'), self.areas,
+                          *(grow(buffer) for buffer in self._buffers), moments,
+                          moment_source=None if moments is not None else self.moment_source,
+                          block_moments=block_moments)
+        cube.groups = self.groups
+        if tip:
+            cube._lineage = self._lineage
+            self._lineage[0] = n_days
+        if self._total_buffers is not None:
+            cube._total_buffers = [grow(total) for total in self._total_buffers]
+        return cube
+
+    def _extend(self, cube, increments):
+        """Isi baris hari baru ``cube`` (hasil ``_grown``) dari nilai harian ``increments``
+
+        Momen harian hari baru sudah ditulis ke ``cube``; di sini hanya blok
+        momen yang baru lengkap yang dihitung.
+        """
+        n = len(self.dates)
+        for block, increment in zip(cube._blocks(slice(n, None)), increments):
+            block[1:] = block[0] + np.cumsum(increment, axis=0, dtype=block.dtype)
+        if cube._total_buffers is not None:
+            rows = slice(n, len(cube.dates) + 1)
+            for total, increment in zip(cube._total_buffers, increments):
+                total[rows][1:] = total[n] + np.cumsum(increment.sum(axis=1), axis=0, dtype=total.dtype)
+        cube._seal_blocks(n // MOMENT_BLOCK_DAYS)
+        return cube
+
+    def appended(self, df):
+        """Cube baru berisi cube ini ditambah baris ``df``; cube ini tidak diubah
+
+        Bila semua baris ``df`` jatuh setelah hari terakhir cube dan areanya
+        sudah dikenal, prefix hanya diperpanjang mulai hari baru di buffer
+        yang sama, sehingga biayanya sebanding jumlah hari baru, bukan
+        panjang riwayat. Selain itu (data terlambat, area baru) cube
+        digabung ulang lewat ``merge``.
+        """
+        if len(df) == 0:
+            return self
+        days = df['tanggal'].dt.normalize()
+        if days.min() <= self.dates[-1] or not set(pd.unique(df['area'])) <= self._area_index.keys():
+            return self.merge(RollupCube.from_frame(df))
+        n = len(self.dates)
+        cube = self._grown((days.max() - self.dates[0]).days + 1)
+        increments = [np.zeros((len(cube.dates) - n,) + block.shape[1:], dtype=block.dtype)
+                      for block in self._buffers]
+        moments = None
+        if cube.day_moments is not None:
+            # Baris cadangan buffer belum terisi: momen hari baru mulai dari nol
+            moments = cube.day_moments[n + 1:]
+            moments[:] = 0
+        cube._scatter(df, n, increments, moments)
+        return self._extend(cube, increments)
+
+    def follow(self, child):
+        """Cube grup untuk ``child``, lanjutan dari cube anak tempat cube ini dibangun
+
+        Hanya hari baru ``child`` yang dijumlah per grup (lihat ``group_areas``).
+        """
+        n = len(self.dates)
+        cube = self._grown(len(child.dates))
+        cube.moment_source = _grouped_source(child.moment_source, self.groups)
+        increments = [group_sum(np.diff(block, axis=0), self.groups, len(self.areas), axis=1)
+                      for block in child._blocks(slice(n, None))]
+        return self._extend(cube, increments)
+
+    def area_daily_means(self, column, days=slice(None)):
+        """Rata-rata harian per area (area, hari); NaN bila tidak ada data
+
+        ``days`` (slice indeks hari) membatasi hitungan ke sebagian sumbu tanggal.
+        """
+        k = STAT_COLUMNS.index(column)
+        lo, hi, _ = days.indices(len(self.dates))
+        hi = max(lo, hi)
+        sums = np.diff(self.cum_sums[lo:hi + 1, :, k], axis=0)
+        counts = np.diff(self.cum_counts[lo:hi + 1, :, k], axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan).T
+
+    def merge(self, other):
+        """Gabungkan dua cube (union sumbu tanggal dan area)"""
+        dates = self.dates.union(other.dates)
+        dates = pd.date_range(dates.min(), dates.max(), freq='D')
+        areas = list(self.areas) + [a for a in other.areas if a not in self._area_index]
+        moments = self.day_moments is not None and other.day_moments is not None
+        merged = RollupCube.empty(dates, areas, moments=moments)
+        daily = merged._blocks(slice(1, None))
+        p = len(MOMENT_COLUMNS)
+        for cube in (self, other):
+            d0 = (cube.dates[0] - dates[0]).days
+            a_idx = [merged._area_index[a] for a in cube.areas]
+            days = slice(d0, d0 + len(cube.dates))
+            for target, block in zip(daily, cube._blocks(slice(None))):
+                target[days, a_idx] += np.diff(block, axis=0)
+            if moments:
+                # Sel yang tumpang tindih digabung dengan rumus Chan, bukan dijumlah
+                target = Moments.view(merged.day_moments, p)
+                cells = np.ix_(np.arange(days.start, days.stop) + 1, a_idx)
+                target[cells] = target[cells].merge(Moments.view(cube.day_moments[1:], p))
+        merged._accumulate()
+        merged._seal_blocks()
+        return merged
+
+    def group_areas(self, groups, areas):
+        """Cube baru dengan area digabung per grup, mis. kecamatan -> kabupaten
+
+        ``groups[i]`` adalah indeks di ``areas`` untuk area ke-i cube ini (-1:
+        tidak ikut). Prefix jumlah dan cacah dijumlahkan per grup; baris data
+        tidak dibaca ulang. Momen tetap dibaca dari cube tingkat data.
+        """
+        groups = np.asarray(groups, dtype=np.int64)
+        if len(groups) != len(self.areas):
+            raise ValueError("Panjang groups harus sama dengan jumlah area cube")
+        cube = RollupCube(
+            self.dates,
+            areas,
+            *(group_sum(block, groups, len(areas), axis=1) for block in self._blocks(slice(None))),
+            moment_source=_grouped_source(self.moment_source, groups)
+        )
+        cube.groups = groups
+        return cube
+
+    def _spans(self, lo, hi, season=None):
+        """Rentang hari [awal, akhir) di dalam [lo, hi) yang masuk ``season``
+
+        Tanpa musim hasilnya satu rentang; dengan musim, satu rentang per
+        potongan musim (jumlahnya sebanding jumlah tahun, bukan jumlah hari).
+        """
+        if hi <= lo:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        if season in (None, 'Semua'):
+            return np.array([lo]), np.array([hi])
+        if self._season_edges is None:
+            self._season_edges = np.flatnonzero(self.is_dry[1:] != self.is_dry[:-1]) + 1
+        edges = self._season_edges
+        inner = edges[np.searchsorted(edges, lo, side='right'):np.searchsorted(edges, hi, side='left')]
+        bounds = np.concatenate(([lo], inner, [hi]))
+        starts, ends = bounds[:-1], bounds[1:]
+        keep = self.is_dry[starts] if season == 'Kemarau' else ~self.is_dry[starts]
+        return starts[keep], ends[keep]
+
+    def _day_range(self, start=None, end=None):
+        lo, hi = 0, len(self.dates)
+        if start is not None:
+            lo = self.dates.searchsorted(pd.Timestamp(start).normalize(), side='left')
+        if end is not None:
+            hi = self.dates.searchsorted(pd.Timestamp(end).normalize(), side='right')
+        return lo, max(lo, hi)
+
+    def area_weights(self, areas=None):
+        """Vektor bobot area 0/1 (semua area bila None)"""
+        weights = np.ones(len(self.areas))
+        if areas is not None:
+            weights[:] = 0
+            weights[[self._area_index[a] for a in areas if a in self._area_index]] = 1
+        return weights
+
+    def span_totals(self, lo, hi, weights, season=None):
+        """``WindowTotals`` hari [lo, hi) untuk area berbobot ``weights``
+
+        Dua baca prefix per potongan musim lalu satu perkalian bobot area;
+        biaya tidak bergantung pada panjang jendela maupun riwayat.
+        """
+        starts, ends = self._spans(lo, hi, season)
+        if weights.all():
+            blocks = [total[ends].sum(axis=0) - total[starts].sum(axis=0) for total in self.totals()]
+        else:
+            blocks = [weights @ (block[ends].sum(axis=0) - block[starts].sum(axis=0))
+                      for block in self._blocks(slice(None))]
+        return WindowTotals(*blocks, days=hi - lo)
+
+    def window(self, start=None, end=None, areas=None, season=None):
+        """``WindowTotals`` untuk rentang [start, end] (inklusif) dan area ``areas``"""
+        lo, hi = self._day_range(start, end)
+        return self.span_totals(lo, hi, self.area_weights(areas), season)
+
+    def select(self, areas=None, start=None, end=None, season=None):
+        """Seleksi area/rentang tanggal/musim tanpa menyalin prefix"""
+        lo, hi = self._day_range(start, end)
+        return RollupSelection(self, lo, hi, season, self.area_weights(areas))
+
+
+def _grouped_source(source, groups):
+    """``moment_source`` cube grup dari ``moment_source`` cube anaknya"""
+    if source is None:
+        return None
+    leaf, leaf_groups = source
+    return leaf, np.where(leaf_groups >= 0, groups[np.maximum(leaf_groups, 0)], -1)
+
+
+def _moment_partitions(starts, ends, size=MOMENT_BLOCK_DAYS):
+    """Indeks hari dan indeks blok momen yang tepat menutup rentang [starts, ends)
+
+    Blok penuh di dalam setiap rentang dibaca sebagai satu partisi; hari sisa
+    di kedua tepi (masing-masing kurang dari ``size``) dibaca per hari.
+    """
+    days, blocks = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for lo, hi in zip(starts, ends):
+        first, last = -(-lo // size), hi // size
+        if first < last:
+            days += [np.arange(lo, first * size), np.arange(last * size, hi)]
+            blocks.append(np.arange(first, last))
+        else:
+            days.append(np.arange(lo, hi))
+    return np.concatenate(days), np.concatenate(blocks)
+
+
+# Pilihan periode pembanding metrik header
+COMPARISONS = ['Periode sebelumnya', 'Periode sama tahun lalu', '7 hari terakhir', '30 hari bergulir']
+
+
+def comparison_windows(mode, start, end):
+    """((mulai, akhir) periode kini, (mulai, akhir) pembanding) untuk ``mode``
+
+    Periode sebelumnya: rentang sama panjang tepat sebelum ``start``. Tahun
+    lalu: rentang yang sama digeser satu tahun. 7/30 hari: jendela yang
+    berakhir di ``end`` dibanding jendela sama panjang sebelumnya.
+    """
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    day = pd.Timedelta(days=1)
+    if mode == '7 hari terakhir':
+        start = end - 6 * day
+    elif mode == '30 hari bergulir':
+        start = end - 29 * day
+    elif mode not in COMPARISONS:
+        raise ValueError(f"Periode pembanding tidak dikenal: {mode}")
+    if mode == 'Periode sama tahun lalu':
+        year = pd.DateOffset(years=1)
+        return (start, end), (start - year, end - year)
+    length = end - start + day
+    return (start, end), (start - length, start - day)
+
+
+class WindowTotals:
+    """Jumlah, cacah dan cacah risiko satu jendela waktu (lihat ``RollupCube.span_totals``)
+
+    ``days`` adalah jumlah hari jendela yang ada di sumbu cube.
+    """
+
+    def __init__(self, sums, counts, risk_counts, days=0):
+        self.days = days
+        self.sums = sums
+        self.counts = counts
+        self.risk = risk_counts
+
+    @property
+    def row_count(self):
+        return int(round(self.risk.sum()))
+
+    def total(self, column):
+        return self.sums[STAT_COLUMNS.index(column)]
+
+    def mean(self, column):
+        k = STAT_COLUMNS.index(column)
+        return self.sums[k] / self.counts[k] if self.counts[k] > 0 else np.nan
+
+    def risk_count(self, levels):
+        """Cacah baris dengan tingkat risiko di ``levels``"""
+        return int(round(sum(self.risk[RISK_LEVELS.index(level)] for level in levels)))
+
+
+def _area_sum(block, weights):
+    """Jumlah sepanjang sumbu area (kedua) untuk area berbobot 1: (hari, area, k) -> (hari, k)"""
+    selected = np.flatnonzero(weights)
+    if len(selected) == len(weights):
+        return block.sum(axis=1)
+    return block[:, selected].sum(axis=1)
+
+
+class RollupSelection:
+    """Hasil seleksi cube; semua agregat dihitung dari selisih prefix
+
+    Sumbu tanggal dipotong sebagai view (``lo:hi``), musim sebagai potongan
+    rentang hari dan area sebagai vektor bobot 0/1, sehingga tidak ada
+    salinan blok cube. Total dan rata-rata seluruh seleksi hanya membaca
+    baris prefix di batas rentang.
+    """
+
+    def __init__(self, cube, lo, hi, season, area_weights):
+        self.cube = cube
+        self.lo = lo
+        self.hi = hi
+        self.season = None if season == 'Semua' else season
+        self.area_weights = area_weights
+        self._per_day = None
+        self._totals = None
+        self._moments = None
+
+    @property
+    def day_mask(self):
+        """Mask hari [lo, hi) yang masuk musim terpilih"""
+        is_dry = self.cube.is_dry[self.lo:self.hi]
+        if self.season == 'Kemarau':
+            return is_dry
+        if self.season == 'Hujan':
+            return ~is_dry
+        return np.ones(self.hi - self.lo, dtype=bool)
+
+    def totals(self):
+        """``WindowTotals`` seluruh seleksi"""
+        if self._totals is None:
+            self._totals = self.cube.span_totals(self.lo, self.hi, self.area_weights, self.season)
+        return self._totals
+
+    def per_day(self):
+        """Partial per hari (jumlah, cacah, cacah risiko) lintas area terpilih"""
+        if self._per_day is None:
+            rows = slice(self.lo, self.hi + 1)
+            if self.area_weights.all():
+                cums = [total[rows] for total in self.cube.totals()]
+            else:
+                cums = [_area_sum(block, self.area_weights) for block in self.cube._blocks(rows)]
+            sums, counts, risk = (np.diff(cum, axis=0) for cum in cums)
+            has_rows = self.day_mask & (risk.sum(axis=1) > 0)
+            self._per_day = (sums, counts, risk, has_rows)
+        return self._per_day
+
+    @property
+    def dates(self):
+        return self.cube.dates[self.lo:self.hi]
+
+    def total(self, column):
+        """Setara ``filtered_df[column].sum()``"""
+        return self.totals().total(column)
+
+    def mean(self, column):
+        """Setara ``filtered_df[column].mean()`` (NaN bila seleksi kosong)"""
+        return self.totals().mean(column)
+
+    def moments(self):
+        """``Moments`` gabungan ``MOMENT_COLUMNS`` untuk seluruh seleksi"""
+        if self._moments is None:
+            if self.cube.moment_source is None:
+                raise ValueError("Cube tanpa momen")
+            leaf, leaf_groups = self.cube.moment_source
+            # Area daun yang grupnya terpilih di tingkat cube ini
+            areas = np.flatnonzero((leaf_groups >= 0) & (self.area_weights[np.maximum(leaf_groups, 0)] > 0))
+            starts, ends = self.cube._spans(self.lo, self.hi, self.season)
+            days, blocks = _moment_partitions(starts, ends)
+            parts = np.concatenate([leaf.day_moments[np.ix_(days + 1, areas)],
+                                    leaf.block_moments[np.ix_(blocks, areas)]])
+            self._moments = Moments.view(parts.reshape(-1, parts.shape[-1]), len(MOMENT_COLUMNS)).reduce()
+        return self._moments
+
+    def corr(self, columns=MOMENT_COLUMNS):
+        """Setara ``filtered_df[columns].corr()`` dari momen gabungan"""
+        idx = [MOMENT_COLUMNS.index(c) for c in columns]
+        corr = self.moments().corr()[np.ix_(idx, idx)]
+        return pd.DataFrame(corr, index=list(columns), columns=list(columns))
+
+    @property
+    def row_count(self):
+        return self.totals().row_count
+
+    def daily(self, aggs):
+        """Setara ``filtered_df.groupby('tanggal').agg(aggs).reset_index()``"""
+        sums, counts, _, has_rows = self.per_day()
+        out = {'tanggal': self.dates[has_rows]}
+        for col, how in aggs.items():
+            k = STAT_COLUMNS.index(col)
+            if how == 'sum':
+                out[col] = sums[has_rows, k]
+            elif how == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    out[col] = sums[has_rows, k] / counts[has_rows, k]
+            else:
+                raise ValueError(f"Agregasi tidak didukung: {how}")
+        return pd.DataFrame(out)
+
+    def area_daily(self, aggs):
+        """Setara ``filtered_df.groupby(['tanggal', 'area']).agg(aggs).reset_index()``"""
+        cube = self.cube
+        days = np.flatnonzero(self.day_mask) + self.lo
+        areas = np.flatnonzero(self.area_weights > 0)
+        rows = (cube.cum_risk[np.ix_(days + 1, areas)] - cube.cum_risk[np.ix_(days, areas)]).sum(axis=2)
+        # Urutan tanggal lalu area; sel tanpa baris tidak ikut
+        day_pos, area_pos = np.nonzero(rows > 0)
+        day, area = days[day_pos], areas[area_pos]
+        out = {
+            'tanggal': cube.dates[day],
+            'area': np.asarray(cube.areas, dtype=object)[area]
+        }
+        for col, how in aggs.items():
+            k = STAT_COLUMNS.index(col)
+            sums = cube.cum_sums[day + 1, area, k] - cube.cum_sums[day, area, k]
+            if how == 'sum':
+                out[col] = sums
+            elif how == 'mean':
+                counts = cube.cum_counts[day + 1, area, k] - cube.cum_counts[day, area, k]
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    out[col] = sums / counts
+            else:
+                raise ValueError(f"Agregasi tidak didukung: {how}")
+        return pd.DataFrame(out)
+
+    def by_season(self, columns):
+        """Setara ``filtered_df.groupby('musim')[columns].mean().reset_index()``"""
+        rows = []
+        # Urutan alfabet seperti groupby: Hujan, Kemarau
+        for musim in ('Hujan', 'Kemarau'):
+            if self.season not in (None, musim):
+                continue
+            totals = self.cube.span_totals(self.lo, self.hi, self.area_weights, musim)
+            if not totals.row_count:
+                continue
+            rows.append({'musim': musim, **{col: totals.mean(col) for col in columns}})
+        return pd.DataFrame(rows, columns=['musim'] + list(columns))
+
+    def area_risk_counts(self):
+        """Setara ``groupby(['area', 'tingkat_risiko']).size().unstack(fill_value=0)``"""
+        cum = self.cube.cum_risk
+        starts, ends = self.cube._spans(self.lo, self.hi, self.season)
+        counts = cum[ends].sum(axis=0) - cum[starts].sum(axis=0)
+        selected = self.area_weights > 0
+        table = pd.DataFrame(
+            counts[selected].astype(np.int64),
+            index=pd.Index(np.asarray(self.cube.areas, dtype=object)[selected], name='area'),
+            columns=pd.Index(RISK_LEVELS, name='tingkat_risiko')
+        )
+        table = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+        return table.sort_index().sort_index(axis=1)
+
+    def risk_counts(self):
+        """Setara ``filtered_df['tingkat_risiko'].value_counts()``"""
+        series = pd.Series(self.totals().risk.astype(np.int64), index=pd.Index(RISK_LEVELS, name='tingkat_risiko'), name='count')
+        return series[series > 0].sort_values(ascending=False, kind='stable')
@@ -0,0 +1,131 @@
+"""Skema dtype ringkas untuk DataFrame dashboard
+
+Jalankan ``python -m titik_panas.schema`` untuk laporan byte per kolom
+sebelum dan sesudah skema pada data mock berukuran tertentu.
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .filtering import SEASONS
+from .generator import COLUMNS, RISK_LEVELS, generate_pontianak_data, synthetic_areas
+
+# Label berulang per baris disimpan sebagai kategori (kode int8 + kamus);
+# kategori area dibentuk dari data
+CATEGORY_DTYPES = {
+    'area': pd.CategoricalDtype(),
+    'tingkat_risiko': pd.CategoricalDtype(RISK_LEVELS),
+    'musim': pd.CategoricalDtype(SEASONS)
+}
+
+# Nilai cuaca dan indeks turunan: presisi float32 (~7 digit) jauh di atas
+# presisi alat ukur dan tampilan dashboard (1 desimal)
+FLOAT32_COLUMNS = [
+    'curah_hujan', 'sinaran_matahari', 'kecepatan_angin', 'arah_angin',
+    'suhu', 'kelembaban', 'ffmc', 'fwi', 'skor_risiko'
+]
+
+# Cacah dan indeks bulat; dilebarkan otomatis bila nilai melebihi rentang
+INT16_COLUMNS = ['titik_panas', 'ispu']
+
+# Koordinat tetap float64 (dipakai grid deteksi dan viewport peta)
+FLOAT64_COLUMNS = ['latitude', 'longitude']
+
+DATE_DTYPE = 'datetime64[ns]'
+
+INT_WIDENING = [np.int16, np.int32, np.int64]
+
+
+def _fit_int(values, dtype=np.int16):
+    """Dtype int terkecil mulai ``dtype`` yang memuat semua nilai"""
+    if len(values) == 0:
+        return dtype
+    lo, hi = values.min(), values.max()
+    for candidate in INT_WIDENING[INT_WIDENING.index(dtype):]:
+        info = np.iinfo(candidate)
+        if info.min <= lo and hi <= info.max:
+            return candidate
+    return np.int64
+
+
+def schema_dtypes(df):
+    """Dtype target per kolom ``df`` (hanya kolom yang dikenal skema)"""
+    dtypes = {}
+    for col in df.columns:
+        if col == 'tanggal':
+            dtypes[col] = DATE_DTYPE
+        elif col in CATEGORY_DTYPES:
+            dtypes[col] = CATEGORY_DTYPES[col]
+        elif col in FLOAT32_COLUMNS:
+            dtypes[col] = np.float32
+        elif col in INT16_COLUMNS:
+            dtypes[col] = _fit_int(df[col].to_numpy(), np.int16)
+        elif col in FLOAT64_COLUMNS:
+            dtypes[col] = np.float64
+    return dtypes
+
+
+def apply_schema(df):
+    """Ubah kolom ``df`` ke dtype ringkas; kolom yang sudah sesuai tidak disalin"""
+    if len(df) == 0 and len(df.columns) == 0:
+        return df
+    changes = {}
+    for col, dtype in schema_dtypes(df).items():
+        if col in CATEGORY_DTYPES:
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and (
+                    dtype.categories is None or list(df[col].cat.categories) == list(dtype.categories)):
+                continue
+        elif df[col].dtype == dtype:
+            continue
+        if col in CATEGORY_DTYPES and dtype.categories is None:
+            # Kategori mengikuti urutan kemunculan (urutan area di sidebar), bukan abjad
+            changes[col] = pd.Categorical(df[col], categories=pd.unique(df[col].dropna()))
+        else:
+            changes[col] = df[col].astype(dtype)
+    return df.assign(**changes) if changes else df
+
+
+def memory_report(df):
+    """Byte per kolom (termasuk isi string/kamus kategori) dan byte per baris"""
+    usage = df.memory_usage(index=False, deep=True)
+    rows = max(len(df), 1)
+    report = pd.DataFrame({
+        'kolom': usage.index,
+        'dtype': [str(df[col].dtype) for col in usage.index],
+        'bytes': usage.to_numpy(np.int64),
+    })
+    report['bytes_per_baris'] = (report['bytes'] / rows).round(2)
+    total = pd.DataFrame({'kolom': ['total'], 'dtype': [''], 'bytes': [int(usage.sum())],
+                          'bytes_per_baris': [round(usage.sum() / rows, 2)]})
+    return pd.concat([report, total], ignore_index=True)
+
+
+def compare_report(df):
+    """Laporan byte per kolom sebelum dan sesudah ``apply_schema``"""
+    before = memory_report(df)
+    after = memory_report(apply_schema(df))
+    report = before.merge(after, on='kolom', suffixes=('_awal', '_ringkas'))
+    report['rasio'] = (report['bytes_awal'] / report['bytes_ringkas'].clip(lower=1)).round(2)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laporan memori skema dtype ringkas")
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--areas', type=int, default=0,
+                        help="Jumlah area sintetis (0: 6 kecamatan Pontianak)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    areas, coords = synthetic_areas(args.areas, rng=args.seed) if args.areas else (None, None)
+    df = generate_pontianak_data(args.days, rng=args.seed, areas=areas, area_coords=coords)[COLUMNS]
+    report = compare_report(df)
+    print(f"{len(df):,} baris")
+    print(report.to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,352 @@
+"""Mode produksi dashboard: worker pra-panas, proxy lokal dan cek kesehatan
+
+Setiap worker adalah proses Streamlit di port berurutan. Sebelum server
+menerima koneksi, worker menjalankan script dashboard sekali secara
+headless (``streamlit.testing``) sehingga dataset, cube rollup, registri
+wilayah dan cache lain yang dipakai render pertama sudah terisi di proses
+tersebut. Fase cold-start (import, muat data, render pertama) ditulis ke
+file status per worker, begitu pula apakah rerun pertama sesi nyata memakai
+cache hasil pra-panas (``first_session``, dari ``profiling.cache_loads``). Proxy TCP lokal meneruskan koneksi (termasuk
+websocket) ke worker yang siap dengan afinitas per IP klien dan melayani
+``/healthz``.
+
+Dijalankan lewat ``run_dashboard_Version2.py --prod``.
+"""
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+DEFAULT_PORT = 8501
+DEFAULT_STATUS_DIR = os.path.join('logs', 'serve')
+HEALTH_PATH = '/healthz'
+
+# Endpoint kesehatan bawaan Streamlit (hanya menjawab setelah server berjalan)
+STREAMLIT_HEALTH = '/_stcore/health'
+
+HEALTH_INTERVAL = 2.0
+READY_TIMEOUT = 600
+WARM_TIMEOUT = 600
+
+
+def status_path(status_dir, port):
+    return os.path.join(status_dir, f'worker-{port}.json')
+
+
+def write_status(path, status):
+    """Tulis status worker secara atomik"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(status, f)
+    os.replace(tmp, path)
+
+
+def read_statuses(status_dir):
+    statuses = []
+    for path in sorted(glob.glob(os.path.join(status_dir, 'worker-*.json'))):
+        try:
+            with open(path, encoding='utf-8') as f:
+                statuses.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return statuses
+
+
+def _warm_data_ms(log_path):
+    """Durasi bagian 'muat' pada rerun pra-panas dari log profiling"""
+    from .profiling import read_log
+
+    records = read_log(log_path)
+    records = records[records['section'] == 'muat']
+    return float(records['ms'].iloc[-1]) if len(records) else None
+
+
+def run_worker(script, port, address='0.0.0.0', status_file=None):
+    """Pra-panas cache lalu jalankan server Streamlit di proses ini"""
+    status_file = status_file or status_path(DEFAULT_STATUS_DIR, port)
+    status = {'port': port, 'pid': os.getpid(), 'ready': False, 'phase': 'import', 'phases': {}}
+    write_status(status_file, status)
+    started = time.perf_counter()
+
+    # Fase import: pustaka berat dan modul dashboard
+    import plotly.express  # noqa: F401
+    import streamlit  # noqa: F401
+    from streamlit.testing.v1 import AppTest
+    from streamlit.web import cli as stcli
+
+    from . import views  # noqa: F401
+    from .profiling import cache_loads
+    status['phases']['import_s'] = round(time.perf_counter() - started, 3)
+
+    # Render pertama headless: cache_resource dipakai bersama oleh server di
+    # proses yang sama (kunci cache = modul, nama dan source fungsi)
+    status['phase'] = 'warm'
+    write_status(status_file, status)
+    warm_log = os.path.join(os.path.dirname(status_file), f'warm-{port}.jsonl')
+    if os.path.exists(warm_log):
+        os.remove(warm_log)
+    os.environ['TITIK_PANAS_PROFILE'] = '1'
+    os.environ['TITIK_PANAS_PROFILE_LOG'] = warm_log
+    render_started = time.perf_counter()
+    try:
+        app = AppTest.from_file(os.path.abspath(script), default_timeout=WARM_TIMEOUT)
+        app.run()
+        if app.exception:
+            status['error'] = '; '.join(str(e.value) for e in app.exception)
+    except Exception as exc:
+        status['error'] = f'{type(exc).__name__}: {exc}'
+    finally:
+        os.environ.pop('TITIK_PANAS_PROFILE')
+        os.environ.pop('TITIK_PANAS_PROFILE_LOG')
+    render_s = time.perf_counter() - render_started
+    data_ms = _warm_data_ms(warm_log) if os.path.exists(warm_log) else None
+    if data_ms is not None:
+        status['phases']['data_s'] = round(data_ms / 1000, 3)
+        status['phases']['first_render_s'] = round(render_s - data_ms / 1000, 3)
+    else:
+        status['phases']['first_render_s'] = round(render_s, 3)
+    status['phases']['total_s'] = round(time.perf_counter() - started, 3)
+
+    # Server dimulai setelah pra-panas: /_stcore/health siap = cache siap.
+    # Rerun pertama sesi nyata mencatat apakah dataset dan cube wilayah hasil
+    # pra-panas benar-benar dipakai ulang (tanpa cache miss baru)
+    status['warm_loads'] = dict(cache_loads.counts)
+
+    def first_session(report):
+        status['first_session'] = report
+        write_status(status_file, status)
+        state = 'memakai cache pra-panas' if report['reused'] else f"memuat ulang {', '.join(report['reloaded'])}"
+        print(f"[worker {port}] sesi pertama {state}", flush=True)
+
+    cache_loads.seal(first_session)
+    status['phase'] = 'serve'
+    status['ready'] = True
+    write_status(status_file, status)
+    sys.argv = [
+        'streamlit', 'run', script,
+        '--server.port', str(port),
+        '--server.address', address,
+        '--server.headless', 'true'
+    ]
+    return stcli.main()
+
+
+def backend_healthy(host, port, timeout=2.0):
+    """True bila endpoint kesehatan Streamlit worker menjawab 200"""
+    try:
+        with urllib.request.urlopen(f'http://{host}:{port}{STREAMLIT_HEALTH}', timeout=timeout) as resp:
+            return resp.status == 200
+    except OSError:
+        return False
+
+
+class Balancer:
+    """Proxy TCP lokal ke beberapa worker Streamlit
+
+    Kepala request HTTP dibaca untuk melayani ``/healthz`` dan menentukan
+    IP klien (``X-Forwarded-For`` bila ada); sisanya diteruskan apa adanya,
+    sehingga upgrade websocket Streamlit ikut diteruskan. Klien dipetakan ke
+    worker siap dengan hash IP agar sesi tetap di worker yang sama.
+    """
+
+    def __init__(self, backends, status_dir=DEFAULT_STATUS_DIR, host='127.0.0.1'):
+        self.backends = list(backends)
+        self.status_dir = status_dir
+        self.host = host
+        self.ready = []
+
+    async def _check(self):
+        while True:
+            results = await asyncio.gather(*(
+                asyncio.to_thread(backend_healthy, host, port) for host, port in self.backends
+            ))
+            self.ready = [backend for backend, ok in zip(self.backends, results) if ok]
+            await asyncio.sleep(HEALTH_INTERVAL)
+
+    def health(self):
+        """(status HTTP, isi JSON) untuk /healthz: 200 bila ada worker siap"""
+        ready_ports = {port for _, port in self.ready}
+        workers = []
+        for status in read_statuses(self.status_dir):
+            if any(status['port'] == port for _, port in self.backends):
+                workers.append({**status, 'healthy': status['port'] in ready_ports})
+        body = {'ready': bool(self.ready), 'ready_workers': len(self.ready),
+                'workers': workers}
+        return (200 if self.ready else 503), body
+
+    def pick(self, client):
+        if not self.ready:
+            return None
+        digest = hashlib.blake2b(client.encode(), digest_size=8).digest()
+        return self.ready[int.from_bytes(digest, 'big') % len(self.ready)]
+
+    async def _respond(self, writer, code, body):
+        payload = json.dumps(body).encode()
+        reason = 'OK' if code == 200 else 'Service Unavailable'
+        writer.write(
+            f'HTTP/1.1 {code} {reason}\r\nContent-Type: application/json\r\n'
+            f'Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n'.encode() + payload
+        )
+        await writer.drain()
+        writer.close()
+
+    async def _pipe(self, reader, writer):
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = head.decode('latin-1').split('\r\n')
+        path = lines[0].split(' ')[1] if len(lines[0].split(' ')) > 1 else '/'
+        if path.split('?')[0] == HEALTH_PATH:
+            await self._respond(writer, *self.health())
+            return
+        client = writer.get_extra_info('peername')[0]
+        for line in lines[1:]:
+            if line.lower().startswith('x-forwarded-for:'):
+                client = line.split(':', 1)[1].split(',')[0].strip()
+        backend = self.pick(client)
+        if backend is None:
+            await self._respond(writer, *self.health())
+            return
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(*backend)
+        except OSError:
+            await self._respond(writer, 503, {'ready': False, 'error': f'worker {backend[1]} tidak terjangkau'})
+            return
+        upstream_writer.write(head)
+        await asyncio.gather(self._pipe(reader, upstream_writer), self._pipe(upstream_reader, writer))
+
+    async def serve(self, port, address='0.0.0.0'):
+        server = await asyncio.start_server(self.handle, address, port)
+        checker = asyncio.create_task(self._check())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            checker.cancel()
+
+
+def wait_ready(procs, status_dir, ports, timeout=READY_TIMEOUT):
+    """Tunggu semua worker siap (atau keluar); kembalikan status per port"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        statuses = {s['port']: s for s in read_statuses(status_dir)}
+        pending = [
+            port for proc, port in zip(procs, ports)
+            if proc.poll() is None and not (statuses.get(port, {}).get('ready') and backend_healthy('127.0.0.1', port))
+        ]
+        if not pending:
+            return statuses
+        time.sleep(0.5)
+    return {s['port']: s for s in read_statuses(status_dir)}
+
+
+def format_cold_start(statuses):
+    """Tabel fase cold-start per worker"""
+    lines = [f"{'port':>6} {'import':>8} {'data':>8} {'render':>8} {'total':>8}  status"]
+    for port, status in sorted(statuses.items()):
+        phases = status.get('phases', {})
+        cells = [phases.get(key) for key in ('import_s', 'data_s', 'first_render_s', 'total_s')]
+        state = 'siap' if status.get('ready') else status.get('phase', '?')
+        if status.get('error'):
+            state += f" (galat render: {status['error'][:80]})"
+        first = status.get('first_session')
+        if first is not None:
+            state += ', sesi 1 memakai cache' if first['reused'] else f", sesi 1 memuat ulang {'/'.join(first['reloaded'])}"
+        lines.append(f"{port:>6} " + ' '.join(
+            f"{'-' if c is None else f'{c:.2f}s':>8}" for c in cells
+        ) + f"  {state}")
+    return '\n'.join(lines)
+
+
+def launch(script, workers=1, port=DEFAULT_PORT, address='0.0.0.0', proxy_port=None,
+           status_dir=DEFAULT_STATUS_DIR):
+    """Jalankan ``workers`` worker pra-panas di port berurutan (+ proxy opsional)"""
+    ports = [port + i for i in range(workers)]
+    # SIGTERM (mis. dari orkestrator container) ikut menghentikan semua worker
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    for path in glob.glob(os.path.join(status_dir, 'worker-*.json')):
+        os.remove(path)
+    # Dengan proxy, worker cukup mendengarkan di loopback
+    worker_address = '127.0.0.1' if proxy_port else address
+    procs = [
+        subprocess.Popen([
+            sys.executable, '-m', 'titik_panas.serve', 'worker', script,
+            '--port', str(p), '--address', worker_address, '--status', status_path(status_dir, p)
+        ])
+        for p in ports
+    ]
+    try:
+        statuses = wait_ready(procs, status_dir, ports)
+        print("⏱️  Cold start per worker:")
+        print(format_cold_start(statuses))
+        if proxy_port:
+            print(f"🔀 Proxy di http://{address}:{proxy_port} → port {ports[0]}-{ports[-1]}, "
+                  f"cek kesehatan di {HEALTH_PATH}")
+            asyncio.run(Balancer([('127.0.0.1', p) for p in ports], status_dir).serve(proxy_port, address))
+        else:
+            print(f"✅ Dashboard siap di port {ports[0]}-{ports[-1]} ({STREAMLIT_HEALTH})")
+            for proc in procs:
+                proc.wait()
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+def check(url):
+    """Cek kesehatan untuk probe container: 0 bila siap"""
+    try:
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            body = json.loads(resp.read() or b'{}')
+            print(json.dumps(body, indent=2))
+            return 0 if resp.status == 200 else 1
+    except OSError as exc:
+        print(f"Tidak siap: {exc}")
+        return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mode produksi dashboard titik panas")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    worker = sub.add_parser('worker', help="Satu worker pra-panas (dipakai oleh launch)")
+    worker.add_argument('script')
+    worker.add_argument('--port', type=int, default=DEFAULT_PORT)
+    worker.add_argument('--address', default='0.0.0.0')
+    worker.add_argument('--status')
+
+    health = sub.add_parser('check', help="Cek /healthz proxy atau /_stcore/health worker")
+    health.add_argument('--url', default=f'http://127.0.0.1:{DEFAULT_PORT - 1}{HEALTH_PATH}')
+
+    args = parser.parse_args(argv)
+    if args.command == 'worker':
+        return run_worker(args.script, args.port, args.address, args.status)
+    return check(args.url)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
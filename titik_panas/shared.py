@@ -0,0 +1,235 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+DEFAULT_BUDGET = 512 * 2 ** 20
+
+
+def _root(array):
+    """Array numpy pemilik memori di balik view ``array``"""
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def _buffers(values):
+    """(alamat, byte) buffer memori yang dipegang satu kolom"""
+    if isinstance(values, pd.Categorical):
+        yield from _buffers(values.codes)
+        yield from _buffers(values.categories.array)
+    elif isinstance(values, pd.arrays.ArrowExtensionArray):
+        for chunk in pa.chunked_array(values).chunks:
+            yield from ((buffer.address, buffer.size) for buffer in chunk.buffers() if buffer is not None)
+    elif isinstance(values, np.ndarray) and values.dtype != object:
+        root = _root(values)
+        yield root.__array_interface__['data'][0], root.nbytes
+    else:
+        values = pd.Series(values, copy=False)
+        yield id(values.array), int(values.memory_usage(index=False, deep=True))
+
+
+def table_buffers(table):
+    """Alamat semua buffer tabel Arrow"""
+    return {
+        buffer.address
+        for column in table.columns for chunk in column.chunks
+        for buffer in chunk.buffers() if buffer is not None
+    }
+
+
+def frame_bytes(df, exclude=frozenset()):
+    """Byte memori yang dipegang DataFrame, setiap buffer dihitung sekali
+
+    View (mis. hasil ``iloc``) dihitung seukuran buffer pemiliknya karena
+    view menahan seluruh buffer itu tetap hidup; buffer yang alamatnya ada
+    di ``exclude`` (mis. tabel Arrow bersama) tidak dihitung.
+    """
+    seen = {}
+    for name in df.columns:
+        column = df[name]
+        # Kolom berdtype numpy (termasuk datetime64): ``to_numpy`` tanpa salinan
+        values = column.to_numpy() if isinstance(column.dtype, np.dtype) else column.array
+        for address, size in _buffers(values):
+            if address not in exclude:
+                seen[address] = max(size, seen.get(address, 0))
+    return sum(seen.values())
+
+
+class SharedDataset:
+    """Dataset read-only bersama semua sesi dalam satu proses
+
+    Setiap versi data dipublikasikan sebagai tabel Arrow per segmen
+    ``FilterIndex``; sesi membaca view pandas zero-copy di atas buffer Arrow
+    tersebut, bukan salinan per sesi seperti ``st.cache_data``. Segmen yang
+    sudah dipublikasikan versi sebelumnya dipakai ulang, sehingga publish
+    setelah append hanya mengonversi segmen baru. Bila total tabel melebihi
+    ``budget`` byte, segmen terbesar ditulis ke file Arrow IPC dan dibaca
+    lewat memory map sehingga halamannya berada di page cache (dibagi juga
+    antar proses worker), bukan di heap. Struktur turunan di heap (cube
+    rollup dan prefixnya, cube tingkat wilayah) didaftarkan lewat ``track``
+    dan ikut dihitung dalam budget.
+    Sisa budget dipakai cache LRU potongan hasil filter yang juga dibagi
+    antar sesi. ``publish`` menukar versi secara atomik; sesi yang masih
+    memegang view versi lama tetap konsisten sampai rerun berikutnya.
+
+    Frame yang dikembalikan tidak boleh diubah di tempat; dengan
+    copy-on-write pandas, perubahan hanya mengenai salinan milik pemanggil.
+    """
+
+    def __init__(self, budget=DEFAULT_BUDGET, spill_dir=None):
+        self.budget = budget
+        self.spill_dir = spill_dir
+        self.version = None
+        # Per segmen: (tabel Arrow, view pandas, path file memory map atau None)
+        self.parts = []
+        self._table_buffers = frozenset()
+        # Byte struktur turunan per nama (lihat ``track``)
+        self._derived = {}
+        self._slices = OrderedDict()
+        self._slices_version = None
+        self._slice_bytes = 0
+        self._stale_files = []
+        self._lock = threading.Lock()
+
+    @property
+    def frames(self):
+        return [view for _, view, _ in self.parts]
+
+    @property
+    def table_bytes(self):
+        return sum(table.nbytes for table, _, _ in self.parts)
+
+    @property
+    def derived_bytes(self):
+        return sum(self._derived.values())
+
+    @property
+    def resident_bytes(self):
+        """Byte di heap: tabel yang tidak di-memory map + struktur turunan + cache potongan"""
+        table_bytes = sum(table.nbytes for table, _, path in self.parts if path is None)
+        return table_bytes + self.derived_bytes + self._slice_bytes
+
+    def track(self, name, nbytes):
+        """Catat byte struktur turunan ``name`` (menggantikan nilai sebelumnya)"""
+        with self._lock:
+            self._derived[name] = int(nbytes)
+
+    def _spill(self, version, table):
+        """Tulis tabel ke file Arrow IPC lalu buka kembali lewat memory map"""
+        spill_dir = self.spill_dir or tempfile.gettempdir()
+        os.makedirs(spill_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix=f'titik_panas-v{version}-', suffix='.arrow', dir=spill_dir)
+        with os.fdopen(fd, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return ipc.open_file(pa.memory_map(path)).read_all(), path
+
+    def _remove_stale(self):
+        # File yang sedang di-map dapat langsung dihapus di POSIX (map tetap
+        # berlaku sampai dilepas); di Windows penghapusan dicoba lagi nanti
+        remaining = []
+        for path in self._stale_files:
+            try:
+                os.remove(path)
+            except OSError:
+                remaining.append(path)
+        self._stale_files = remaining
+
+    def publish(self, version, frames, derived=None):
+        """Publikasikan ``frames`` (satu per segmen) sebagai versi baru
+
+        Mengembalikan daftar view zero-copy dengan urutan yang sama. Frame
+        yang merupakan view hasil publish sebelumnya tidak dikonversi ulang.
+        ``derived`` ({nama: byte}, lihat ``track``) dicatat bersama versi
+        baru dan dikurangkan dari budget tabel di heap.
+        """
+        with self._lock:
+            published = {id(part[1]): part for part in self.parts}
+            derived_bytes = sum({**self._derived, **(derived or {})}.values())
+        parts = []
+        for frame in frames:
+            part = published.get(id(frame))
+            if part is None:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                # Kolom numerik tanpa null dipetakan langsung ke buffer Arrow
+                part = (table, table.to_pandas(split_blocks=True), None)
+            parts.append(part)
+        # Segmen terbesar di heap dipindah ke memory map sampai total muat budget
+        resident = sum(table.nbytes for table, _, path in parts if path is None)
+        spilled = []
+        for i in sorted(range(len(parts)), key=lambda i: -parts[i][0].nbytes):
+            if resident + derived_bytes <= self.budget:
+                break
+            table, _, path = parts[i]
+            if path is None:
+                resident -= table.nbytes
+                table, path = self._spill(version, table)
+                parts[i] = (table, table.to_pandas(split_blocks=True), path)
+                spilled.append(path)
+        buffers = frozenset().union(*(table_buffers(table) for table, _, _ in parts))
+        with self._lock:
+            self.version, self.parts, self._table_buffers = version, parts, buffers
+            self._derived.update(derived or {})
+            self._drop_slices(version)
+            self._stale_files.extend(spilled)
+            self._remove_stale()
+        return [view for _, view, _ in parts]
+
+    def snapshot(self):
+        """(version, frames) yang konsisten"""
+        with self._lock:
+            return self.version, self.frames
+
+    def _drop_slices(self, version):
+        if version != self._slices_version:
+            self._slices.clear()
+            self._slice_bytes = 0
+            self._slices_version = version
+
+    def get(self, version, key, loader):
+        """Potongan data ``key`` pada ``version``; ``loader()`` hanya saat cache miss
+
+        Hasil disimpan bila muat di sisa budget (LRU); versi baru membuang
+        semua potongan versi lama. View di atas tabel bersama hanya dihitung
+        seukuran buffer miliknya sendiri (lihat ``frame_bytes``).
+        """
+        with self._lock:
+            if version == self._slices_version and key in self._slices:
+                self._slices.move_to_end(key)
+                return self._slices[key][0]
+        frame = loader()
+        size = frame_bytes(frame, exclude=self._table_buffers)
+        with self._lock:
+            if version != self._slices_version:
+                if self._slices_version is not None and version < self._slices_version:
+                    # Sesi lama: jangan menimpa cache versi yang lebih baru
+                    return frame
+                self._drop_slices(version)
+            if key not in self._slices and size <= self.budget - self.resident_bytes + self._slice_bytes:
+                while self._slices and self.resident_bytes + size > self.budget:
+                    _, (_, evicted) = self._slices.popitem(last=False)
+                    self._slice_bytes -= evicted
+                self._slices[key] = (frame, size)
+                self._slice_bytes += size
+        return frame
+
+    def memory_report(self):
+        """Ringkasan pemakaian memori dataset bersama"""
+        with self._lock:
+            return {
+                'version': self.version,
+                'rows': sum(table.num_rows for table, _, _ in self.parts),
+                'segments': len(self.parts),
+                'table_bytes': self.table_bytes,
+                'mapped': sum(path is not None for _, _, path in self.parts),
+                'derived_bytes': self.derived_bytes,
+                'slices': len(self._slices),
+                'slice_bytes': self._slice_bytes,
+                'resident_bytes': self.resident_bytes,
+                'budget': self.budget
+            }
@@ -0,0 +1,679 @@
+import copy
+import io
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .generator import (
+    AREA_COORDS,
+    COLUMNS,
+    DRY_MONTHS,
+    classify_risk,
+    compute_risk_score,
+    generate_pontianak_data,
+)
+from .fwi import FireWeatherEngine
+from .ispu import (
+    AVERAGING_HOURS,
+    POLLUTANTS,
+    IspuEngine,
+    daily_ispu,
+    ispu_from_concentrations,
+    smoke_concentrations,
+)
+from .regions import RegionRegistry
+from .schema import apply_schema
+from .spatial import assign_areas, simulate_detections
+
+# Kolom cuaca yang dirata-rata per area per hari
+WEATHER_COLUMNS = ['curah_hujan', 'sinaran_matahari', 'kecepatan_angin', 'suhu', 'kelembaban']
+
+# Pemetaan kolom ekspor deteksi satelit (mis. FIRMS) ke skema dashboard
+HOTSPOT_COLUMN_MAP = {
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'acq_date': 'tanggal',
+    'tanggal': 'tanggal',
+    'area': 'area',
+}
+
+# Pemetaan kolom ekspor data harian BMKG ke skema dashboard
+BMKG_COLUMN_MAP = {
+    'Tanggal': 'tanggal',
+    'tanggal': 'tanggal',
+    'area': 'area',
+    'RR': 'curah_hujan',
+    'Tavg': 'suhu',
+    'RH_avg': 'kelembaban',
+    'ff_avg': 'kecepatan_angin',
+    'ddd_x': 'arah_angin',
+    'sinaran_matahari': 'sinaran_matahari',
+}
+
+# Pemetaan kolom ekspor sensor kualitas udara (per menit) ke skema engine ISPU
+POLLUTANT_COLUMN_MAP = {
+    'waktu': 'waktu',
+    'timestamp': 'waktu',
+    'area': 'area',
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'pm10': 'pm10',
+    'PM10': 'pm10',
+    'pm25': 'pm25',
+    'pm2_5': 'pm25',
+    'PM2.5': 'pm25',
+    'so2': 'so2',
+    'SO2': 'so2',
+    'co': 'co',
+    'CO': 'co',
+    'o3': 'o3',
+    'O3': 'o3',
+    'no2': 'no2',
+    'NO2': 'no2',
+    'hc': 'hc',
+    'HC': 'hc',
+}
+
+# BMKG memakai 8888 (tidak terukur) dan 9999 (tidak ada data)
+BMKG_MISSING_VALUES = [8888, 9999]
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Byte terakhir yang sudah dibaca, untuk mengenali file yang ditulis ulang
+FINGERPRINT_BYTES = 64
+
+
+def assign_nearest_area(lat, lon, area_coords=None):
+    """Tetapkan setiap titik ke area dengan centroid terdekat (vektor)"""
+    if area_coords is None:
+        area_coords = AREA_COORDS
+    names = np.asarray(list(area_coords), dtype=object)
+    centers = np.array([[c['lat'], c['lon']] for c in area_coords.values()])
+    lat = np.asarray(lat, dtype=float)[:, None]
+    lon = np.asarray(lon, dtype=float)[:, None]
+    dist = (lat - centers[:, 0]) ** 2 + (lon - centers[:, 1]) ** 2
+    return names[dist.argmin(axis=1)]
+
+
+def _combine_partials(parts):
+    """Gabungkan partial agregat (jumlah & cacah) per chunk dengan satu groupby"""
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return parts[0]
+    return pd.concat(parts).groupby(level=[0, 1]).sum()
+
+
+def _latest_hours(parts, start=None):
+    """Gabungkan ISPU per jam; jam yang dihitung ulang memakai nilai terakhir"""
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return None
+    hourly = pd.concat(parts, ignore_index=True).drop_duplicates(['jam', 'area'], keep='last')
+    if start is not None:
+        hourly = hourly[hourly['jam'] >= start]
+    return hourly.reset_index(drop=True)
+
+
+def _covers(state_since, since):
+    """True bila state yang dibaca untuk ``state_since`` memuat semua baris setelah ``since``"""
+    return state_since is None or (since is not None and pd.Timestamp(since) >= state_since)
+
+
+class _ByteRange(io.RawIOBase):
+    """Potongan ``length`` byte dari file biner, mulai posisinya sekarang"""
+
+    def __init__(self, f, length):
+        self.f = f
+        self.remaining = length
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self.f.readinto(memoryview(buffer)[:min(len(buffer), self.remaining)])
+        self.remaining -= n
+        return n
+
+
+class CsvTail:
+    """Pembaca CSV yang hanya mem-parse baris yang ditambahkan sejak pembacaan terakhir
+
+    Posisi byte setelah baris lengkap terakhir disimpan bersama header,
+    identitas file dan beberapa byte terakhir yang sudah dibaca. File yang
+    diganti, dipotong atau ditulis ulang terdeteksi oleh ``unchanged`` dan
+    harus dibaca ulang dengan ``CsvTail`` baru.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.identity = None
+        self.offset = 0
+        self.fingerprint = b''
+
+    def unchanged(self):
+        """True bila file masih file yang sama dan hanya bertambah di akhir"""
+        if self.header is None:
+            return True
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if (st.st_dev, st.st_ino) != self.identity or st.st_size < self.offset:
+            return False
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset - len(self.fingerprint))
+            return f.read(len(self.fingerprint)) == self.fingerprint
+
+    def _parse(self, f, length, **kwargs):
+        stream = io.BufferedReader(_ByteRange(f, length))
+        return pd.read_csv(stream, header=None, names=self.header, **kwargs)
+
+    def chunks(self, chunksize, **kwargs):
+        """Chunk DataFrame dari baris lengkap baru; posisi maju setelah chunk terakhir"""
+        with open(self.path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if self.header is None:
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    return
+                self.header = list(pd.read_csv(io.BytesIO(line), nrows=0).columns)
+                self.identity = (st.st_dev, st.st_ino)
+                self.offset = len(line)
+                self.fingerprint = line[-FINGERPRINT_BYTES:]
+            end = self._complete_end(f, st.st_size)
+            if end <= self.offset:
+                return
+            f.seek(self.offset)
+            yield from self._parse(f, end - self.offset, chunksize=chunksize, **kwargs)
+            start = max(self.offset, end - FINGERPRINT_BYTES)
+            f.seek(start)
+            self.fingerprint = f.read(end - start)
+            self.offset = end
+
+    def pending(self, **kwargs):
+        """Baris terakhir tanpa newline (mis. file tanpa newline penutup), tanpa memajukan posisi"""
+        if self.header is None:
+            return None
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= self.offset:
+                return None
+            f.seek(self.offset)
+            return self._parse(f, size - self.offset, **kwargs)
+
+    def _complete_end(self, f, size, block=65_536):
+        """Posisi setelah newline terakhir di antara ``offset`` dan ``size``"""
+        pos = size
+        while pos > self.offset:
+            step = min(block, pos - self.offset)
+            f.seek(pos - step)
+            newline = f.read(step).rfind(b'\n')
+            if newline >= 0:
+                return pos - step + newline + 1
+            pos -= step
+        return self.offset
+
+
+def derive_columns(daily, area_coords=None, fwi_engine=None):
+    """Lengkapi kolom turunan (FFMC/FWI, ISPU, risiko, musim) dari data harian
+
+    ``fwi_engine`` yang sudah berisi state melanjutkan rekurensi FWI dari hari
+    terakhirnya; tanpa itu rekurensi dimulai dari nilai awal standar.
+    """
+    if area_coords is None:
+        area_coords = AREA_COORDS
+    daily = daily.copy()
+    if 'latitude' not in daily:
+        daily['latitude'] = daily['area'].map(lambda a: area_coords.get(a, {}).get('lat', np.nan))
+    if 'longitude' not in daily:
+        daily['longitude'] = daily['area'].map(lambda a: area_coords.get(a, {}).get('lon', np.nan))
+    for col in WEATHER_COLUMNS + ['arah_angin']:
+        if col not in daily:
+            daily[col] = np.nan
+
+    hotspot_count = daily['titik_panas'].to_numpy()
+    rainfall = daily['curah_hujan'].fillna(0).to_numpy()
+    if 'ffmc' not in daily or 'fwi' not in daily:
+        codes = (fwi_engine or FireWeatherEngine()).run_frame(daily)
+        daily['ffmc'] = codes['ffmc']
+        daily['fwi'] = codes['fwi']
+    # Tanpa data sensor (seluruhnya atau per hari): estimasi dari titik panas (tanpa noise)
+    estimate = ispu_from_concentrations(smoke_concentrations(hotspot_count)).astype(np.int64)
+    if 'ispu' not in daily:
+        daily['ispu'] = estimate
+    elif daily['ispu'].isna().any():
+        daily['ispu'] = daily['ispu'].fillna(pd.Series(estimate, index=daily.index)).astype(np.int64)
+
+    daily['skor_risiko'] = compute_risk_score(
+        hotspot_count,
+        rainfall,
+        daily['suhu'].fillna(26).to_numpy(),
+        daily['ffmc'].to_numpy(),
+        daily['kecepatan_angin'].fillna(0).to_numpy()
+    )
+    daily['tingkat_risiko'] = classify_risk(daily['skor_risiko'])
+    daily['musim'] = np.where(daily['tanggal'].dt.month.isin(DRY_MONTHS), 'Kemarau', 'Hujan').astype(object)
+    return daily[COLUMNS]
+
+
+class DataSource:
+    """Antarmuka sumber data dashboard"""
+
+    name = 'base'
+    # True bila deteksi dibangkitkan dari data harian yang sudah di-ingest
+    # (``load_detections(daily)``), bukan dibaca dari sumber
+    detections_from_daily = False
+
+    def load(self):
+        """Kembalikan DataFrame dengan skema ``COLUMNS`` pada grain area/hari"""
+        raise NotImplementedError
+
+    def load_since(self, watermark=None, fwi_engine=None):
+        """Baris dengan ``tanggal`` setelah ``watermark`` (semua bila None)
+
+        Implementasi default memuat ulang seluruh sumber lalu memotongnya;
+        subkelas membaca hanya data baru dan melanjutkan state ``fwi_engine``.
+        Hasil selalu dalam skema dtype ringkas (``titik_panas.schema``).
+        """
+        df = self.load()
+        if watermark is not None:
+            df = df[df['tanggal'].dt.normalize() > pd.Timestamp(watermark)]
+        return apply_schema(df.reset_index(drop=True))
+
+    def cache_key(self):
+        """Kunci hashable identitas sumber (konfigurasi, bukan isi)"""
+        raise NotImplementedError
+
+    def snapshot_key(self):
+        """Kunci murah yang berubah bila sumber mungkin berisi data baru"""
+        return self.cache_key()
+
+    def observed_until(self):
+        """Tanggal observasi terakhir, atau None bila semua baris adalah observasi"""
+        return None
+
+    def load_detections(self, daily=None):
+        """Deteksi titik individual (tanggal, area, latitude, longitude) bila tersedia
+
+        ``daily`` adalah data harian yang sudah di-ingest (minimal kolom
+        ``DETECTION_SOURCE_COLUMNS``); hanya dipakai sumber dengan
+        ``detections_from_daily``.
+        """
+        return None
+
+
+class MockSource(DataSource):
+    """Sumber data simulasi dari generator mock"""
+
+    name = 'mock'
+    detections_from_daily = True
+
+    def __init__(self, days=30, seed=None, areas=None, area_coords=None, end=None):
+        self.days = days
+        self.seed = seed
+        self.areas = areas
+        self.area_coords = area_coords
+        self.end = end
+
+    def load(self):
+        return generate_pontianak_data(
+            self.days,
+            rng=np.random.default_rng(self.seed),
+            areas=self.areas,
+            area_coords=self.area_coords,
+            end=self.end
+        )
+
+    def end_date(self):
+        """Tanggal akhir data observasi; tanpa ``end`` mengikuti hari ini"""
+        end = self.end if self.end is not None else datetime.now()
+        return pd.Timestamp(end).normalize()
+
+    def observed_until(self):
+        # Baris setelah ``end_date`` adalah hari prakiraan sintetis generator
+        return self.end_date()
+
+    def load_since(self, watermark=None, fwi_engine=None):
+        """Bangkitkan hanya hari setelah ``watermark`` (s.d. prakiraan 7 hari)"""
+        end = self.end_date()
+        if watermark is None:
+            start = end - pd.Timedelta(days=self.days)
+            rng = np.random.default_rng(self.seed)
+        else:
+            start = pd.Timestamp(watermark).normalize() + pd.Timedelta(days=1)
+            # Seed per potongan agar hasil append tetap dapat direproduksi
+            rng = np.random.default_rng(None if self.seed is None else [self.seed, start.toordinal()])
+        if start > end + pd.Timedelta(days=7):
+            return apply_schema(pd.DataFrame(columns=COLUMNS))
+        return apply_schema(generate_pontianak_data(
+            (end - start).days,
+            rng=rng,
+            areas=self.areas,
+            area_coords=self.area_coords,
+            end=end,
+            fwi_engine=fwi_engine
+        ))
+
+    def cache_key(self):
+        areas = tuple(self.areas) if self.areas is not None else None
+        return (self.name, self.days, self.seed, areas, self.end)
+
+    def snapshot_key(self):
+        return (self.cache_key(), self.end_date())
+
+    def load_detections(self, daily=None):
+        # Disimulasikan dari data yang di-ingest (indeks atau store), bukan
+        # dari pembangkitan ulang yang tidak sama dengan data tersimpan
+        if daily is None:
+            return None
+        return simulate_detections(daily, rng=self.seed)
+
+
+class FileSource(DataSource):
+    """Sumber data dari file CSV deteksi titik panas dan/atau cuaca BMKG
+
+    File dibaca per chunk (``chunksize`` baris) dan langsung diagregasi ke
+    grain area/hari, sehingga memori puncak bergantung pada ukuran chunk dan
+    jumlah kombinasi area/hari, bukan ukuran file. File polutan per menit
+    (opsional) diolah ``IspuEngine`` menjadi ISPU harian per area.
+
+    Setiap file diingat posisi bacanya (``CsvTail``) bersama partial agregat
+    hari yang belum melewati watermark, sehingga ``load_since`` berikutnya
+    hanya mem-parse baris yang ditambahkan sejak refresh sebelumnya.
+    """
+
+    name = 'file'
+
+    def __init__(self, hotspot_path=None, weather_path=None, chunksize=DEFAULT_CHUNKSIZE,
+                 area_coords=None, weather_area=None,
+                 hotspot_columns=None, weather_columns=None, weather_dayfirst=False,
+                 polygons=None, pollutant_path=None):
+        if hotspot_path is None and weather_path is None:
+            raise ValueError("FileSource membutuhkan hotspot_path atau weather_path")
+        self.hotspot_path = hotspot_path
+        self.weather_path = weather_path
+        self.pollutant_path = pollutant_path
+        self.chunksize = chunksize
+        self.area_coords = area_coords if area_coords is not None else AREA_COORDS
+        # Nama area untuk file cuaca satu stasiun (tanpa kolom area)
+        self.weather_area = weather_area
+        self.hotspot_columns = hotspot_columns or HOTSPOT_COLUMN_MAP
+        self.weather_columns = weather_columns or BMKG_COLUMN_MAP
+        # Ekspor BMKG memakai format tanggal dd-mm-yyyy
+        self.weather_dayfirst = weather_dayfirst
+        # Poligon area (lihat spatial.load_polygons); tanpa poligon dipakai centroid terdekat
+        self.polygons = polygons
+        # Per file: (CsvTail, partial setelah ``since``, ``since``) dari pembacaan terakhir
+        self._tails = {}
+
+    def _normalize(self, chunk, column_map, dayfirst=False, since=None):
+        """Ganti nama kolom sesuai pemetaan lalu parse tanggal
+
+        Dengan ``since`` hanya baris bertanggal setelahnya yang diteruskan.
+        """
+        chunk = chunk.rename(columns=column_map)
+        chunk = chunk.loc[:, ~chunk.columns.duplicated()]
+        chunk['tanggal'] = pd.to_datetime(
+            chunk['tanggal'], dayfirst=dayfirst, errors='coerce'
+        ).dt.normalize()
+        chunk = chunk.dropna(subset=['tanggal'])
+        if since is not None:
+            chunk = chunk[chunk['tanggal'] > pd.Timestamp(since)]
+        return chunk
+
+    def _read_chunks(self, path, column_map, dayfirst=False, since=None):
+        """Baca seluruh CSV per chunk, hanya kolom yang dipetakan"""
+        reader = pd.read_csv(
+            path,
+            chunksize=self.chunksize,
+            usecols=lambda c: c in column_map,
+            na_values=BMKG_MISSING_VALUES
+        )
+        for chunk in reader:
+            yield self._normalize(chunk, column_map, dayfirst, since)
+
+    def _tail(self, key, since):
+        """State baca file ``key`` yang dapat dilanjutkan untuk ``since``, atau None
+
+        None berarti file harus dibaca dari awal: belum pernah dibaca, ditulis
+        ulang, atau ``since`` lebih awal dari partial yang tersimpan.
+        """
+        state = self._tails.get(key)
+        if state is None or not _covers(state[-1], since) or not state[0].unchanged():
+            return None
+        return state
+
+    def _aggregate_since(self, key, path, column_map, aggregate, since, dayfirst=False):
+        """Partial agregat per (tanggal, area) setelah ``since`` dari baris baru saja
+
+        Partial per chunk digabung dengan satu groupby bersama partial yang
+        tersimpan (hanya hari setelah ``since`` sebelumnya). Baris terakhir
+        tanpa newline ikut dihitung tetapi tidak disimpan, karena mungkin
+        masih ditulis.
+        """
+        state = self._tail(key, since)
+        tail, acc = (CsvTail(path), None) if state is None else state[:2]
+        read = dict(usecols=lambda c: c in column_map, na_values=BMKG_MISSING_VALUES)
+        parts = [acc]
+        for chunk in tail.chunks(self.chunksize, **read):
+            parts.append(aggregate(self._normalize(chunk, column_map, dayfirst, since)))
+        acc = _combine_partials(parts)
+        if acc is not None and since is not None:
+            acc = acc[acc.index.get_level_values('tanggal') > pd.Timestamp(since)]
+        self._tails[key] = (tail, acc, since)
+        pending = tail.pending(**read)
+        if pending is not None:
+            acc = _combine_partials([acc, aggregate(self._normalize(pending, column_map, dayfirst, since))])
+        return acc
+
+    def _count_hotspots(self, chunk):
+        if 'area' not in chunk:
+            chunk['area'] = assign_areas(
+                chunk['latitude'], chunk['longitude'], self.polygons, self.area_coords
+            )
+        return chunk.groupby(['tanggal', 'area']).size().to_frame('titik_panas')
+
+    def read_hotspots(self, since=None):
+        """Hitung jumlah deteksi titik panas per area per hari secara streaming"""
+        acc = self._aggregate_since('hotspot', self.hotspot_path, self.hotspot_columns,
+                                    self._count_hotspots, since)
+        if acc is None:
+            return pd.DataFrame(columns=['titik_panas'], index=pd.MultiIndex.from_arrays(
+                [pd.DatetimeIndex([]), []], names=['tanggal', 'area']))
+        return acc
+
+    def load_detections(self, daily=None):
+        """Baca deteksi titik individual per chunk sebagai kolom ringkas"""
+        if self.hotspot_path is None:
+            return None
+        parts = []
+        for chunk in self._read_chunks(self.hotspot_path, self.hotspot_columns):
+            if 'area' not in chunk:
+                chunk['area'] = assign_areas(
+                    chunk['latitude'], chunk['longitude'], self.polygons, self.area_coords
+                )
+            parts.append(pd.DataFrame({
+                'tanggal': chunk['tanggal'].to_numpy(),
+                'area': pd.Categorical(chunk['area']),
+                'latitude': chunk['latitude'].to_numpy(np.float32),
+                'longitude': chunk['longitude'].to_numpy(np.float32)
+            }))
+        if not parts:
+            return None
+        return pd.concat(parts, ignore_index=True)
+
+    def _weather_sums(self, chunk):
+        if 'area' not in chunk:
+            if self.weather_area is None:
+                raise ValueError("File cuaca tanpa kolom 'area' membutuhkan weather_area")
+            chunk['area'] = self.weather_area
+        values = [c for c in WEATHER_COLUMNS if c in chunk]
+        # Simpan jumlah dan cacah non-NaN agar rata-rata antar chunk tetap tepat
+        part = chunk[values].notna().astype(np.int64).add_suffix('__n')
+        part[values] = chunk[values].fillna(0)
+        if 'arah_angin' in chunk:
+            # Arah angin dirata-rata secara sirkular (komponen sin/cos)
+            rad = np.deg2rad(chunk['arah_angin'])
+            part['arah_angin__sin'] = np.sin(rad).fillna(0)
+            part['arah_angin__cos'] = np.cos(rad).fillna(0)
+        part[['tanggal', 'area']] = chunk[['tanggal', 'area']]
+        return part.groupby(['tanggal', 'area']).sum()
+
+    def read_weather(self, since=None):
+        """Rata-rata variabel cuaca per area per hari secara streaming"""
+        acc = self._aggregate_since('weather', self.weather_path, self.weather_columns,
+                                    self._weather_sums, since, self.weather_dayfirst)
+        if acc is None:
+            return None
+        daily = pd.DataFrame(index=acc.index)
+        for col in WEATHER_COLUMNS:
+            if col in acc:
+                daily[col] = acc[col] / acc[f'{col}__n'].where(acc[f'{col}__n'] > 0)
+        if 'arah_angin__sin' in acc:
+            daily['arah_angin'] = np.rad2deg(np.arctan2(acc['arah_angin__sin'], acc['arah_angin__cos'])) % 360
+        return daily
+
+    def _pollutant_readings(self, chunk, start):
+        chunk = chunk.rename(columns=POLLUTANT_COLUMN_MAP)
+        chunk = chunk.loc[:, ~chunk.columns.duplicated()]
+        chunk['waktu'] = pd.to_datetime(chunk['waktu'], errors='coerce')
+        chunk = chunk.dropna(subset=['waktu'])
+        if start is not None:
+            # Satu jendela rata-rata terpanjang sebelum ``start`` untuk rolling mean
+            chunk = chunk[chunk['waktu'] >= start - pd.Timedelta(hours=max(AVERAGING_HOURS.values()))]
+        if len(chunk) == 0:
+            return None
+        if 'area' not in chunk:
+            chunk['area'] = assign_areas(
+                chunk['latitude'], chunk['longitude'], self.polygons, self.area_coords
+            )
+        return chunk[['waktu', 'area'] + [p for p in POLLUTANTS if p in chunk]]
+
+    def read_pollutants(self, since=None):
+        """ISPU harian per area dari bacaan polutan per menit secara streaming
+
+        Dengan ``since`` bacaan dibaca mulai satu jendela rata-rata terpanjang
+        sebelumnya agar rolling mean jam pertama setelah ``since`` lengkap.
+        State ``IspuEngine`` disimpan bersama posisi baca file, sehingga
+        refresh berikutnya hanya memproses bacaan baru.
+        """
+        start = None if since is None else pd.Timestamp(since) + pd.Timedelta(days=1)
+        state = self._tail('pollutant', since)
+        if state is None:
+            tail, engine, hourly = CsvTail(self.pollutant_path), IspuEngine(), None
+        else:
+            # Engine disalin agar chunk yang gagal tidak terhitung dua kali saat diulang
+            tail, engine, hourly = state[0], copy.deepcopy(state[1]), state[2]
+        read = dict(usecols=lambda c: c in POLLUTANT_COLUMN_MAP)
+        parts = [hourly]
+        for chunk in tail.chunks(self.chunksize, **read):
+            readings = self._pollutant_readings(chunk, start)
+            if readings is not None:
+                parts.append(engine.update(readings))
+        hourly = _latest_hours(parts, start)
+        self._tails['pollutant'] = (tail, engine, hourly, since)
+        pending = tail.pending(**read)
+        if pending is not None:
+            readings = self._pollutant_readings(pending, start)
+            if readings is not None:
+                # Baris yang mungkin belum selesai ditulis tidak masuk state engine
+                hourly = _latest_hours([hourly, copy.deepcopy(engine).update(readings)], start)
+        if hourly is None:
+            return None
+        return daily_ispu(hourly)
+
+    def load(self):
+        return self.load_since()
+
+    def load_since(self, watermark=None, fwi_engine=None):
+        """Baca hanya baris setelah ``watermark``
+
+        Dengan dua file, hanya hari sampai tanggal terakhir yang sudah ada di
+        keduanya yang dikembalikan; sisanya tetap tersimpan sebagai partial dan
+        dilengkapi pada ingest berikutnya, sehingga hari yang belum lengkap
+        tidak terkunci oleh watermark. Hanya baris yang ditambahkan ke file
+        sejak pemanggilan sebelumnya yang di-parse.
+        """
+        parts = []
+        if self.hotspot_path is not None:
+            parts.append(self.read_hotspots(watermark))
+        if self.weather_path is not None:
+            weather = self.read_weather(watermark)
+            if weather is None:
+                return apply_schema(pd.DataFrame(columns=COLUMNS))
+            parts.append(weather)
+        if self.pollutant_path is not None:
+            ispu = self.read_pollutants(watermark)
+            if ispu is None:
+                return apply_schema(pd.DataFrame(columns=COLUMNS))
+            parts.append(ispu)
+        complete = min(
+            (part.index.get_level_values('tanggal').max() for part in parts),
+            default=pd.NaT
+        )
+        if pd.isna(complete):
+            return apply_schema(pd.DataFrame(columns=COLUMNS))
+        daily = pd.concat(parts, axis=1).sort_index()
+        daily = daily[daily.index.get_level_values('tanggal') <= complete]
+        if 'titik_panas' not in daily:
+            daily['titik_panas'] = 0
+        daily['titik_panas'] = daily['titik_panas'].fillna(0).astype(np.int64)
+        daily = daily.reset_index()
+        return apply_schema(derive_columns(daily, self.area_coords, fwi_engine).reset_index(drop=True))
+
+    def cache_key(self):
+        paths = tuple(None if p is None else os.fspath(p)
+                      for p in (self.hotspot_path, self.weather_path, self.pollutant_path))
+        return (self.name, paths, self.weather_area, self.weather_dayfirst)
+
+    def snapshot_key(self):
+        stats = []
+        for path in (self.hotspot_path, self.weather_path, self.pollutant_path):
+            if path is None:
+                stats.append(None)
+            else:
+                st = os.stat(path)
+                stats.append((os.fspath(path), st.st_mtime_ns, st.st_size))
+        return (self.cache_key(), tuple(stats))
+
+
+def source_from_env(environ=None):
+    """Pilih sumber data dari variabel lingkungan
+
+    ``TITIK_PANAS_HOTSPOT_FILE`` / ``TITIK_PANAS_WEATHER_FILE`` mengaktifkan
+    ``FileSource``; tanpa keduanya dashboard memakai ``MockSource``.
+    ``TITIK_PANAS_POLLUTANT_FILE`` (bacaan polutan per menit) menggantikan
+    estimasi ISPU dengan ISPU dari sensor.
+    ``TITIK_PANAS_REGIONS`` (registri wilayah JSON/GeoJSON) menentukan area
+    tingkat terbawah, koordinat dan poligonnya.
+    """
+    environ = os.environ if environ is None else environ
+    regions_path = environ.get('TITIK_PANAS_REGIONS')
+    regions = None
+    if regions_path:
+        regions = RegionRegistry.from_file(regions_path)
+    hotspot_path = environ.get('TITIK_PANAS_HOTSPOT_FILE')
+    weather_path = environ.get('TITIK_PANAS_WEATHER_FILE')
+    if hotspot_path or weather_path:
+        return FileSource(
+            hotspot_path=hotspot_path or None,
+            weather_path=weather_path or None,
+            chunksize=int(environ.get('TITIK_PANAS_CHUNKSIZE', DEFAULT_CHUNKSIZE)),
+            area_coords=regions.coords() if regions else None,
+            weather_area=environ.get('TITIK_PANAS_WEATHER_AREA') or None,
+            weather_dayfirst=environ.get('TITIK_PANAS_WEATHER_DAYFIRST', '') == '1',
+            polygons=regions.polygons() if regions else None,
+            pollutant_path=environ.get('TITIK_PANAS_POLLUTANT_FILE') or None
+        )
+    seed = environ.get('TITIK_PANAS_SEED')
+    return MockSource(
+        days=int(environ.get('TITIK_PANAS_DAYS', 30)),
+        seed=int(seed) if seed else None,
+        areas=regions.leaves if regions else None,
+        area_coords=regions.coords() if regions else None
+    )
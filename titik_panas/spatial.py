@@ -0,0 +1,202 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from .generator import AREA_COORDS
+
+OUTSIDE_AREA = 'Luar Wilayah'
+
+# Ukuran tile peta (px) dan diameter klaster target (px) untuk skala zoom
+TILE_SIZE_PX = 256
+CLUSTER_SIZE_PX = 40
+
+
+def load_polygons(geojson, name_property='name'):
+    """Baca poligon area dari GeoJSON (dict atau path) -> {nama: [ring, ...]}
+
+    Setiap ring adalah array (n, 2) berisi (lon, lat). Polygon dan
+    MultiPolygon didukung; lubang ikut sebagai ring tambahan (aturan genap-ganjil).
+    """
+    if not isinstance(geojson, dict):
+        with open(geojson) as f:
+            geojson = json.load(f)
+    polygons = {}
+    for feature in geojson['features']:
+        rings = geometry_rings(feature['geometry'])
+        if rings:
+            polygons.setdefault(feature['properties'][name_property], []).extend(rings)
+    return polygons
+
+
+def geometry_rings(geometry):
+    """Ring (n, 2) berisi (lon, lat) dari geometri Polygon/MultiPolygon GeoJSON"""
+    if geometry is None:
+        return []
+    if geometry['type'] == 'Polygon':
+        parts = [geometry['coordinates']]
+    elif geometry['type'] == 'MultiPolygon':
+        parts = geometry['coordinates']
+    else:
+        return []
+    return [np.asarray(ring, dtype=float)[:, :2] for part in parts for ring in part]
+
+
+def points_in_rings(lon, lat, rings):
+    """Uji titik di dalam poligon (ray casting, vektor atas titik)"""
+    inside = np.zeros(len(lon), dtype=bool)
+    for ring in rings:
+        x1, y1 = ring[:, 0], ring[:, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+        for ax, ay, bx, by in zip(x1, y1, x2, y2):
+            if ay == by:
+                continue
+            crosses = (ay > lat) != (by > lat)
+            x_cross = (bx - ax) * (lat - ay) / (by - ay) + ax
+            inside ^= crosses & (lon < x_cross)
+    return inside
+
+
+def assign_areas(lat, lon, polygons=None, area_coords=None):
+    """Tetapkan titik ke area secara massal
+
+    Dengan ``polygons`` setiap titik diuji terhadap poligon (dengan saringan
+    bounding box lebih dulu); titik di luar semua poligon diberi
+    ``OUTSIDE_AREA``. Tanpa poligon dipakai centroid terdekat.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    if polygons is None:
+        from .sources import assign_nearest_area
+        return assign_nearest_area(lat, lon, area_coords or AREA_COORDS)
+
+    result = np.full(len(lat), OUTSIDE_AREA, dtype=object)
+    unassigned = np.ones(len(lat), dtype=bool)
+    for name, rings in polygons.items():
+        stacked = np.vstack(rings)
+        (lon_min, lat_min), (lon_max, lat_max) = stacked.min(axis=0), stacked.max(axis=0)
+        candidates = np.flatnonzero(
+            unassigned & (lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max)
+        )
+        if len(candidates) == 0:
+            continue
+        hit = candidates[points_in_rings(lon[candidates], lat[candidates], rings)]
+        result[hit] = name
+        unassigned[hit] = False
+    return result
+
+
+def cell_size_for_zoom(zoom, lat=0.0):
+    """Ukuran sel klaster (derajat) agar satu klaster ~``CLUSTER_SIZE_PX`` di layar"""
+    degrees_per_px = 360 / (TILE_SIZE_PX * 2 ** zoom)
+    return CLUSTER_SIZE_PX * degrees_per_px / max(np.cos(np.deg2rad(lat)), 0.1)
+
+
+class HotspotIndex:
+    """Indeks grid seragam untuk deteksi titik panas individual
+
+    Titik diurutkan menurut id sel grid (baris-mayor) sehingga setiap baris
+    sel dalam viewport adalah satu rentang kontigu yang ditemukan dengan
+    ``searchsorted``; query viewport hanya menyentuh sel yang beririsan.
+    """
+
+    def __init__(self, lat, lon, tanggal, area=None, cell_deg=0.01):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        self.cell_deg = cell_deg
+        self.lat0 = np.floor(lat.min() / cell_deg) * cell_deg if len(lat) else 0.0
+        self.lon0 = np.floor(lon.min() / cell_deg) * cell_deg if len(lon) else 0.0
+        rows = ((lat - self.lat0) // cell_deg).astype(np.int64)
+        cols = ((lon - self.lon0) // cell_deg).astype(np.int64)
+        self.n_cols = int(cols.max()) + 1 if len(cols) else 1
+        self.n_rows = int(rows.max()) + 1 if len(rows) else 1
+        cell = rows * self.n_cols + cols
+        order = np.argsort(cell, kind='stable')
+
+        self.cell = cell[order]
+        self.lat = lat[order].astype(np.float32)
+        self.lon = lon[order].astype(np.float32)
+        self.day = pd.DatetimeIndex(np.asarray(tanggal)[order]).normalize().as_unit('ns').asi8
+        self.area = None if area is None else pd.Categorical(np.asarray(area, dtype=object)[order])
+
+    def __len__(self):
+        return len(self.cell)
+
+    @classmethod
+    def from_frame(cls, df, cell_deg=0.01):
+        return cls(df['latitude'], df['longitude'], df['tanggal'],
+                   df['area'] if 'area' in df else None, cell_deg)
+
+    def _viewport_positions(self, bbox):
+        """Posisi kandidat di sel yang beririsan dengan bbox (lon_min, lat_min, lon_max, lat_max)"""
+        if bbox is None:
+            return np.arange(len(self), dtype=np.int64)
+        lon_min, lat_min, lon_max, lat_max = bbox
+        row_lo = max(int((lat_min - self.lat0) // self.cell_deg), 0)
+        row_hi = min(int((lat_max - self.lat0) // self.cell_deg), self.n_rows - 1)
+        col_lo = max(int((lon_min - self.lon0) // self.cell_deg), 0)
+        col_hi = min(int((lon_max - self.lon0) // self.cell_deg), self.n_cols - 1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.empty(0, dtype=np.int64)
+        rows = np.arange(row_lo, row_hi + 1)
+        lo = np.searchsorted(self.cell, rows * self.n_cols + col_lo, side='left')
+        hi = np.searchsorted(self.cell, rows * self.n_cols + col_hi, side='right')
+        lengths = hi - lo
+        offsets = np.repeat(lo - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        return np.arange(int(lengths.sum()), dtype=np.int64) + offsets
+
+    def query(self, bbox=None, start=None, end=None, areas=None):
+        """Posisi titik di dalam viewport, rentang tanggal dan area terpilih"""
+        pos = self._viewport_positions(bbox)
+        mask = np.ones(len(pos), dtype=bool)
+        if bbox is not None:
+            lon_min, lat_min, lon_max, lat_max = bbox
+            lat, lon = self.lat[pos], self.lon[pos]
+            mask &= (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        if start is not None:
+            mask &= self.day[pos] >= pd.Timestamp(start).normalize().value
+        if end is not None:
+            mask &= self.day[pos] <= pd.Timestamp(end).normalize().value
+        if areas is not None and self.area is not None:
+            codes = self.area.categories.get_indexer(list(areas))
+            mask &= np.isin(self.area.codes[pos], codes[codes >= 0])
+        return pos[mask]
+
+    def clusters(self, bbox=None, zoom=11, start=None, end=None, areas=None):
+        """Klaster grid untuk viewport dan zoom: pusat massa dan jumlah titik per sel"""
+        pos = self.query(bbox, start, end, areas)
+        if len(pos) == 0:
+            return pd.DataFrame(columns=['latitude', 'longitude', 'jumlah'])
+        lat = self.lat[pos].astype(np.float64)
+        lon = self.lon[pos].astype(np.float64)
+        size = cell_size_for_zoom(zoom, float(np.mean(lat)))
+        key_lat = np.floor(lat / size).astype(np.int64)
+        key_lon = np.floor(lon / size).astype(np.int64)
+        # Kunci sel 1-D (unique pada array 1-D jauh lebih cepat daripada axis=0)
+        key_lon -= key_lon.min()
+        _, inverse, counts = np.unique(
+            key_lat * (int(key_lon.max()) + 1) + key_lon, return_inverse=True, return_counts=True
+        )
+        return pd.DataFrame({
+            'latitude': np.bincount(inverse, weights=lat) / counts,
+            'longitude': np.bincount(inverse, weights=lon) / counts,
+            'jumlah': counts
+        })
+
+
+# Kolom data harian yang dibutuhkan ``simulate_detections``
+DETECTION_SOURCE_COLUMNS = ['tanggal', 'area', 'latitude', 'longitude', 'titik_panas']
+
+
+def simulate_detections(df, rng=None, spread=0.008):
+    """Bangkitkan deteksi titik individual dari jumlah titik panas harian per area"""
+    rng = np.random.default_rng(rng)
+    counts = df['titik_panas'].to_numpy(dtype=np.int64)
+    idx = np.repeat(np.arange(len(df)), counts)
+    n = len(idx)
+    return pd.DataFrame({
+        'tanggal': df['tanggal'].to_numpy()[idx],
+        'area': np.asarray(df['area'], dtype=object)[idx],
+        'latitude': df['latitude'].to_numpy()[idx] + rng.normal(0, spread, n),
+        'longitude': df['longitude'].to_numpy()[idx] + rng.normal(0, spread, n)
+    })
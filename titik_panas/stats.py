@@ -0,0 +1,140 @@
+import numpy as np
+
+
+def pair_indices(p):
+    """Indeks (i, j) segitiga atas matriks p x p untuk ko-momen terpaket"""
+    return np.triu_indices(p)
+
+
+def group_sum(block, groups, n_groups, axis=0):
+    """Jumlah ``block`` sepanjang ``axis`` per grup (``groups``; -1 dibuang)"""
+    groups = np.asarray(groups)
+    kept = np.flatnonzero(groups >= 0)
+    order = kept[np.argsort(groups[kept], kind='stable')]
+    sorted_groups = groups[order]
+    shape = list(block.shape)
+    shape[axis] = n_groups
+    out = np.zeros(shape, dtype=block.dtype)
+    if len(order):
+        starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        target = (slice(None),) * axis + (sorted_groups[starts],)
+        out[target] = np.add.reduceat(np.take(block, order, axis=axis), starts, axis=axis)
+    return out
+
+
+def packed_size(p):
+    """Panjang vektor momen terpaket: cacah, p rata-rata, p * (p + 1) / 2 ko-momen"""
+    return 1 + p + p * (p + 1) // 2
+
+
+class Moments:
+    """Statistik cukup yang dapat digabung: cacah, rata-rata, ko-momen terpusat
+
+    Untuk setiap partisi disimpan ``n``, rata-rata per kolom dan ko-momen
+    terpusat M2[i, j] = sum((x_i - mean_i) * (x_j - mean_j)) dalam bentuk
+    segitiga atas terpaket. Partisi digabung dengan rumus Chan, sehingga
+    rata-rata, varians, kovarians dan korelasi untuk gabungan partisi apa pun
+    tidak bergantung pada jumlah baris dan tetap stabil secara numerik
+    (tanpa pengurangan jumlah kuadrat mentah yang besar).
+
+    ``n`` berbentuk ``shape``, ``mean`` ``shape + (p,)`` dan ``m2``
+    ``shape + (p * (p + 1) / 2,)``; operasi bekerja per elemen ``shape``.
+    """
+
+    def __init__(self, n, mean, m2):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+
+    @property
+    def p(self):
+        return self.mean.shape[-1]
+
+    @classmethod
+    def view(cls, packed, p):
+        """``Moments`` yang berbagi memori dengan array terpaket (..., ``packed_size(p)``)
+
+        Penugasan lewat ``__setitem__`` menulis langsung ke ``packed``.
+        """
+        return cls(packed[..., 0], packed[..., 1:1 + p], packed[..., 1 + p:])
+
+    @classmethod
+    def from_groups(cls, values, groups, n_groups):
+        """Momen per grup dari baris ``values`` (baris, p) dengan dua lintasan
+
+        Baris dengan NaN di salah satu kolom tidak dihitung (complete-case).
+        """
+        values = np.asarray(values, dtype=float)
+        p = values.shape[1]
+        valid = ~np.isnan(values).any(axis=1)
+        values, groups = values[valid], np.asarray(groups)[valid]
+        n = np.bincount(groups, minlength=n_groups).astype(float)
+        mean = np.zeros((n_groups, p))
+        for k in range(p):
+            mean[:, k] = np.bincount(groups, weights=values[:, k], minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n[:, None] > 0, mean / n[:, None], 0.0)
+        # Lintasan kedua pada nilai terpusat terhadap rata-rata grupnya
+        centered = values - mean[groups]
+        iu, ju = pair_indices(p)
+        m2 = np.zeros((n_groups, len(iu)))
+        for k, (i, j) in enumerate(zip(iu, ju)):
+            m2[:, k] = np.bincount(groups, weights=centered[:, i] * centered[:, j], minlength=n_groups)
+        return cls(n, mean, m2)
+
+    def __getitem__(self, key):
+        return Moments(self.n[key], self.mean[key], self.m2[key])
+
+    def __setitem__(self, key, other):
+        self.n[key] = other.n
+        self.mean[key] = other.mean
+        self.m2[key] = other.m2
+
+    def merge(self, other):
+        """Gabungan dua himpunan partisi per elemen (rumus pasangan Chan)"""
+        iu, ju = pair_indices(self.p)
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = np.where(n > 0, other.n / n, 0.0)
+        mean = self.mean + delta * share[..., None]
+        m2 = self.m2 + other.m2 + delta[..., iu] * delta[..., ju] * (self.n * share)[..., None]
+        return Moments(n, mean, m2)
+
+    def reduce(self, axis=0):
+        """Gabungkan semua partisi sepanjang ``axis``
+
+        Rata-rata gabungan dihitung dulu, lalu ko-momen = jumlah M2 partisi +
+        jumlah n_c * (mean_c - mean)_i * (mean_c - mean)_j.
+        """
+        n, mean, m2 = (np.moveaxis(a, axis, 0) for a in (self.n, self.mean, self.m2))
+        total = n.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pooled = np.where(total[..., None] > 0, (n[..., None] * mean).sum(axis=0) / total[..., None], 0.0)
+        iu, ju = pair_indices(self.p)
+        delta = mean - pooled
+        if n.ndim == 1:
+            # Reduksi ke satu partisi: cukup satu perkalian matriks (p x p)
+            scaled = delta * np.sqrt(n)[:, None]
+            between = (scaled.T @ scaled)[iu, ju]
+        else:
+            between = (n[..., None] * delta[..., iu] * delta[..., ju]).sum(axis=0)
+        return Moments(total, pooled, m2.sum(axis=0) + between)
+
+    def _unpack(self, packed):
+        iu, ju = pair_indices(self.p)
+        full = np.zeros(packed.shape[:-1] + (self.p, self.p))
+        full[..., iu, ju] = packed
+        full[..., ju, iu] = packed
+        return full
+
+    def corr(self):
+        """Matriks korelasi Pearson; NaN untuk kolom tanpa variasi"""
+        full = self._unpack(self.m2)
+        diag = np.sqrt(np.diagonal(full, axis1=-2, axis2=-1))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = full / (diag[..., :, None] * diag[..., None, :])
+        corr = np.clip(corr, -1.0, 1.0)
+        idx = np.arange(self.p)
+        corr[..., idx, idx] = np.where(diag > 0, 1.0, np.nan)
+        return corr
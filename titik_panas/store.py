@@ -0,0 +1,232 @@
+import json
+import os
+import re
+import shutil
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .generator import COLUMNS, DRY_MONTHS
+from .schema import apply_schema
+
+MANIFEST_NAME = '_manifest.json'
+
+# Partisi hive: bulan (YYYYMM) lalu area
+PARTITION_SCHEMA = pa.schema([('bulan', pa.int32()), ('area', pa.string())])
+
+DEFAULT_ROW_GROUP_SIZE = 8_192
+
+# Nama file data: part-v<versi manifest>-<i>.parquet
+PART_VERSION = re.compile(r'part-v(\d+)-')
+
+
+def month_key(dates):
+    """Kunci partisi bulan YYYYMM dari tanggal (vektor)"""
+    dates = pd.DatetimeIndex(dates)
+    return (dates.year * 100 + dates.month).astype(np.int32)
+
+
+def months_between(start, end, season=None):
+    """Daftar kunci bulan YYYYMM di rentang [start, end], opsional per musim"""
+    months = pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq='M')
+    if season == 'Kemarau':
+        months = months[np.isin(months.month, DRY_MONTHS)]
+    elif season == 'Hujan':
+        months = months[~np.isin(months.month, DRY_MONTHS)]
+    return list(months.year * 100 + months.month)
+
+
+class ParquetStore:
+    """Penyimpanan kolumnar Parquet terpartisi per bulan dan area
+
+    Filter sidebar (area, rentang tanggal, musim) diturunkan menjadi daftar
+    direktori partisi yang dibaca dan predikat row-group, sehingga tampilan
+    7 hari satu kecamatan hanya membaca file bulan/area tersebut.
+
+    Partisi berada di direktori generasi (``data-v<versi>``) yang ditunjuk
+    manifest. Tulis ulang penuh membuat generasi baru di samping yang lama dan
+    baru terlihat saat manifest diganti dengan ``os.replace``; store lama tanpa
+    kunci ``data`` di manifest dibaca langsung dari root.
+    """
+
+    def __init__(self, root, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        self.root = os.fspath(root)
+        self.row_group_size = row_group_size
+        self._manifest = None
+
+    # Manifest
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.root, MANIFEST_NAME)
+
+    @property
+    def manifest(self):
+        """Metadata ringkas store: versi, daftar area, rentang tanggal"""
+        if self._manifest is None:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path) as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {'version': 0, 'areas': [], 'min_date': None, 'max_date': None, 'rows': 0}
+        return self._manifest
+
+    def _update_manifest(self, df, replace=False, state=None, data=None):
+        manifest = dict(self.manifest)
+        areas = set() if replace else set(manifest['areas'])
+        areas.update(df['area'].unique())
+        min_date = df['tanggal'].min()
+        max_date = df['tanggal'].max()
+        if not replace and manifest['min_date'] is not None:
+            min_date = min(min_date, pd.Timestamp(manifest['min_date']))
+            max_date = max(max_date, pd.Timestamp(manifest['max_date']))
+        manifest.update(
+            version=manifest['version'] + 1,
+            areas=sorted(areas),
+            min_date=min_date.isoformat(),
+            max_date=max_date.isoformat(),
+            rows=(0 if replace else manifest['rows']) + len(df)
+        )
+        if state is not None:
+            # State ingest (watermark, state FWI) disimpan atomik bersama versi data
+            manifest['ingest'] = state
+        if data is not None:
+            manifest['data'] = data
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest = manifest
+
+    @property
+    def data_root(self):
+        """Direktori generasi data yang aktif menurut manifest"""
+        return os.path.join(self.root, self.manifest.get('data', ''))
+
+    @property
+    def version(self):
+        return self.manifest['version']
+
+    def is_empty(self):
+        return self.manifest['rows'] == 0
+
+    # Tulis
+
+    def _write(self, df, data_root, replace=False, state=None, data=None):
+        df = df.sort_values(['area', 'tanggal'])
+        table = pa.Table.from_pandas(
+            df.assign(bulan=month_key(df['tanggal'])), preserve_index=False
+        )
+        ds.write_dataset(
+            table,
+            data_root,
+            format='parquet',
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+            basename_template=f'part-v{self.version + 1}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            max_partitions=1_000_000,
+            max_rows_per_group=self.row_group_size,
+            min_rows_per_group=min(self.row_group_size, len(df)) or 1,
+            preserve_order=True
+        )
+        self._update_manifest(df, replace=replace, state=state, data=data)
+
+    def write(self, df, state=None):
+        """Tulis ulang seluruh isi store dari DataFrame
+
+        Data ditulis ke direktori generasi baru, lalu manifest yang menunjuk ke
+        generasi itu dipasang atomik. Sampai saat itu pembaca dan crash di
+        tengah penulisan tetap melihat isi lama yang utuh. Generasi sebelumnya
+        disisakan untuk pembaca yang masih memegang manifest lama.
+        """
+        previous = self.manifest.get('data', '')
+        data = f'data-v{self.version + 1}'
+        data_root = os.path.join(self.root, data)
+        if os.path.isdir(data_root):
+            # Sisa tulis ulang yang gagal sebelum manifest terpasang
+            shutil.rmtree(data_root)
+        os.makedirs(data_root)
+        self._write(df, data_root, replace=True, state=state, data=data)
+        self._prune(keep={data, previous})
+
+    def _prune(self, keep):
+        """Hapus generasi data selain yang disebut di ``keep``"""
+        stale = []
+        for name in os.listdir(self.root):
+            if name.startswith('data-v') and name not in keep:
+                stale.append(name)
+            elif name.startswith('bulan=') and '' not in keep:
+                stale.append(name)
+        for name in stale:
+            shutil.rmtree(os.path.join(self.root, name))
+
+    def append(self, df, state=None):
+        """Tambahkan baris baru sebagai file baru di partisi yang sesuai"""
+        if len(df) == 0:
+            return
+        os.makedirs(self.data_root, exist_ok=True)
+        self._write(df, self.data_root, state=state)
+
+    # Baca
+
+    def partition_dirs(self, areas=None, start=None, end=None, season=None):
+        """Direktori partisi yang perlu dibaca untuk filter yang diberikan"""
+        manifest = self.manifest
+        if manifest['min_date'] is None:
+            return []
+        start = pd.Timestamp(start) if start is not None else pd.Timestamp(manifest['min_date'])
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp(manifest['max_date'])
+        if areas is None:
+            areas = manifest['areas']
+        dirs = []
+        for bulan in months_between(start, end, season):
+            for area in areas:
+                path = os.path.join(self.data_root, f'bulan={bulan}', f'area={quote(str(area), safe="")}')
+                if os.path.isdir(path):
+                    dirs.append(path)
+        return dirs
+
+    def row_filter(self, start=None, end=None, season=None):
+        """Predikat baris (dipakai juga untuk pruning statistik row-group)"""
+        expr = None
+        if start is not None:
+            expr = ds.field('tanggal') >= pa.scalar(pd.Timestamp(start).to_datetime64())
+        if end is not None:
+            # Tanggal akhir inklusif sampai akhir hari
+            end_expr = ds.field('tanggal') < pa.scalar((pd.Timestamp(end).normalize() + pd.Timedelta(days=1)).to_datetime64())
+            expr = end_expr if expr is None else expr & end_expr
+        if season is not None and season != 'Semua':
+            season_expr = ds.field('musim') == season
+            expr = season_expr if expr is None else expr & season_expr
+        return expr
+
+    def _committed(self, name):
+        match = PART_VERSION.match(name)
+        return match is None or int(match.group(1)) <= self.version
+
+    def read(self, areas=None, start=None, end=None, season=None, columns=None):
+        """Baca data terfilter dari store dengan pushdown partisi dan row-group"""
+        if season == 'Semua':
+            season = None
+        dirs = self.partition_dirs(areas, start, end, season)
+        # File dari append yang manifest-nya belum terpasang tidak ikut dibaca
+        files = [os.path.join(d, name) for d in dirs for name in sorted(os.listdir(d))
+                 if name.endswith('.parquet') and self._committed(name)]
+        if not files:
+            return apply_schema(pd.DataFrame(columns=columns or COLUMNS))
+        dataset = ds.dataset(
+            files,
+            format='parquet',
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+            partition_base_dir=self.data_root
+        )
+        wanted = list(columns or COLUMNS)
+        table = dataset.to_table(columns=wanted, filter=self.row_filter(start, end, season))
+        df = table.to_pandas()
+        if 'tanggal' in df:
+            df = df.sort_values(['tanggal', 'area'] if 'area' in df else 'tanggal', kind='stable')
+        return apply_schema(df.reset_index(drop=True)[wanted])
+
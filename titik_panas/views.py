@@ -0,0 +1,635 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from .binning import SCATTER_ROW_THRESHOLD, binned_scatter, box_stats, wind_rose
+from .downsample import CHART_WIDTH_PX, column_width, line_frame, max_points_for_width, scatter_trace
+from .generator import RISK_LEVELS, classify_risk
+from .rollup import MOMENT_COLUMNS, comparison_windows
+
+# Warna tingkat risiko (dipakai tab Analisis Risiko dan FFMC & ISPU)
+RISK_COLORS = {
+    'Rendah': 'green',
+    'Sedang': 'yellow',
+    'Tinggi': 'orange',
+    'Sangat Tinggi': 'red'
+}
+
+SEASON_COLORS = {'Kemarau': 'orange', 'Hujan': 'lightblue'}
+
+WEATHER_VARIABLES = ['curah_hujan', 'sinaran_matahari', 'kecepatan_angin', 'kelembaban']
+
+# Faktor matriks korelasi; momennya disimpan di cube rollup
+RISK_FACTORS = MOMENT_COLUMNS
+
+MAP_CENTER = {"lat": -0.026, "lon": 109.34}
+
+# Baris maksimum heatmap peluang risiko ensemble
+MAX_EXCEEDANCE_AREAS = 30
+
+# Metrik header: rata-rata atau total per jendela waktu
+HEADER_MEANS = ['curah_hujan', 'suhu', 'ispu']
+HIGH_RISK_LEVELS = ['Tinggi', 'Sangat Tinggi']
+
+# Replay historis: hari terakhir yang tampil di grafik dan agregat per hari
+REPLAY_WINDOW = 90
+REPLAY_AGGS = {'titik_panas': 'sum', 'skor_risiko': 'mean', 'curah_hujan': 'mean'}
+
+
+def payload_bytes(fig):
+    """Ukuran JSON figure yang dikirim ke browser (byte)"""
+    return len(fig.to_json().encode())
+
+
+def scatter_figure(data, x, y, color, size, title, color_discrete_map):
+    """Scatter mentah untuk data kecil, scatter heksagonal ter-bin di atas ambang baris"""
+    if len(data) <= SCATTER_ROW_THRESHOLD:
+        return px.scatter(
+            data, x=x, y=y, color=color, size=size, title=title,
+            color_discrete_map=color_discrete_map
+        )
+    binned = binned_scatter(data, x, y, color=color, size=size)
+    fig = px.scatter(
+        binned, x=x, y=y, color=color, size='jumlah',
+        hover_data={size: ':.1f', 'jumlah': True},
+        title=f"{title} - {len(data):,} baris dalam {len(binned):,} sel",
+        color_discrete_map=color_discrete_map,
+        labels={'jumlah': 'Jumlah Baris', size: f'Rata-rata {size}'}
+    )
+    fig.update_traces(marker=dict(symbol='hexagon', opacity=0.7))
+    return fig
+
+
+def trend_label(predicted, recent):
+    """Arah prakiraan dibanding rata-rata terakhir (toleransi 5%)"""
+    if predicted > recent * 1.05:
+        return "📈 Meningkat"
+    if predicted < recent * 0.95:
+        return "📉 Menurun"
+    return "➡️ Stabil"
+
+
+# Metrik header
+
+def header_data(region_rollup, level, units, mode, start, end, season=None):
+    """Nilai metrik header periode kini dan pembanding (``comparison_windows``)
+
+    Kedua periode dijawab dari indeks prefix cube tingkat ``level``, jadi
+    biayanya sama untuk riwayat satu minggu maupun sepuluh tahun. Nilai
+    pembanding None bila periode tersebut tidak seluruhnya tercakup data.
+    """
+    current, previous = comparison_windows(mode, start, end)
+    totals = [region_rollup.window(level, units, lo, hi, season) for lo, hi in (current, previous)]
+
+    def values(window):
+        out = {'titik_panas': window.total('titik_panas'), 'risiko_tinggi': window.risk_count(HIGH_RISK_LEVELS)}
+        out.update({col: window.mean(col) for col in HEADER_MEANS})
+        return out
+
+    now = values(totals[0])
+    covered = totals[1].days == (previous[1] - previous[0]).days + 1 and totals[1].row_count
+    before = values(totals[1]) if covered else dict.fromkeys(now)
+    return {
+        'periode': current,
+        'pembanding': previous,
+        'metrik': {key: (now[key], before[key]) for key in now}
+    }
+
+
+def metric_delta(current, previous, fmt):
+    """Teks delta ``st.metric`` (None bila pembanding kosong)"""
+    if previous is None or pd.isna(previous) or pd.isna(current):
+        return None
+    return format(current - previous, fmt)
+
+
+# Tab Trend & Prakiraan
+
+def ensemble_window(frame, dates, horizon=7):
+    """Potong hasil ensemble ke rentang seleksi (+ ``horizon`` hari prakiraan)"""
+    if len(dates) == 0:
+        return frame.iloc[0:0]
+    end = dates[-1] + pd.Timedelta(days=horizon)
+    return frame[(frame['tanggal'] >= dates[0]) & (frame['tanggal'] <= end)].reset_index(drop=True)
+
+
+def band_traces(bands, column, rgb, name):
+    """Pita p10-p90 dan median ensemble sebagai trace Scatter (``rgb``: "r,g,b")"""
+    return [
+        go.Scatter(
+            x=pd.concat([bands['tanggal'], bands['tanggal'][::-1]]),
+            y=pd.concat([bands[f'{column}_p90'], bands[f'{column}_p10'][::-1]]),
+            fill='toself', fillcolor=f'rgba({rgb},0.15)', line=dict(width=0),
+            name=f'{name} p10-p90', hoverinfo='skip'
+        ),
+        go.Scatter(
+            x=bands['tanggal'], y=bands[f'{column}_p50'],
+            mode='lines', line=dict(color=f'rgba({rgb},0.8)', dash='dot'),
+            name=f'{name} median'
+        )
+    ]
+
+
+def trend_data(rollup, forecast_engine, areas=None, ensemble=None, page_width=CHART_WIDTH_PX):
+    """Agregat tab trend: seri harian, rata-rata musim dan prakiraan 7 hari
+
+    Pembanding "7 hari terakhir" adalah 7 hari sampai hari observasi terakhir
+    (``forecast_engine.last_date``), tempat prakiraan berangkat. Dengan
+    ``ensemble`` (``EnsembleReducer``) ikut pita kuantil skenario iklim.
+    ``page_width`` adalah lebar konten halaman (px); grafik trend selebar halaman.
+    """
+    daily = rollup.daily({
+        'titik_panas': 'sum',
+        'curah_hujan': 'mean',
+        'suhu': 'mean',
+        'kelembaban': 'mean',
+        'skor_risiko': 'mean'
+    })
+    prediction = forecast_engine.forecast(7, areas=areas)
+    if forecast_engine.last_date is None:
+        recent = daily.iloc[:0]
+    else:
+        recent = daily[daily['tanggal'] <= forecast_engine.last_date].tail(7)
+    return {
+        'daily': daily,
+        'seasonal': rollup.by_season(['titik_panas', 'curah_hujan', 'suhu']),
+        'prediction': prediction,
+        'recent_hotspot': recent['titik_panas'].mean(),
+        'recent_rain': recent['curah_hujan'].mean(),
+        'pred_hotspot': prediction['titik_panas'].mean(),
+        'pred_rain': prediction['curah_hujan'].mean(),
+        'ensemble': None if ensemble is None else ensemble_window(ensemble.bands(), rollup.dates),
+        'max_points': max_points_for_width(page_width)
+    }
+
+
+def trend_figures(data):
+    daily = data['daily']
+    prediction = data['prediction']
+
+    # Grafik trend utama (di-downsample sesuai lebar grafik, WebGL untuk seri panjang)
+    fig = go.Figure()
+    fig.add_trace(scatter_trace(
+        daily, 'tanggal', 'titik_panas', data.get('max_points'),
+        mode='lines+markers',
+        name='Titik Panas',
+        line=dict(color='red', width=3),
+        yaxis='y'
+    ))
+    fig.add_trace(scatter_trace(
+        daily, 'tanggal', 'curah_hujan', data.get('max_points'),
+        mode='lines+markers',
+        name='Curah Hujan (mm)',
+        line=dict(color='blue', width=3),
+        yaxis='y2'
+    ))
+    if data.get('ensemble') is not None:
+        # Pita ketidakpastian skenario iklim (ensemble) untuk titik panas
+        fig.add_traces(band_traces(data['ensemble'], 'titik_panas', '255,0,0', 'Ensemble'))
+    fig.update_layout(
+        title="Trend Titik Panas vs Curah Hujan di Pontianak",
+        xaxis_title="Tanggal",
+        yaxis=dict(title="Jumlah Titik Panas", side="left", color="red"),
+        yaxis2=dict(title="Curah Hujan (mm)", side="right", overlaying="y", color="blue"),
+        height=500,
+        hovermode='x unified'
+    )
+
+    fig_season = px.bar(
+        data['seasonal'],
+        x='musim',
+        y='titik_panas',
+        title="Rata-rata Titik Panas per Musim",
+        color='musim',
+        color_discrete_map=SEASON_COLORS
+    )
+
+    # Pita prakiraan 80% titik panas
+    fig_pred = go.Figure()
+    fig_pred.add_trace(go.Scatter(
+        x=daily['tanggal'].tail(14), y=daily['titik_panas'].tail(14),
+        mode='lines', name='Aktual', line=dict(color='red')
+    ))
+    fig_pred.add_trace(go.Scatter(
+        x=pd.concat([prediction['tanggal'], prediction['tanggal'][::-1]]),
+        y=pd.concat([prediction['titik_panas_atas'], prediction['titik_panas_bawah'][::-1]]),
+        fill='toself', fillcolor='rgba(255,0,0,0.15)', line=dict(width=0),
+        name='Pita 80%', hoverinfo='skip'
+    ))
+    fig_pred.add_trace(go.Scatter(
+        x=prediction['tanggal'], y=prediction['titik_panas'],
+        mode='lines+markers', name='Prakiraan', line=dict(color='red', dash='dash')
+    ))
+    fig_pred.update_layout(height=300, margin=dict(t=30, b=0), title="Prakiraan Titik Panas")
+
+    return {'trend': fig, 'season': fig_season, 'forecast': fig_pred}
+
+
+# Tab Peta
+
+def map_data(filtered_df, rollup):
+    """Agregat tab peta: cacah risiko per area dan kondisi terkini per area"""
+    return {
+        'area_summary': rollup.area_risk_counts(),
+        'latest': filtered_df[filtered_df['tanggal'] == filtered_df['tanggal'].max()]
+    }
+
+
+def map_figures(data):
+    figures = {}
+    if not data['area_summary'].empty:
+        fig_heatmap = px.imshow(
+            data['area_summary'].T,
+            title="Distribusi Tingkat Risiko per Area di Pontianak",
+            color_continuous_scale="Reds",
+            aspect="auto"
+        )
+        fig_heatmap.update_layout(
+            xaxis_title="Area/Kecamatan",
+            yaxis_title="Tingkat Risiko"
+        )
+        figures['heatmap'] = fig_heatmap
+
+    fig_map = px.scatter_mapbox(
+        data['latest'],
+        lat='latitude',
+        lon='longitude',
+        size='titik_panas',
+        color='tingkat_risiko',
+        hover_name='area',
+        hover_data=['titik_panas', 'curah_hujan', 'suhu'],
+        color_discrete_map=RISK_COLORS,
+        title="Peta Sebaran Titik Panas Pontianak (Data Terkini)",
+        mapbox_style="open-street-map",
+        zoom=11,
+        center=MAP_CENTER
+    )
+    fig_map.update_layout(height=600)
+    figures['map'] = fig_map
+    return figures
+
+
+def cluster_data(filtered_df, hotspot_index, zoom=11, margin=0.02):
+    """Klaster deteksi individual untuk viewport area terpilih"""
+    bbox = (
+        filtered_df['longitude'].min() - margin, filtered_df['latitude'].min() - margin,
+        filtered_df['longitude'].max() + margin, filtered_df['latitude'].max() + margin
+    )
+    clusters = hotspot_index.clusters(
+        bbox,
+        zoom,
+        filtered_df['tanggal'].min(),
+        filtered_df['tanggal'].max(),
+        list(filtered_df['area'].unique())
+    )
+    return {'clusters': clusters, 'bbox': bbox, 'zoom': zoom}
+
+
+def cluster_figure(data):
+    clusters, bbox = data['clusters'], data['bbox']
+    fig_points = px.scatter_mapbox(
+        clusters,
+        lat='latitude',
+        lon='longitude',
+        size='jumlah',
+        color='jumlah',
+        color_continuous_scale='YlOrRd',
+        title=f"Klaster Deteksi Titik Panas ({clusters['jumlah'].sum():,} deteksi)",
+        mapbox_style="open-street-map",
+        zoom=data['zoom'],
+        center={"lat": (bbox[1] + bbox[3]) / 2, "lon": (bbox[0] + bbox[2]) / 2}
+    )
+    fig_points.update_layout(height=600)
+    return fig_points
+
+
+# Tab Cuaca & Iklim
+
+def weather_data(filtered_df, rollup, variable='curah_hujan', page_width=CHART_WIDTH_PX):
+    """Agregat tab cuaca: mawar angin, seri harian dan kuartil per musim"""
+    daily_var = rollup.daily({variable: 'mean'})
+    # Seri harian tampil di kolom kanan dari dua kolom
+    line, mode = line_frame(daily_var, 'tanggal', variable, max_points_for_width(column_width(2, page_width)))
+    return {
+        'variable': variable,
+        'rose': wind_rose(filtered_df['arah_angin'], filtered_df['kecepatan_angin']),
+        'scatter': filtered_df,
+        'line': line,
+        'line_mode': mode,
+        'box': box_stats(filtered_df, 'musim', variable)
+    }
+
+
+def weather_figures(data):
+    variable = data['variable']
+    label = variable.replace('_', ' ').title()
+
+    fig_wind = px.bar_polar(
+        data['rose'],
+        r='frekuensi',
+        theta='arah',
+        color='kecepatan',
+        title="Mawar Angin Pontianak",
+        labels={'frekuensi': 'Frekuensi (%)', 'kecepatan': 'Kecepatan'},
+        color_discrete_sequence=px.colors.sequential.YlOrRd[1:]
+    )
+    fig_wind.update_layout(polar=dict(angularaxis=dict(direction='clockwise', rotation=90)))
+
+    fig_temp_hum = scatter_figure(
+        data['scatter'],
+        x='suhu',
+        y='kelembaban',
+        color='musim',
+        size='titik_panas',
+        title="Hubungan Suhu vs Kelembaban",
+        color_discrete_map=SEASON_COLORS
+    )
+
+    fig_var = px.line(
+        data['line'],
+        x='tanggal',
+        y=variable,
+        render_mode=data['line_mode'],
+        title=f"Trend {label} di Pontianak"
+    )
+
+    # Box plot per musim dari kuartil yang dihitung di server
+    fig_box = go.Figure()
+    for _, stats in data['box'].iterrows():
+        fig_box.add_trace(go.Box(
+            name=stats['musim'],
+            x=[stats['musim']],
+            q1=[stats['q1']],
+            median=[stats['median']],
+            q3=[stats['q3']],
+            lowerfence=[stats['lowerfence']],
+            upperfence=[stats['upperfence']],
+            mean=[stats['mean']],
+            marker_color=SEASON_COLORS.get(stats['musim'])
+        ))
+    fig_box.update_layout(
+        title=f"Distribusi {label} per Musim",
+        xaxis_title='musim',
+        yaxis_title=variable
+    )
+    return {'wind_rose': fig_wind, 'temp_humidity': fig_temp_hum, 'variable': fig_var, 'box': fig_box}
+
+
+# Tab Analisis Risiko
+
+def risk_data(filtered_df, rollup, ensemble=None, page_width=CHART_WIDTH_PX):
+    """Agregat tab risiko: distribusi tingkat, skor harian dan matriks korelasi
+
+    Dengan ``ensemble`` ikut pita kuantil skor risiko dan P(risiko >= Tinggi)
+    per area per hari.
+    """
+    daily_risk = rollup.daily({'skor_risiko': 'mean'})
+    # Trend skor tampil di kolom kanan dari dua kolom
+    line, mode = line_frame(daily_risk, 'tanggal', 'skor_risiko', max_points_for_width(column_width(2, page_width)))
+    data = {
+        'risk_counts': rollup.risk_counts(),
+        'line': line,
+        'line_mode': mode,
+        'corr': rollup.corr(RISK_FACTORS),
+        'ensemble': None,
+        'exceedance': None
+    }
+    if ensemble is not None:
+        data['ensemble'] = ensemble_window(ensemble.bands(), rollup.dates)
+        prob = ensemble.exceedance_probability()
+        prob = prob.loc[:, prob.columns.isin(data['ensemble']['tanggal'])]
+        # Banyak area: tampilkan area dengan peluang rata-rata tertinggi
+        data['exceedance'] = prob.loc[prob.mean(axis=1).nlargest(MAX_EXCEEDANCE_AREAS).index]
+    return data
+
+
+def risk_figures(data):
+    risk_counts = data['risk_counts']
+    fig_risk_pie = px.pie(
+        values=risk_counts.values,
+        names=risk_counts.index,
+        title="Distribusi Tingkat Risiko (%)",
+        color=risk_counts.index,
+        color_discrete_map=RISK_COLORS
+    )
+
+    fig_risk_trend = px.line(
+        data['line'],
+        x='tanggal',
+        y='skor_risiko',
+        render_mode=data['line_mode'],
+        title="Trend Skor Risiko Harian",
+        color_discrete_sequence=['red']
+    )
+    fig_risk_trend.add_hline(y=70, line_dash="dash", line_color="red",
+                             annotation_text="Batas Sangat Tinggi")
+    fig_risk_trend.add_hline(y=50, line_dash="dash", line_color="orange",
+                             annotation_text="Batas Tinggi")
+    if data.get('ensemble') is not None:
+        fig_risk_trend.add_traces(band_traces(data['ensemble'], 'skor_risiko', '255,0,0', 'Ensemble'))
+
+    fig_corr = px.imshow(
+        data['corr'],
+        title="Matriks Korelasi Faktor Risiko",
+        color_continuous_scale="RdBu",
+        zmin=-1, zmax=1
+    )
+    figures = {'pie': fig_risk_pie, 'trend': fig_risk_trend, 'corr': fig_corr}
+    if data.get('exceedance') is not None:
+        exceedance = data['exceedance']
+        figures['exceedance'] = px.imshow(
+            exceedance.to_numpy(),
+            x=exceedance.columns,
+            y=exceedance.index,
+            labels=dict(x="Tanggal", y="Area", color="Peluang"),
+            title="Peluang Risiko ≥ Tinggi (Ensemble Skenario Iklim)",
+            color_continuous_scale="OrRd",
+            zmin=0, zmax=1,
+            aspect='auto'
+        )
+    return figures
+
+
+# Tab FFMC & ISPU
+
+def ffmc_label(avg_ffmc):
+    if avg_ffmc > 85:
+        return "🔴 Sangat Kering"
+    if avg_ffmc > 70:
+        return "🟠 Kering"
+    if avg_ffmc > 50:
+        return "🟡 Sedang"
+    return "🟢 Lembab"
+
+
+def ispu_label(avg_ispu):
+    if avg_ispu > 300:
+        return "🔴 Berbahaya"
+    if avg_ispu > 200:
+        return "🟠 Sangat Tidak Sehat"
+    if avg_ispu > 100:
+        return "🟡 Tidak Sehat"
+    if avg_ispu > 50:
+        return "🟢 Sedang"
+    return "🟢 Baik"
+
+
+def ffmc_ispu_data(filtered_df, rollup, page_width=CHART_WIDTH_PX):
+    """Agregat tab FFMC & ISPU: rata-rata dan seri harian"""
+    # Kedua seri tampil berdampingan di dua kolom
+    max_points = max_points_for_width(column_width(2, page_width))
+    ffmc_line, ffmc_mode = line_frame(rollup.daily({'ffmc': 'mean'}), 'tanggal', 'ffmc', max_points)
+    ispu_line, ispu_mode = line_frame(rollup.daily({'ispu': 'mean'}), 'tanggal', 'ispu', max_points)
+    return {
+        'avg_ffmc': rollup.mean('ffmc'),
+        'avg_fwi': rollup.mean('fwi'),
+        'avg_ispu': rollup.mean('ispu'),
+        'ffmc_line': ffmc_line,
+        'ffmc_mode': ffmc_mode,
+        'ispu_line': ispu_line,
+        'ispu_mode': ispu_mode,
+        'scatter': filtered_df
+    }
+
+
+def ffmc_ispu_figures(data):
+    fig_ffmc = px.line(
+        data['ffmc_line'],
+        x='tanggal',
+        y='ffmc',
+        render_mode=data['ffmc_mode'],
+        title="Trend FFMC Pontianak",
+        color_discrete_sequence=['brown']
+    )
+    fig_ffmc.add_hline(y=85, line_dash="dash", line_color="red")
+    fig_ffmc.add_hline(y=70, line_dash="dash", line_color="orange")
+
+    fig_ispu = px.line(
+        data['ispu_line'],
+        x='tanggal',
+        y='ispu',
+        render_mode=data['ispu_mode'],
+        title="Trend ISPU Pontianak",
+        color_discrete_sequence=['purple']
+    )
+    fig_ispu.add_hline(y=100, line_dash="dash", line_color="orange")
+    fig_ispu.add_hline(y=200, line_dash="dash", line_color="red")
+
+    # Hubungan FFMC, ISPU dengan titik panas
+    fig_relationship = scatter_figure(
+        data['scatter'],
+        x='ffmc',
+        y='ispu',
+        size='titik_panas',
+        color='tingkat_risiko',
+        title="Hubungan FFMC vs ISPU (ukuran = jumlah titik panas)",
+        color_discrete_map=RISK_COLORS
+    )
+    return {'ffmc': fig_ffmc, 'ispu': fig_ispu, 'relationship': fig_relationship}
+
+
+# Tab Replay Historis
+
+def replay_data(rollup, coords):
+    """Agregat replay: seri harian seleksi dan kondisi per unit per hari
+
+    Dihitung sekali per seleksi; baris unit terurut tanggal sehingga frame
+    ke-i cukup memotong ``units[starts[i]:ends[i]]``.
+    """
+    daily = rollup.daily(REPLAY_AGGS)
+    units = rollup.area_daily({'titik_panas': 'sum', 'skor_risiko': 'mean'})
+    units['latitude'] = units['area'].map({a: c['lat'] for a, c in coords.items()})
+    units['longitude'] = units['area'].map({a: c['lon'] for a, c in coords.items()})
+    units['tingkat_risiko'] = classify_risk(units['skor_risiko'])
+    days = units['tanggal'].to_numpy()
+    dates = daily['tanggal'].to_numpy()
+    return {
+        'daily': daily,
+        'units': units,
+        'starts': np.searchsorted(days, dates, side='left'),
+        'ends': np.searchsorted(days, dates, side='right')
+    }
+
+
+class ReplayFigures:
+    """Figure replay yang dibangun sekali lalu diperpanjang per frame
+
+    Layout, sumbu dan trace dibuat di konstruktor; ``frame(i)`` hanya
+    mengganti data trace dengan potongan array yang sudah disiapkan (hari
+    ``i - window + 1`` sampai ``i`` untuk grafik, hari ``i`` untuk peta),
+    sehingga biaya per frame tidak bergantung pada panjang riwayat.
+    ``uirevision`` menjaga zoom/pan pengguna antar frame.
+    """
+
+    def __init__(self, data, window=REPLAY_WINDOW, center=None):
+        self.window = window
+        daily = data['daily']
+        self.dates = daily['tanggal'].to_numpy()
+        self.series = {col: daily[col].to_numpy(dtype=float) for col in REPLAY_AGGS}
+        units = data['units']
+        self.starts, self.ends = data['starts'], data['ends']
+        self.unit_names = units['area'].to_numpy(object)
+        self.unit_lat = units['latitude'].to_numpy(dtype=float)
+        self.unit_lon = units['longitude'].to_numpy(dtype=float)
+        self.unit_hotspots = units['titik_panas'].to_numpy(dtype=float)
+        self.unit_risk = pd.Categorical(units['tingkat_risiko'], categories=RISK_LEVELS).codes
+        if center is None:
+            located = ~np.isnan(self.unit_lat)
+            center = MAP_CENTER if not located.any() else {
+                'lat': float(self.unit_lat[located].mean()), 'lon': float(self.unit_lon[located].mean())
+            }
+
+        self.trend = go.Figure([
+            go.Bar(name='Titik Panas', marker_color='crimson', opacity=0.7),
+            go.Scatter(name='Skor Risiko', yaxis='y2', mode='lines', line=dict(color='darkorange')),
+            go.Scatter(name='Curah Hujan', yaxis='y2', mode='lines', line=dict(color='steelblue', dash='dot'))
+        ])
+        # Sumbu y tetap selama replay agar grafik tidak melompat
+        self.trend.update_layout(
+            height=420,
+            uirevision='replay',
+            yaxis=dict(title='Titik Panas', range=[0, max(np.nanmax(self.series['titik_panas']), 1) * 1.1]),
+            yaxis2=dict(title='Skor Risiko / Curah Hujan', overlaying='y', side='right',
+                        range=[0, max(np.nanmax(self.series['skor_risiko']),
+                                      np.nanmax(self.series['curah_hujan']), 1) * 1.1]),
+            legend=dict(orientation='h', y=1.12)
+        )
+        self.map = go.Figure([
+            go.Scattermapbox(name=level, marker=dict(color=RISK_COLORS[level], sizemode='diameter'))
+            for level in RISK_LEVELS
+        ])
+        self.map.update_layout(
+            height=520,
+            uirevision='replay',
+            mapbox=dict(style='open-street-map', center=center, zoom=10),
+            margin=dict(l=0, r=0, t=40, b=0)
+        )
+
+    def __len__(self):
+        return len(self.dates)
+
+    def frame(self, i):
+        """Perbarui trace ke hari ke-``i``; kembalikan (figure trend, figure peta)"""
+        lo = max(0, i + 1 - self.window)
+        x = self.dates[lo:i + 1]
+        for trace, col in zip(self.trend.data, REPLAY_AGGS):
+            trace.x, trace.y = x, self.series[col][lo:i + 1]
+        day = pd.Timestamp(self.dates[i])
+        self.trend.layout.xaxis.range = [
+            pd.Timestamp(self.dates[lo]) - pd.Timedelta(hours=12),
+            pd.Timestamp(self.dates[lo]) + pd.Timedelta(days=self.window) - pd.Timedelta(hours=12)
+        ]
+        self.trend.layout.title.text = f"Replay {day:%d %b %Y}"
+
+        rows = slice(self.starts[i], self.ends[i])
+        risk = self.unit_risk[rows]
+        for k, trace in enumerate(self.map.data):
+            mask = risk == k
+            hotspots = self.unit_hotspots[rows][mask]
+            trace.lat = self.unit_lat[rows][mask]
+            trace.lon = self.unit_lon[rows][mask]
+            trace.text = [f"{name}: {n:.0f} titik panas" for name, n in zip(self.unit_names[rows][mask], hotspots)]
+            trace.marker.size = 8 + 4 * np.sqrt(hotspots)
+        self.map.layout.title.text = f"Sebaran Titik Panas {day:%d %b %Y}"
+        return self.trend, self.map